@@ -4,7 +4,7 @@ Modèle de pricing pour options européennes
 """
 
 import numpy as np
-from typing import Dict
+from typing import Dict, Union
 from ..utils.math_utils import (
     calculate_d1_d2,
     standard_normal_cdf,
@@ -238,3 +238,94 @@ def get_greeks(option: BlackScholesOption) -> Dict[str, float]:
         'theta': option.theta(),
         'rho': option.rho()
     }
+
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def _d1_d2_array(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike,
+                 sigma: ArrayLike, q: ArrayLike = 0.0):
+    """
+    Calcule d1 et d2 élément par élément (T et sigma supposés strictement positifs)
+    
+    Returns:
+        Tuple (d1, d2, sqrt(T)) d'arrays diffusés
+    """
+    sqrt_T = np.sqrt(T)
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma**2) * T) / (sigma * sqrt_T)
+    return d1, d1 - sigma * sqrt_T, sqrt_T
+
+
+def option_price_array(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike,
+                       sigma: ArrayLike, q: ArrayLike = 0.0,
+                       is_call: Union[bool, np.ndarray] = True) -> np.ndarray:
+    """
+    Prix Black-Scholes vectorisé de calls et puts européens
+    
+    Tous les paramètres sont diffusés (broadcasting NumPy). Les options
+    échues (T <= 0) valent leur valeur intrinsèque.
+    
+    Args:
+        S: Prix spot
+        K: Strike
+        T: Temps à l'échéance (années)
+        r: Taux sans risque
+        sigma: Volatilité
+        q: Dividende yield
+        is_call: True pour un call, False pour un put (scalaire ou array)
+        
+    Returns:
+        Array des prix
+    """
+    S, K, T, r, sigma, q, is_call = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q)),
+        np.asarray(is_call, dtype=bool)
+    )
+    expired = T <= 0
+    T_safe = np.where(expired, 1.0, T)
+    
+    d1, d2, _ = _d1_d2_array(S, K, T_safe, r, sigma, q)
+    sign = np.where(is_call, 1.0, -1.0)
+    price = sign * (
+        S * np.exp(-q * T_safe) * standard_normal_cdf(sign * d1) -
+        K * np.exp(-r * T_safe) * standard_normal_cdf(sign * d2)
+    )
+    intrinsic = np.maximum(sign * (S - K), 0.0)
+    
+    return np.where(expired, intrinsic, price)
+
+
+def option_delta_array(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike,
+                       sigma: ArrayLike, q: ArrayLike = 0.0,
+                       is_call: Union[bool, np.ndarray] = True) -> np.ndarray:
+    """
+    Delta Black-Scholes vectorisé de calls et puts européens
+    
+    Les options échues (T <= 0) ont un delta de 0 ou +/-1 selon la moneyness.
+    
+    Args:
+        S: Prix spot
+        K: Strike
+        T: Temps à l'échéance (années)
+        r: Taux sans risque
+        sigma: Volatilité
+        q: Dividende yield
+        is_call: True pour un call, False pour un put (scalaire ou array)
+        
+    Returns:
+        Array des deltas
+    """
+    S, K, T, r, sigma, q, is_call = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q)),
+        np.asarray(is_call, dtype=bool)
+    )
+    expired = T <= 0
+    T_safe = np.where(expired, 1.0, T)
+    
+    d1, _, _ = _d1_d2_array(S, K, T_safe, r, sigma, q)
+    call_delta = np.exp(-q * T_safe) * standard_normal_cdf(d1)
+    delta = np.where(is_call, call_delta, call_delta - np.exp(-q * T_safe))
+    
+    intrinsic_delta = np.where(is_call, (S > K).astype(float), -(S < K).astype(float))
+    
+    return np.where(expired, intrinsic_delta, delta)
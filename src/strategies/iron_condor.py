@@ -5,8 +5,9 @@ Profit si le prix reste dans une range
 """
 
 from ..models.black_scholes import Call, Put
-from ..utils.market_data import get_ticker_info
+from ..utils.market_data import get_risk_free_rate, get_ticker_info
 import numpy as np
+from typing import Optional
 
 
 class IronCondor:
@@ -57,11 +58,19 @@ class IronCondor:
         """Largeur du call spread"""
         return self.long_call.K - self.short_call.K
     
+    def legs(self) -> list:
+        """Jambes de la stratégie: liste de tuples (option, quantité signée)"""
+        return [
+            (self.long_put, 1), (self.short_put, -1),
+            (self.short_call, -1), (self.long_call, 1)
+        ]
+    
     @classmethod
     def from_ticker(cls, ticker: str, time_to_expiry_days: int,
                     put_spread_width_pct: float = 0.05,
                     call_spread_width_pct: float = 0.05,
-                    center_offset_pct: float = 0.10):
+                    center_offset_pct: float = 0.10,
+                    risk_free_rate: Optional[float] = None):
         """
         Crée un Iron Condor depuis un ticker Yahoo Finance
         
@@ -71,12 +80,14 @@ class IronCondor:
             put_spread_width_pct: Largeur du put spread en % du spot (0.05 = 5%)
             call_spread_width_pct: Largeur du call spread en % du spot
             center_offset_pct: Distance du centre par rapport au spot (0.10 = 10%)
+            risk_free_rate: Taux sans risque (si None, taux de la courbe à la maturité)
         """
         info = get_ticker_info(ticker)
         spot_price = info['current_price']
         volatility = info.get('implied_volatility', 0.3)
-        risk_free_rate = 0.05
         time_to_expiry_years = time_to_expiry_days / 365.0
+        if risk_free_rate is None:
+            risk_free_rate = get_risk_free_rate(time_to_expiry_years)
         
         # Calcul des strikes symétriques autour du spot
         put_width = spot_price * put_spread_width_pct
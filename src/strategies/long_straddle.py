@@ -3,9 +3,9 @@ Long Straddle Strategy
 Stratégie combinant un call et un put ATM pour profiter de la volatilité
 """
 
-from typing import Dict, Optional, Tuple
-from ..models.black_scholes import Call, Put, get_greeks
-from ..utils.market_data import get_market_data
+from typing import Dict, List, Optional, Tuple
+from ..models.black_scholes import BlackScholesOption, Call, Put, get_greeks
+from ..utils.market_data import get_market_data, get_risk_free_rate
 
 
 class LongStraddle:
@@ -72,7 +72,9 @@ class LongStraddle:
     
     @classmethod
     def from_ticker(cls, ticker: str, K: Optional[float] = None, 
-                    days_to_expiry: int = 30) -> 'LongStraddle':
+                    days_to_expiry: int = 30,
+                    volatility_estimator: str = 'close_to_close',
+                    volatility_model: str = 'historical') -> 'LongStraddle':
         """
         Crée un Long Straddle en récupérant les données depuis Yahoo Finance
         
@@ -80,12 +82,18 @@ class LongStraddle:
             ticker: Symbole du ticker (ex: 'AAPL')
             K: Prix d'exercice (si None, utilise le prix spot pour ATM)
             days_to_expiry: Nombre de jours jusqu'à l'échéance
+            volatility_estimator: Estimateur de volatilité réalisée ('close_to_close',
+                'parkinson', 'garman_klass', 'rogers_satchell', 'yang_zhang')
+            volatility_model: 'historical' (volatilité réalisée) ou prévision sur
+                la durée de vie de l'option ('ewma', 'garch')
             
         Returns:
             Instance de LongStraddle avec données de marché
         """
         # Récupérer les données de marché
-        S, sigma, r = get_market_data(ticker)
+        S, sigma, r = get_market_data(ticker, volatility_estimator=volatility_estimator,
+                                      volatility_model=volatility_model,
+                                      horizon_days=days_to_expiry)
         
         # Si pas de strike spécifié, utiliser ATM
         if K is None:
@@ -96,6 +104,35 @@ class LongStraddle:
         
         return cls(S, K, T, r, sigma)
     
+    @classmethod
+    def from_option_chain(cls, snapshot, days_to_expiry: int = 30,
+                          K: Optional[float] = None,
+                          r: Optional[float] = None) -> 'LongStraddle':
+        """
+        Crée un Long Straddle à partir de cotations réelles (snapshot de chaînes d'options)
+        
+        Chaque jambe est valorisée à sa volatilité implicite cotée, sur
+        l'échéance cotée la plus proche et le strike coté le plus proche.
+        
+        Args:
+            snapshot: OptionChainSnapshot (voir utils.option_chains)
+            days_to_expiry: Maturité cible en jours
+            K: Strike cible (si None, strike coté le plus proche du spot)
+            r: Taux sans risque (si None, taux de la courbe à la maturité cotée)
+            
+        Returns:
+            Instance de LongStraddle aux paramètres de marché
+        """
+        quote = snapshot.straddle_quote(days_to_expiry, K)
+        S, K = quote['spot'], quote['strike']
+        T = max(quote['days_to_expiry'], 1) / 365.0
+        if r is None:
+            r = get_risk_free_rate(T)
+        
+        call = Call(S, K, T, r, quote['call_implied_volatility'])
+        put = Put(S, K, T, r, quote['put_implied_volatility'])
+        return cls(call, put)
+    
     def price(self) -> float:
         """
         Calcule le prix total du straddle (coût d'entrée)
@@ -118,6 +155,15 @@ class LongStraddle:
         """
         return self.price()
     
+    def legs(self) -> List[Tuple[BlackScholesOption, int]]:
+        """
+        Décompose la stratégie en jambes
+        
+        Returns:
+            Liste de tuples (option, quantité signée)
+        """
+        return [(self.call, 1), (self.put, 1)]
+    
     def break_even_points(self) -> Tuple[float, float]:
         """
         Calcule les points morts (break-even) de la stratégie
@@ -5,8 +5,9 @@ Profit si mouvement important dans les deux sens
 """
 
 from ..models.black_scholes import Call, Put
-from ..utils.market_data import get_ticker_info
+from ..utils.market_data import get_risk_free_rate, get_ticker_info
 import numpy as np
+from typing import Optional
 
 
 class LongStrangle:
@@ -35,10 +36,15 @@ class LongStrangle:
         """Alias pour price() pour compatibilité"""
         return self.price()
     
+    def legs(self) -> list:
+        """Jambes de la stratégie: liste de tuples (option, quantité signée)"""
+        return [(self.call, 1), (self.put, 1)]
+    
     @classmethod
     def from_ticker(cls, ticker: str, time_to_expiry_days: int, 
                     call_strike: float = None, put_strike: float = None,
-                    otm_percent: float = 0.05):
+                    otm_percent: float = 0.05,
+                    risk_free_rate: Optional[float] = None):
         """
         Crée un Long Strangle depuis un ticker Yahoo Finance
         
@@ -48,12 +54,14 @@ class LongStrangle:
             call_strike: Strike du call (optionnel, défaut = spot * (1 + otm_percent))
             put_strike: Strike du put (optionnel, défaut = spot * (1 - otm_percent))
             otm_percent: Pourcentage OTM par défaut (0.05 = 5%)
+            risk_free_rate: Taux sans risque (si None, taux de la courbe à la maturité)
         """
         info = get_ticker_info(ticker)
         spot_price = info['current_price']
         volatility = info.get('implied_volatility', 0.3)
-        risk_free_rate = 0.05
         time_to_expiry_years = time_to_expiry_days / 365.0
+        if risk_free_rate is None:
+            risk_free_rate = get_risk_free_rate(time_to_expiry_years)
         
         # Calcul des strikes OTM si non fournis
         if call_strike is None:
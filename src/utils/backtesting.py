@@ -3,18 +3,288 @@ Backtesting historique pour stratégies d'options
 Teste les stratégies sur données historiques réelles
 """
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from ..models.black_scholes import Call, Put
+from typing import Dict, List, Optional, Tuple
+from ..models.black_scholes import option_delta_array, option_price_array
+from .intraday import (DAILY_COLUMNS, INTRADAY_ESTIMATORS, INTRADAY_PREFIX,
+                       get_intraday_features, intraday_volatility)
+from .price_store import PRICE_COLUMNS, PriceStore, get_default_store
+from .realized_volatility import get_realized_volatility
+from .volatility_forecast import FORECAST_MODELS, get_default_forecaster
+from .yield_curve import YieldCurve
+
+
+# Volatilité utilisée quand la volatilité historique n'est pas disponible
+DEFAULT_VOLATILITY = 0.3
+
+# Taux sans risque (courbe plate) des backtests sans courbe des taux explicite
+RISK_FREE_RATE = 0.05
+
+
+def _strategy_strikes(strategy_name: str, entry_prices: np.ndarray,
+                      strategy_params: Dict) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Calcule les strikes call/put de chaque trade selon la stratégie
+    
+    Args:
+        strategy_name: Nom de la classe de stratégie
+        entry_prices: Prix du sous-jacent à l'entrée de chaque trade (array de forme quelconque)
+        strategy_params: Paramètres de la stratégie (strike, otm_percent)
+        
+    Returns:
+        Tuple (strikes des calls, strikes des puts), None si la stratégie
+        n'est pas supportée
+    """
+    if strategy_name == 'LongStraddle':
+        strike = strategy_params.get('strike')
+        strikes = entry_prices.copy() if strike is None else np.full_like(entry_prices, float(strike))
+        return strikes, strikes
+    
+    if strategy_name == 'LongStrangle':
+        otm_pct = strategy_params.get('otm_percent', 0.05)
+        call_strikes = entry_prices * (1 + otm_pct)
+        put_strikes = entry_prices * (1 - otm_pct)
+        
+        # Un strangle exige un strike call strictement supérieur au strike put
+        if otm_pct <= 0:
+            call_strikes = np.full_like(entry_prices, np.nan)
+        return call_strikes, put_strikes
+    
+    return None
+
+
+def _price_entries(strategy_name: str, entry_prices: np.ndarray, volatility: np.ndarray,
+                   holding_period_days: int, yield_curve: YieldCurve,
+                   strategy_params: Dict) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Strikes et coût d'entrée de trades, pricés par Black-Scholes vectorisé
+    
+    Règles communes à tous les backtests: volatilité par défaut si elle est
+    absente, strikes selon la stratégie, taux lu sur la courbe à la maturité
+    des options.
+    
+    Args:
+        strategy_name: Nom de la classe de stratégie
+        entry_prices: Prix du sous-jacent à l'entrée (array de forme quelconque)
+        volatility: Volatilités annualisées à l'entrée (même forme)
+        holding_period_days: Durée de vie des options en jours
+        yield_curve: Courbe des taux du pricing
+        strategy_params: Paramètres de la stratégie
+        
+    Returns:
+        Dictionnaire d'arrays ('volatility', 'call_strikes', 'put_strikes',
+        'initial_cost', 'valid'), None si la stratégie n'est pas supportée
+    """
+    volatility = np.where(np.isnan(volatility) | (volatility <= 0), DEFAULT_VOLATILITY, volatility)
+    legs = _strategy_strikes(strategy_name, entry_prices, strategy_params)
+    if legs is None:
+        return None
+    call_strikes, put_strikes = legs
+    
+    time_to_expiry_years = holding_period_days / 365.0
+    rate = yield_curve.rate(time_to_expiry_years)
+    with np.errstate(invalid='ignore'):
+        valid = (entry_prices > 0) & (call_strikes > 0) & (put_strikes > 0)
+        initial_cost = (
+            option_price_array(entry_prices, call_strikes, time_to_expiry_years,
+                               rate, volatility, is_call=True) +
+            option_price_array(entry_prices, put_strikes, time_to_expiry_years,
+                               rate, volatility, is_call=False)
+        )
+    return {
+        'volatility': volatility,
+        'call_strikes': call_strikes,
+        'put_strikes': put_strikes,
+        'initial_cost': initial_cost,
+        'valid': valid
+    }
+
+
+def _expiry_payoff(exit_prices: np.ndarray, call_strikes: np.ndarray,
+                   put_strikes: np.ndarray) -> np.ndarray:
+    """Valeur intrinsèque des deux jambes à l'échéance"""
+    return np.maximum(exit_prices - call_strikes, 0.0) + np.maximum(put_strikes - exit_prices, 0.0)
+
+
+def _trade_statistics(results: np.ndarray, rebalance_frequency_days: int) -> Dict:
+    """
+    Calcule les statistiques globales d'une série de P&L de trades
+    
+    Args:
+        results: P&L de chaque trade, dans l'ordre chronologique
+        rebalance_frequency_days: Fréquence de rééquilibrage (annualisation du Sharpe)
+        
+    Returns:
+        Dictionnaire de statistiques
+    """
+    results_array = np.asarray(results, dtype=float)
+    winning_trades = results_array[results_array > 0]
+    losing_trades = results_array[results_array < 0]
+    
+    total_trades = len(results_array)
+    winning_count = len(winning_trades)
+    losing_count = len(losing_trades)
+    win_rate = (winning_count / total_trades) * 100 if total_trades > 0 else 0
+    
+    avg_win = np.mean(winning_trades) if len(winning_trades) > 0 else 0
+    avg_loss = np.mean(losing_trades) if len(losing_trades) > 0 else 0
+    
+    total_profit = np.sum(results_array)
+    avg_profit = np.mean(results_array)
+    
+    # Profit factor
+    total_gains = np.sum(winning_trades) if len(winning_trades) > 0 else 0
+    total_losses = abs(np.sum(losing_trades)) if len(losing_trades) > 0 else 1
+    profit_factor = total_gains / total_losses if total_losses != 0 else float('inf')
+    
+    # Sharpe ratio (simplifié)
+    std = np.std(results_array)
+    sharpe_ratio = (avg_profit / std) * np.sqrt(252 / rebalance_frequency_days) if std != 0 else 0
+    
+    # Maximum drawdown
+    cumulative = np.cumsum(results_array)
+    running_max = np.maximum.accumulate(cumulative)
+    drawdown = cumulative - running_max
+    max_drawdown = np.min(drawdown) if len(drawdown) > 0 else 0
+    
+    return {
+        'total_trades': total_trades,
+        'winning_trades': winning_count,
+        'losing_trades': losing_count,
+        'win_rate': win_rate,
+        'total_profit': total_profit,
+        'avg_profit_per_trade': avg_profit,
+        'avg_winning_trade': avg_win,
+        'avg_losing_trade': avg_loss,
+        'profit_factor': profit_factor,
+        'sharpe_ratio': sharpe_ratio,
+        'max_drawdown': max_drawdown,
+        'best_trade': np.max(results_array),
+        'worst_trade': np.min(results_array)
+    }
+
+
+def _trade_statistics_by_column(results: np.ndarray, rebalance_frequency_days: int) -> pd.DataFrame:
+    """
+    Statistiques de trades calculées colonne par colonne en une passe
+    
+    Args:
+        results: Matrice (trades x tickers) des P&L, NaN pour les trades absents
+        rebalance_frequency_days: Fréquence de rééquilibrage (annualisation du Sharpe)
+    
+    Returns:
+        DataFrame avec une ligne de statistiques par colonne
+    """
+    valid = ~np.isnan(results)
+    filled = np.where(valid, results, 0.0)
+    gains = np.where(filled > 0, filled, 0.0)
+    losses = np.where(filled < 0, filled, 0.0)
+    
+    total_trades = valid.sum(axis=0)
+    winning = (filled > 0).sum(axis=0)
+    losing = (filled < 0).sum(axis=0)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        win_rate = np.where(total_trades > 0, winning / total_trades * 100, 0.0)
+        avg_profit = filled.sum(axis=0) / total_trades
+        avg_win = np.where(winning > 0, gains.sum(axis=0) / winning, 0.0)
+        avg_loss = np.where(losing > 0, losses.sum(axis=0) / losing, 0.0)
+        
+        total_gains = gains.sum(axis=0)
+        total_losses = np.where(losing > 0, -losses.sum(axis=0), 1.0)
+        profit_factor = total_gains / total_losses
+        
+        std = np.sqrt(np.where(valid, (filled - avg_profit)**2, 0.0).sum(axis=0) / total_trades)
+        sharpe_ratio = np.where(std > 0, avg_profit / std * np.sqrt(252 / rebalance_frequency_days), 0.0)
+    
+    cumulative = np.cumsum(filled, axis=0)
+    drawdown = cumulative - np.maximum.accumulate(cumulative, axis=0)
+    
+    return pd.DataFrame({
+        'total_trades': total_trades,
+        'winning_trades': winning,
+        'losing_trades': losing,
+        'win_rate': win_rate,
+        'total_profit': filled.sum(axis=0),
+        'avg_profit_per_trade': avg_profit,
+        'avg_winning_trade': avg_win,
+        'avg_losing_trade': avg_loss,
+        'profit_factor': profit_factor,
+        'sharpe_ratio': sharpe_ratio,
+        'max_drawdown': drawdown.min(axis=0),
+        'best_trade': np.nanmax(np.where(valid, results, -np.inf), axis=0),
+        'worst_trade': np.nanmin(np.where(valid, results, np.inf), axis=0)
+    })
+
+
+def _position_grid(entry_idx: np.ndarray, exit_idx: np.ndarray,
+                   num_days: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Grille des séances de vie de chaque position
+    
+    Chaque ligne contient les indices de séance d'une position, de son entrée
+    jusqu'à sa sortie incluse; les cases au-delà de la sortie sont masquées.
+    
+    Args:
+        entry_idx: Indice de séance d'entrée de chaque position
+        exit_idx: Indice de séance de sortie de chaque position
+        num_days: Nombre total de séances
+        
+    Returns:
+        Tuple (indices de séance (positions x durée max), masque des séances de vie)
+    """
+    max_life = int(np.max(exit_idx - entry_idx)) + 1 if len(entry_idx) else 1
+    days = entry_idx[:, None] + np.arange(max_life)[None, :]
+    alive = days <= exit_idx[:, None]
+    return np.minimum(days, num_days - 1), alive
+
+
+def _band_rebalances(target: np.ndarray, is_open: np.ndarray, band: float) -> np.ndarray:
+    """
+    Séances de réajustement d'une couverture en bande
+    
+    Chaque réajustement dépend du niveau fixé au précédent: il n'y a pas
+    de forme fermée, mais la boucle porte sur les réajustements et non sur
+    les séances. À chaque tour, le premier dépassement de bande qui suit le
+    dernier réajustement est trouvé pour toutes les positions à la fois
+    (argmax sur la matrice des écarts); les positions sans dépassement
+    restant sortent de la boucle.
+    
+    Args:
+        target: Couverture cible (positions x séances de vie)
+        is_open: Masque des séances où la position est ouverte
+        band: Écart maximal toléré entre cible et couverture détenue
+        
+    Returns:
+        Masque des séances où la couverture est réajustée sur la cible
+    """
+    # Entrée et séances après la clôture (couverture soldée): toujours sur la cible
+    rebalanced = ~is_open
+    rebalanced[:, 0] = True
+    
+    steps = np.arange(target.shape[1])
+    rows = np.arange(target.shape[0])
+    last = np.zeros(target.shape[0], dtype=np.int64)
+    while len(rows):
+        level = target[rows, last]
+        crossing = (
+            (np.abs(target[rows] - level[:, None]) > band) &
+            is_open[rows] & (steps[None, :] > last[:, None])
+        )
+        found = crossing.any(axis=1)
+        rows, last = rows[found], crossing[found].argmax(axis=1)
+        rebalanced[rows, last] = True
+    return rebalanced
 
 
 class Backtester:
     """Backtesting de stratégies d'options sur données historiques"""
     
-    def __init__(self, ticker: str, start_date: str, end_date: str):
+    def __init__(self, ticker: str, start_date: str, end_date: str,
+                 store: Optional[PriceStore] = None,
+                 yield_curve: Optional[YieldCurve] = None):
         """
         Initialise le backtester
         
@@ -22,213 +292,586 @@ class Backtester:
             ticker: Symbole du ticker
             start_date: Date de début (format 'YYYY-MM-DD')
             end_date: Date de fin (format 'YYYY-MM-DD')
+            store: Store local des prix (défaut: store partagé du processus)
+            yield_curve: Courbe des taux du pricing (défaut: taux plat RISK_FREE_RATE)
         """
         self.ticker = ticker
         self.start_date = start_date
         self.end_date = end_date
+        self.store = store or get_default_store()
+        self.yield_curve = yield_curve or YieldCurve.flat(RISK_FREE_RATE)
         self.data = None
         self.load_data()
     
-    def load_data(self):
-        """Charge les données historiques depuis Yahoo Finance"""
-        ticker_obj = yf.Ticker(self.ticker)
-        self.data = ticker_obj.history(start=self.start_date, end=self.end_date)
+    @classmethod
+    def from_dataframe(cls, ticker: str, data: pd.DataFrame,
+                       yield_curve: Optional[YieldCurve] = None) -> 'Backtester':
+        """
+        Crée un backtester à partir de données OHLCV déjà chargées (sans téléchargement)
+        
+        Args:
+            ticker: Symbole du ticker
+            data: DataFrame OHLCV indexé par date (au moins la colonne 'Close')
+            yield_curve: Courbe des taux du pricing (défaut: taux plat RISK_FREE_RATE)
+            
+        Returns:
+            Instance de Backtester
+        """
+        backtester = cls.__new__(cls)
+        backtester.ticker = ticker
+        backtester.start_date = data.index[0].strftime('%Y-%m-%d') if len(data) else None
+        backtester.end_date = data.index[-1].strftime('%Y-%m-%d') if len(data) else None
+        backtester.store = None
+        backtester.yield_curve = yield_curve or YieldCurve.flat(RISK_FREE_RATE)
+        backtester.data = data.copy()
+        backtester._prepare_data()
+        return backtester
+    
+    def _rates(self, maturity_years):
+        """
+        Taux sans risque par maturité, lus sur la courbe du backtester
         
+        La courbe n'est jamais celle du jour par défaut: un backtest ne
+        dépend pas du réseau et ne reprice pas l'historique aux taux actuels.
+        
+        Args:
+            maturity_years: Maturité(s) en années (scalaire ou array)
+            
+        Returns:
+            Taux de même forme que maturity_years
+        """
+        return self.yield_curve.rate(maturity_years)
+    
+    def load_data(self):
+        """Charge les données historiques depuis le store local (complété via le provider de données)"""
+        self.data = self.store.get_history(self.ticker, self.start_date, self.end_date)
+        self._prepare_data()
+    
+    def _prepare_data(self):
+        """Valide les données chargées et calcule rendements et volatilité"""
         if self.data.empty:
             raise ValueError(f"Aucune donnée disponible pour {self.ticker} entre {self.start_date} et {self.end_date}")
         
         # Calcul des rendements et volatilité historique
         self.data['Returns'] = self.data['Close'].pct_change()
-        self.data['Volatility'] = self.data['Returns'].rolling(window=30).std() * np.sqrt(252)
+        self.data['Volatility'] = self.calculate_historical_volatility(30)
     
-    def calculate_historical_volatility(self, window: int = 30) -> pd.Series:
+    def attach_intraday_features(self, features: Optional[pd.DataFrame] = None,
+                                 interval: str = '5m') -> int:
+        """
+        Ajoute aux données les agrégats journaliers intraday (variance réalisée,
+        bipower variation, range), utilisables comme estimateurs de volatilité
+        
+        Args:
+            features: Agrégats journaliers (None = lus depuis le store local)
+            interval: Fréquence des barres sources
+            
+        Returns:
+            Nombre de séances disposant d'agrégats intraday
+        """
+        if features is None:
+            features = get_intraday_features(self.ticker, self.start_date, self.end_date,
+                                             interval, self.store)
+        
+        columns = [column for column in DAILY_COLUMNS if column not in PRICE_COLUMNS]
+        features = features[columns].add_prefix(INTRADAY_PREFIX)
+        self.data = self.data.drop(columns=[c for c in features.columns if c in self.data])
+        self.data = self.data.join(features, how='left')
+        return int(self.data[INTRADAY_PREFIX + 'num_bars'].notna().sum())
+    
+    def calculate_historical_volatility(self, window: int = 30,
+                                        estimator: str = 'close_to_close') -> pd.Series:
         """
         Calcule la volatilité historique roulante
         
         Args:
             window: Fenêtre de calcul en jours
+            estimator: Estimateur de volatilité réalisée ('close_to_close', 'parkinson',
+                'garman_klass', 'rogers_satchell', 'yang_zhang')
             
         Returns:
             Série de volatilités
         """
-        returns = self.data['Close'].pct_change()
-        volatility = returns.rolling(window=window).std() * np.sqrt(252)
-        return volatility
+        return get_realized_volatility(self.ticker, self.data, window, estimator)
+    
+    def _volatility_series(self, volatility_window: Optional[int] = None,
+                           volatility_estimator: str = 'close_to_close',
+                           horizon_days: int = 30) -> pd.Series:
+        """
+        Série de volatilité utilisée pour pricer les trades
+        
+        L'estimateur close-to-close utilise les rendements logarithmiques
+        (realized_volatility), et non plus les rendements simples
+        (pct_change) de la version d'origine: les volatilités, et donc les
+        primes des trades, diffèrent légèrement de l'ancienne boucle.
+        
+        Args:
+            volatility_window: Fenêtre en jours (None = 30 jours)
+            volatility_estimator: Nom de l'estimateur de volatilité réalisée (y compris
+                intraday, voir attach_intraday_features), ou modèle de prévision ('ewma', 'garch')
+            horizon_days: Horizon de la prévision (durée de vie de l'option)
+            
+        Returns:
+            Série de volatilités annualisées
+        """
+        if volatility_estimator in INTRADAY_ESTIMATORS:
+            return intraday_volatility(self.data, volatility_window or 30, volatility_estimator)
+        if volatility_estimator in FORECAST_MODELS:
+            return get_default_forecaster().forecast_series(self.ticker, self.data, horizon_days,
+                                                            volatility_estimator)
+        if volatility_window is None and volatility_estimator == 'close_to_close':
+            return self.data['Volatility']
+        return self.calculate_historical_volatility(volatility_window or 30, volatility_estimator)
+    
+    def _build_trades(self, strategy_class, holding_period_days: int,
+                      rebalance_frequency_days: int,
+                      volatility_window: Optional[int],
+                      strategy_params: Dict,
+                      volatility_estimator: str = 'close_to_close') -> Optional[Dict[str, np.ndarray]]:
+        """
+        Construit et price à l'entrée tous les trades du backtest sous forme d'arrays
+        
+        Les dates de sortie sont résolues par un seul searchsorted et les
+        jambes sont pricées avec Black-Scholes vectorisé.
+        
+        Args:
+            strategy_class: Classe de la stratégie
+            holding_period_days: Durée de détention de la position
+            rebalance_frequency_days: Fréquence des entrées en séances
+            volatility_window: Fenêtre de volatilité historique
+            strategy_params: Paramètres de la stratégie
+            volatility_estimator: Nom de l'estimateur de volatilité réalisée
+            
+        Returns:
+            Dictionnaire d'arrays par trade, None si aucun trade valide
+        """
+        index = self.data.index
+        close = self.data['Close'].to_numpy(dtype=float)
+        
+        # Dates d'entrée avec la fréquence de rééquilibrage, sortie à la
+        # première séance >= entrée + holding period
+        entry_idx = np.arange(0, len(index), rebalance_frequency_days)
+        exit_targets = index[entry_idx] + pd.Timedelta(days=holding_period_days)
+        exit_idx = index.searchsorted(exit_targets, side='left')
+        
+        has_exit = exit_idx < len(index)
+        entry_idx = entry_idx[has_exit]
+        exit_idx = exit_idx[has_exit]
+        
+        entry_prices = close[entry_idx]
+        exit_prices = close[exit_idx]
+        
+        # Volatilité historique au moment de l'entrée
+        volatility = self._volatility_series(volatility_window, volatility_estimator,
+                                             holding_period_days).to_numpy(dtype=float)[entry_idx]
+        
+        priced = _price_entries(strategy_class.__name__, entry_prices, volatility,
+                                holding_period_days, self.yield_curve, strategy_params)
+        if priced is None:
+            return None
+        valid = priced.pop('valid')
+        if not valid.any():
+            return None
+        
+        return {
+            'entry_idx': entry_idx[valid],
+            'exit_idx': exit_idx[valid],
+            'entry_prices': entry_prices[valid],
+            'exit_prices': exit_prices[valid],
+            **{name: values[valid] for name, values in priced.items()}
+        }
+    
+    def _revalue_trades(self, trades: Dict[str, np.ndarray], holding_period_days: int,
+                        volatility_window: Optional[int] = None,
+                        volatility_estimator: str = 'close_to_close') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Revalorise chaque trade à chaque séance de sa vie, d'un bloc
+        
+        Les jambes sont pricées par Black-Scholes avec le temps restant
+        jusqu'à l'échéance et la volatilité roulante du jour; à l'échéance,
+        la valeur est la valeur intrinsèque.
+        
+        Args:
+            trades: Arrays des trades (voir _build_trades)
+            holding_period_days: Durée de vie des options en jours
+            volatility_window: Fenêtre de volatilité historique
+            volatility_estimator: Nom de l'estimateur de volatilité
+            
+        Returns:
+            Tuple (valeurs (trades x séances de vie), indices de séance, masque des séances de vie)
+        """
+        index = self.data.index
+        close = self.data['Close'].to_numpy(dtype=float)
+        volatility = self._volatility_series(volatility_window, volatility_estimator,
+                                             holding_period_days).to_numpy(dtype=float)
+        volatility = np.where(np.isnan(volatility) | (volatility <= 0), DEFAULT_VOLATILITY, volatility)
+        
+        entry_idx, exit_idx = trades['entry_idx'], trades['exit_idx']
+        days, alive = _position_grid(entry_idx, exit_idx, len(index))
+        
+        # Temps restant jusqu'à l'échéance (calendaire) à chaque séance de vie
+        expiry_ns = (index[entry_idx] + pd.Timedelta(days=holding_period_days)).as_unit('ns').asi8
+        day_ns = index.as_unit('ns').asi8[days]
+        remaining_years = (expiry_ns[:, None] - day_ns) / (365.0 * 86400 * 1e9)
+        
+        spot = close[days]
+        sigma = volatility[days]
+        rates = self._rates(remaining_years)
+        values = (
+            option_price_array(spot, trades['call_strikes'][:, None], remaining_years,
+                               rates, sigma, is_call=True) +
+            option_price_array(spot, trades['put_strikes'][:, None], remaining_years,
+                               rates, sigma, is_call=False)
+        )
+        return values, days, alive
     
     def backtest_strategy(self, strategy_class, 
                          holding_period_days: int = 30,
                          rebalance_frequency_days: int = 30,
+                         volatility_window: Optional[int] = None,
+                         volatility_estimator: str = 'close_to_close',
+                         include_trades: bool = True,
                          **strategy_params) -> Dict:
         """
         Backtest une stratégie sur la période historique
         
+        Tous les trades sont évalués d'un bloc (voir _build_trades).
+        
         Args:
             strategy_class: Classe de la stratégie (LongStraddle, LongStrangle, etc.)
             holding_period_days: Durée de détention de la position
             rebalance_frequency_days: Fréquence de rééquilibrage
+            volatility_window: Fenêtre de volatilité historique (None = 30 jours)
+            volatility_estimator: Estimateur de volatilité réalisée ('close_to_close',
+                'parkinson', 'garman_klass', 'rogers_satchell', 'yang_zhang') ou
+                prévision sur la durée de détention ('ewma', 'garch')
+            include_trades: Inclure le détail des trades et la courbe d'equity
             **strategy_params: Paramètres additionnels pour la stratégie
             
         Returns:
             Résultats du backtest
         """
-        results = []
+        trades_arrays = self._build_trades(strategy_class, holding_period_days,
+                                           rebalance_frequency_days, volatility_window,
+                                           strategy_params, volatility_estimator)
+        if trades_arrays is None:
+            return {
+                'success': False,
+                'error': 'Aucun trade valide trouvé'
+            }
+        
+        entry_idx = trades_arrays['entry_idx']
+        exit_idx = trades_arrays['exit_idx']
+        entry_prices = trades_arrays['entry_prices']
+        exit_prices = trades_arrays['exit_prices']
+        volatility = trades_arrays['volatility']
+        call_strikes = trades_arrays['call_strikes']
+        put_strikes = trades_arrays['put_strikes']
+        initial_cost = trades_arrays['initial_cost']
+        
+        # P&L à l'échéance
+        index = self.data.index
+        results = _expiry_payoff(exit_prices, call_strikes, put_strikes) - initial_cost
+        roi = np.divide(results, initial_cost, out=np.zeros_like(results),
+                        where=initial_cost != 0) * 100
+        
+        entry_dates = index[entry_idx]
+        exit_dates = index[exit_idx]
+        
         trades = []
+        if include_trades:
+            trades = pd.DataFrame({
+                'entry_date': entry_dates,
+                'exit_date': exit_dates,
+                'entry_price': entry_prices,
+                'exit_price': exit_prices,
+                'price_change': exit_prices - entry_prices,
+                'price_change_pct': (exit_prices - entry_prices) / entry_prices * 100,
+                'initial_cost': initial_cost,
+                'profit': results,
+                'roi': roi,
+                'volatility': volatility,
+                'holding_days': (exit_dates - entry_dates).days
+            }).to_dict('records')
         
-        # Parcourir les dates avec la fréquence de rééquilibrage
-        dates = self.data.index[::rebalance_frequency_days]
-        
-        for i, entry_date in enumerate(dates):
-            # Vérifier qu'on a assez de données pour le holding period
-            exit_date = entry_date + timedelta(days=holding_period_days)
-            if exit_date not in self.data.index:
-                # Trouver la date la plus proche
-                future_dates = self.data.index[self.data.index > exit_date]
-                if len(future_dates) == 0:
-                    break
-                exit_date = future_dates[0]
-            
-            # Prix d'entrée et de sortie
-            entry_price = self.data.loc[entry_date, 'Close']
-            exit_price = self.data.loc[exit_date, 'Close']
-            
-            # Volatilité historique au moment de l'entrée
-            volatility = self.data.loc[entry_date, 'Volatility']
-            if pd.isna(volatility) or volatility <= 0:
-                volatility = 0.3  # Valeur par défaut
-            
-            # Créer la stratégie
-            try:
-                time_to_expiry_years = holding_period_days / 365.0
-                
-                # Construction selon le type de stratégie
-                if strategy_class.__name__ == 'LongStraddle':
-                    from ..strategies.long_straddle import LongStraddle
-                    strike = strategy_params.get('strike', entry_price)
-                    call = Call(entry_price, strike, time_to_expiry_years, 0.05, volatility)
-                    put = Put(entry_price, strike, time_to_expiry_years, 0.05, volatility)
-                    strategy = LongStraddle(call, put)
-                
-                elif strategy_class.__name__ == 'LongStrangle':
-                    from ..strategies.long_strangle import LongStrangle
-                    otm_pct = strategy_params.get('otm_percent', 0.05)
-                    call_strike = entry_price * (1 + otm_pct)
-                    put_strike = entry_price * (1 - otm_pct)
-                    call = Call(entry_price, call_strike, time_to_expiry_years, 0.05, volatility)
-                    put = Put(entry_price, put_strike, time_to_expiry_years, 0.05, volatility)
-                    strategy = LongStrangle(call, put)
-                
-                else:
-                    continue
-                
-                # Calcul du P&L
-                initial_cost = strategy.total_cost
-                profit_at_exit = strategy.profit_at_expiry(exit_price)
-                roi = (profit_at_exit / initial_cost) * 100 if initial_cost != 0 else 0
-                
-                trade = {
-                    'entry_date': entry_date,
-                    'exit_date': exit_date,
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'price_change': exit_price - entry_price,
-                    'price_change_pct': ((exit_price - entry_price) / entry_price) * 100,
-                    'initial_cost': initial_cost,
-                    'profit': profit_at_exit,
-                    'roi': roi,
-                    'volatility': volatility,
-                    'holding_days': (exit_date - entry_date).days
-                }
-                
-                trades.append(trade)
-                results.append(profit_at_exit)
+        stats = _trade_statistics(results, rebalance_frequency_days)
+        
+        return {
+            'success': True,
+            'ticker': self.ticker,
+            'strategy': strategy_class.__name__,
+            'period': f"{self.start_date} à {self.end_date}",
+            **stats,
+            'holding_period_days': holding_period_days,
+            'rebalance_frequency_days': rebalance_frequency_days,
+            'trades': trades,
+            'equity_curve': np.cumsum(results).tolist() if include_trades else []
+        }
+    
+    def mark_to_market(self, strategy_class,
+                       holding_period_days: int = 30,
+                       entry_frequency_days: int = 1,
+                       volatility_window: Optional[int] = None,
+                       volatility_estimator: str = 'close_to_close',
+                       **strategy_params) -> Dict:
+        """
+        Valorisation quotidienne (mark-to-model) de positions qui se chevauchent
+        
+        Chaque position ouverte est revalorisée chaque jour par Black-Scholes
+        avec le temps restant et la volatilité roulante du jour. Toutes les
+        valorisations sont calculées d'un bloc sur une matrice
+        (positions x séances de vie), puis agrégées par séance.
+        
+        Args:
+            strategy_class: Classe de la stratégie (LongStraddle, LongStrangle)
+            holding_period_days: Durée de vie de chaque position
+            entry_frequency_days: Écart entre deux entrées en séances (1 = entrée quotidienne)
+            volatility_window: Fenêtre de volatilité historique (None = 30 jours)
+            volatility_estimator: Nom de l'estimateur de volatilité réalisée
+            **strategy_params: Paramètres additionnels pour la stratégie
             
-            except Exception as e:
-                print(f"Erreur pour trade du {entry_date}: {e}")
-                continue
+        Returns:
+            Courbe d'equity quotidienne, drawdown et exposition par séance
+        """
+        trades = self._build_trades(strategy_class, holding_period_days,
+                                    entry_frequency_days, volatility_window,
+                                    strategy_params, volatility_estimator)
+        if trades is None:
+            return {
+                'success': False,
+                'error': 'Aucun trade valide trouvé'
+            }
+        
+        index = self.data.index
+        num_days = len(index)
+        entry_idx, exit_idx = trades['entry_idx'], trades['exit_idx']
+        values, days, alive = self._revalue_trades(trades, holding_period_days,
+                                                   volatility_window, volatility_estimator)
+        initial_cost = trades['initial_cost']
+        cost_grid = np.broadcast_to(initial_cost[:, None], values.shape)
+        
+        # Positions ouvertes: de l'entrée jusqu'à la veille de la sortie
+        is_open = alive & (days < exit_idx[:, None])
+        open_days = days[is_open]
+        unrealized = np.bincount(open_days, weights=(values - cost_grid)[is_open],
+                                 minlength=num_days)
+        market_value = np.bincount(open_days, weights=values[is_open], minlength=num_days)
+        capital_deployed = np.bincount(open_days, weights=cost_grid[is_open], minlength=num_days)
+        open_positions = np.bincount(open_days, minlength=num_days)
+        
+        # P&L réalisé à la sortie (valeur intrinsèque à l'échéance)
+        final_values = values[np.arange(len(exit_idx)), exit_idx - entry_idx]
+        realized_pnl = final_values - initial_cost
+        realized = np.cumsum(np.bincount(exit_idx, weights=realized_pnl, minlength=num_days))
+        
+        equity = realized + unrealized
+        drawdown = equity - np.maximum.accumulate(equity)
+        
+        daily = pd.DataFrame({
+            'equity': equity,
+            'daily_pnl': np.diff(equity, prepend=0.0),
+            'realized_pnl': realized,
+            'unrealized_pnl': unrealized,
+            'drawdown': drawdown,
+            'open_positions': open_positions,
+            'market_value': market_value,
+            'capital_deployed': capital_deployed
+        }, index=index)
+        daily = daily.iloc[entry_idx[0]:exit_idx.max() + 1]
+        
+        daily_returns = daily['daily_pnl'].to_numpy()
+        daily_std = np.std(daily_returns)
+        
+        return {
+            'success': True,
+            'ticker': self.ticker,
+            'strategy': strategy_class.__name__,
+            'period': f"{self.start_date} à {self.end_date}",
+            'holding_period_days': holding_period_days,
+            'entry_frequency_days': entry_frequency_days,
+            'total_positions': len(entry_idx),
+            'total_profit': float(realized_pnl.sum()),
+            'max_drawdown': float(daily['drawdown'].min()),
+            'max_open_positions': int(daily['open_positions'].max()),
+            'max_capital_deployed': float(daily['capital_deployed'].max()),
+            'daily_sharpe_ratio': float(np.mean(daily_returns) / daily_std * np.sqrt(252)) if daily_std != 0 else 0,
+            'daily': daily
+        }
+    
+    def backtest_delta_hedged(self, strategy_class,
+                              holding_period_days: int = 30,
+                              rebalance_frequency_days: int = 30,
+                              hedge_band: Optional[float] = None,
+                              hedge_cost_bps: float = 0.0,
+                              volatility_window: Optional[int] = None,
+                              volatility_estimator: str = 'close_to_close',
+                              include_trades: bool = True,
+                              **strategy_params) -> Dict:
+        """
+        Backtest d'une stratégie couverte en delta (gamma scalping)
+        
+        Chaque position est couverte par le sous-jacent, réajusté à chaque
+        clôture sur le delta Black-Scholes des jambes (volatilité roulante du
+        jour), ou seulement quand l'écart au delta cible dépasse hedge_band.
+        Deltas, couvertures et P&L sont calculés sur des matrices
+        (positions x séances de vie); le mode bande ne boucle que sur les
+        réajustements successifs, toutes positions confondues (voir _band_rebalances).
         
-        # Calcul des statistiques globales
-        if not results:
+        Le financement porte sur la prime payée et sur la valeur de la
+        couverture au taux sans risque, entre deux séances.
+        
+        Args:
+            strategy_class: Classe de la stratégie (LongStraddle, LongStrangle)
+            holding_period_days: Durée de détention de la position
+            rebalance_frequency_days: Écart entre deux entrées en séances
+            hedge_band: Écart de delta déclenchant un réajustement (None = quotidien)
+            hedge_cost_bps: Coût de transaction sur le sous-jacent en points de base
+            volatility_window: Fenêtre de volatilité historique (None = 30 jours)
+            volatility_estimator: Nom de l'estimateur de volatilité réalisée
+            include_trades: Inclure le détail des trades et la courbe d'equity
+            **strategy_params: Paramètres additionnels pour la stratégie
+        
+        Returns:
+            Résultats du backtest avec P&L options, couverture et financement séparés
+        """
+        trades = self._build_trades(strategy_class, holding_period_days,
+                                    rebalance_frequency_days, volatility_window,
+                                    strategy_params, volatility_estimator)
+        if trades is None:
             return {
                 'success': False,
                 'error': 'Aucun trade valide trouvé'
             }
         
-        results_array = np.array(results)
-        winning_trades = results_array[results_array > 0]
-        losing_trades = results_array[results_array < 0]
+        index = self.data.index
+        close = self.data['Close'].to_numpy(dtype=float)
+        volatility = self._volatility_series(volatility_window, volatility_estimator,
+                                             holding_period_days).to_numpy(dtype=float)
+        volatility = np.where(np.isnan(volatility) | (volatility <= 0), DEFAULT_VOLATILITY, volatility)
+        
+        entry_idx, exit_idx = trades['entry_idx'], trades['exit_idx']
+        days, alive = _position_grid(entry_idx, exit_idx, len(index))
+        
+        expiry_ns = (index[entry_idx] + pd.Timedelta(days=holding_period_days)).as_unit('ns').asi8
+        day_ns = index.as_unit('ns').asi8[days]
+        remaining_years = (expiry_ns[:, None] - day_ns) / (365.0 * 86400 * 1e9)
         
-        total_trades = len(results)
-        winning_count = len(winning_trades)
-        losing_count = len(losing_trades)
-        win_rate = (winning_count / total_trades) * 100 if total_trades > 0 else 0
+        spot = close[days]
+        sigma = volatility[days]
+        call_strikes = trades['call_strikes'][:, None]
+        put_strikes = trades['put_strikes'][:, None]
+        rates = self._rates(remaining_years)
+        delta = (
+            option_delta_array(spot, call_strikes, remaining_years, rates, sigma, is_call=True) +
+            option_delta_array(spot, put_strikes, remaining_years, rates, sigma, is_call=False)
+        )
         
-        avg_win = np.mean(winning_trades) if len(winning_trades) > 0 else 0
-        avg_loss = np.mean(losing_trades) if len(losing_trades) > 0 else 0
+        # Couverture détenue après la clôture de chaque séance (soldée à la sortie)
+        is_open = alive & (days < exit_idx[:, None])
+        target = np.where(is_open, -delta, 0.0)
+        if hedge_band is None:
+            hedge = target
+        else:
+            # Couverture de la séance = cible à la séance du dernier réajustement
+            rebalanced = _band_rebalances(target, is_open, hedge_band)
+            steps = np.arange(target.shape[1])
+            last_rebalance = np.maximum.accumulate(np.where(rebalanced, steps, 0), axis=1)
+            hedge = np.take_along_axis(target, last_rebalance, axis=1)
         
-        total_profit = np.sum(results)
-        avg_profit = np.mean(results)
+        # P&L de couverture et financement entre deux séances de vie
+        held = is_open[:, :-1]
+        price_moves = np.diff(spot, axis=1)
+        period_years = np.diff(day_ns, axis=1) / (365.0 * 86400 * 1e9)
+        initial_cost = trades['initial_cost']
         
-        # Profit factor
-        total_gains = np.sum(winning_trades) if len(winning_trades) > 0 else 0
-        total_losses = abs(np.sum(losing_trades)) if len(losing_trades) > 0 else 1
-        profit_factor = total_gains / total_losses if total_losses != 0 else float('inf')
+        hedge_pnl = np.where(held, hedge[:, :-1] * price_moves, 0.0).sum(axis=1)
+        financing = np.where(
+            held,
+            -(initial_cost[:, None] + hedge[:, :-1] * spot[:, :-1]) * self._rates(period_years) * period_years,
+            0.0
+        ).sum(axis=1)
         
-        # Sharpe ratio (simplifié)
-        sharpe_ratio = (avg_profit / np.std(results)) * np.sqrt(252 / rebalance_frequency_days) if np.std(results) != 0 else 0
+        traded = np.abs(np.diff(hedge, axis=1, prepend=0.0))
+        hedge_costs = (traded * spot).sum(axis=1) * hedge_cost_bps / 10000
+        rebalances = (traded > 0).sum(axis=1)
         
-        # Maximum drawdown
-        cumulative = np.cumsum(results)
-        running_max = np.maximum.accumulate(cumulative)
-        drawdown = cumulative - running_max
-        max_drawdown = np.min(drawdown) if len(drawdown) > 0 else 0
+        payoff = _expiry_payoff(trades['exit_prices'], trades['call_strikes'], trades['put_strikes'])
+        option_pnl = payoff - initial_cost
+        results = option_pnl + hedge_pnl + financing - hedge_costs
+        
+        trade_records = []
+        if include_trades:
+            trade_records = pd.DataFrame({
+                'entry_date': index[entry_idx],
+                'exit_date': index[exit_idx],
+                'entry_price': trades['entry_prices'],
+                'exit_price': trades['exit_prices'],
+                'initial_cost': initial_cost,
+                'option_pnl': option_pnl,
+                'hedge_pnl': hedge_pnl,
+                'financing': financing,
+                'hedge_costs': hedge_costs,
+                'profit': results,
+                'rebalances': rebalances,
+                'volatility': trades['volatility']
+            }).to_dict('records')
+        
+        stats = _trade_statistics(results, rebalance_frequency_days)
         
         return {
             'success': True,
             'ticker': self.ticker,
             'strategy': strategy_class.__name__,
             'period': f"{self.start_date} à {self.end_date}",
-            'total_trades': total_trades,
-            'winning_trades': winning_count,
-            'losing_trades': losing_count,
-            'win_rate': win_rate,
-            'total_profit': total_profit,
-            'avg_profit_per_trade': avg_profit,
-            'avg_winning_trade': avg_win,
-            'avg_losing_trade': avg_loss,
-            'profit_factor': profit_factor,
-            'sharpe_ratio': sharpe_ratio,
-            'max_drawdown': max_drawdown,
-            'best_trade': np.max(results),
-            'worst_trade': np.min(results),
+            **stats,
+            'option_pnl': float(option_pnl.sum()),
+            'hedge_pnl': float(hedge_pnl.sum()),
+            'financing': float(financing.sum()),
+            'hedge_costs': float(hedge_costs.sum()),
+            'avg_rebalances_per_trade': float(rebalances.mean()),
+            'hedge_band': hedge_band,
             'holding_period_days': holding_period_days,
             'rebalance_frequency_days': rebalance_frequency_days,
-            'trades': trades,
-            'equity_curve': cumulative.tolist() if len(cumulative) > 0 else []
+            'trades': trade_records,
+            'equity_curve': np.cumsum(results).tolist() if include_trades else []
         }
-    
+
     def compare_strategies(self, strategies: List[tuple], 
-                          holding_period_days: int = 30) -> Dict:
+                          holding_period_days: int = 30,
+                          max_workers: Optional[int] = 1) -> Dict:
         """
         Compare plusieurs stratégies sur la même période
         
+        Les backtests sont évalués par le moteur de balayage de paramètres
+        (voir parameter_sweep.evaluate_configs).
+        
         Args:
             strategies: Liste de tuples (strategy_class, params_dict)
             holding_period_days: Durée de détention
+            max_workers: Nombre de processus (défaut: en série, sans pool;
+                None = nombre de cœurs)
             
         Returns:
             Résultats comparatifs
         """
-        comparison = {}
+        # Import différé: parameter_sweep dépend de ce module
+        from .parameter_sweep import evaluate_configs
         
-        for strategy_class, params in strategies:
-            result = self.backtest_strategy(
-                strategy_class,
-                holding_period_days=holding_period_days,
-                **params
-            )
-            
+        configs = [
+            {
+                'strategy_class': strategy_class,
+                'holding_period_days': holding_period_days,
+                'rebalance_frequency_days': 30,
+                'strategy_params': params
+            }
+            for strategy_class, params in strategies
+        ]
+        results = evaluate_configs(self, configs, max_workers)
+        
+        comparison = {}
+        for _, result in results.iterrows():
             if result['success']:
-                comparison[strategy_class.__name__] = {
+                comparison[result['strategy']] = {
                     'win_rate': result['win_rate'],
                     'total_profit': result['total_profit'],
                     'avg_profit': result['avg_profit_per_trade'],
@@ -243,37 +886,47 @@ class Backtester:
                               min_days: int = 7,
                               max_days: int = 90,
                               step: int = 7,
+                              max_workers: Optional[int] = 1,
                               **strategy_params) -> List[Dict]:
         """
         Trouve la période de détention optimale
         
+        Les durées sont évaluées par le moteur de balayage de paramètres
+        (voir parameter_sweep.evaluate_configs).
+        
         Args:
             strategy_class: Classe de stratégie
             min_days: Minimum de jours
             max_days: Maximum de jours
             step: Pas d'incrémentation
+            max_workers: Nombre de processus (défaut: en série, sans pool;
+                None = nombre de cœurs)
             **strategy_params: Paramètres de stratégie
             
         Returns:
             Liste de résultats par période
         """
-        results = []
-        
-        for holding_days in range(min_days, max_days + 1, step):
-            backtest_result = self.backtest_strategy(
-                strategy_class,
-                holding_period_days=holding_days,
-                rebalance_frequency_days=holding_days,
-                **strategy_params
-            )
-            
-            if backtest_result['success']:
-                results.append({
-                    'holding_period': holding_days,
-                    'total_profit': backtest_result['total_profit'],
-                    'win_rate': backtest_result['win_rate'],
-                    'sharpe_ratio': backtest_result['sharpe_ratio'],
-                    'profit_factor': backtest_result['profit_factor']
-                })
-        
-        return results
+        # Import différé: parameter_sweep dépend de ce module
+        from .parameter_sweep import evaluate_configs
+        
+        configs = [
+            {
+                'strategy_class': strategy_class,
+                'holding_period_days': holding_days,
+                'rebalance_frequency_days': holding_days,
+                'strategy_params': strategy_params
+            }
+            for holding_days in range(min_days, max_days + 1, step)
+        ]
+        results = evaluate_configs(self, configs, max_workers)
+        
+        return [
+            {
+                'holding_period': int(result['holding_period_days']),
+                'total_profit': result['total_profit'],
+                'win_rate': result['win_rate'],
+                'sharpe_ratio': result['sharpe_ratio'],
+                'profit_factor': result['profit_factor']
+            }
+            for _, result in results.iterrows() if result['success']
+        ]
@@ -0,0 +1,146 @@
+"""
+Block Bootstrap
+Intervalles de confiance des statistiques de backtest par bootstrap par blocs
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .backtesting import _trade_statistics, _trade_statistics_by_column
+
+
+# Statistiques pour lesquelles un intervalle de confiance est calculé
+BOOTSTRAP_STATISTICS = [
+    'sharpe_ratio', 'profit_factor', 'win_rate', 'max_drawdown',
+    'total_profit', 'avg_profit_per_trade'
+]
+
+
+def block_bootstrap_indices(num_observations: int, num_resamples: int,
+                            block_size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Matrice d'indices du bootstrap circulaire par blocs
+    
+    Chaque ré-échantillon est une concaténation de blocs de block_size
+    observations consécutives (la série est refermée sur elle-même), ce
+    qui conserve l'autocorrélation de court terme des P&L.
+    
+    Args:
+        num_observations: Longueur de la série d'origine
+        num_resamples: Nombre de ré-échantillons
+        block_size: Longueur des blocs
+        rng: Générateur aléatoire numpy
+    
+    Returns:
+        Array (ré-échantillons x observations) d'indices
+    """
+    num_blocks = -(-num_observations // block_size)
+    starts = rng.integers(0, num_observations, size=(num_resamples, num_blocks))
+    indices = starts[:, :, None] + np.arange(block_size)[None, None, :]
+    return indices.reshape(num_resamples, -1)[:, :num_observations] % num_observations
+
+
+def bootstrap_confidence_intervals(results: Sequence[float],
+                                   rebalance_frequency_days: int = 30,
+                                   num_resamples: int = 5000,
+                                   block_size: Optional[int] = None,
+                                   confidence: float = 0.95,
+                                   seed: Optional[int] = None) -> Dict:
+    """
+    Intervalles de confiance des statistiques d'une série de P&L de trades
+    
+    Tous les ré-échantillons sont tirés comme une seule matrice d'indices,
+    et chaque statistique est calculée d'un bloc sur l'ensemble des
+    ré-échantillons (mêmes définitions que Backtester.backtest_strategy).
+    
+    Args:
+        results: P&L de chaque trade, dans l'ordre chronologique
+        rebalance_frequency_days: Fréquence de rééquilibrage (annualisation du Sharpe)
+        num_resamples: Nombre de ré-échantillons
+        block_size: Longueur des blocs (None = n^(1/3) arrondi)
+        confidence: Niveau de confiance des intervalles (ex: 0.95)
+        seed: Graine du générateur aléatoire
+    
+    Returns:
+        Estimations ponctuelles, intervalles percentiles et erreurs standard
+    """
+    results = np.asarray(results, dtype=float)
+    if len(results) < 2:
+        raise ValueError("Au moins 2 trades sont nécessaires pour le bootstrap")
+    if not 0 < confidence < 1:
+        raise ValueError("Le niveau de confiance doit être compris entre 0 et 1")
+    
+    if block_size is None:
+        block_size = max(1, int(round(len(results) ** (1 / 3))))
+    block_size = min(block_size, len(results))
+    
+    rng = np.random.default_rng(seed)
+    indices = block_bootstrap_indices(len(results), num_resamples, block_size, rng)
+    resampled = _trade_statistics_by_column(results[indices].T, rebalance_frequency_days)
+    
+    point_estimates = _trade_statistics(results, rebalance_frequency_days)
+    alpha = (1 - confidence) / 2
+    statistics = {}
+    for name in BOOTSTRAP_STATISTICS:
+        values = resampled[name].to_numpy(dtype=float)
+        finite = values[np.isfinite(values)]
+        lower, upper = np.quantile(finite, [alpha, 1 - alpha]) if len(finite) else (np.nan, np.nan)
+        statistics[name] = {
+            'estimate': float(point_estimates[name]),
+            'lower': float(lower),
+            'upper': float(upper),
+            'std_error': float(np.std(finite)) if len(finite) else np.nan
+        }
+    
+    sharpe = resampled['sharpe_ratio'].to_numpy(dtype=float)
+    profit = resampled['total_profit'].to_numpy(dtype=float)
+    return {
+        'success': True,
+        'num_trades': len(results),
+        'num_resamples': num_resamples,
+        'block_size': block_size,
+        'confidence': confidence,
+        'statistics': statistics,
+        'prob_positive_sharpe': float((sharpe > 0).mean()),
+        'prob_loss': float((profit < 0).mean())
+    }
+
+
+def bootstrap_backtest(backtester, strategy_class,
+                       holding_period_days: int = 30,
+                       rebalance_frequency_days: int = 30,
+                       num_resamples: int = 5000,
+                       block_size: Optional[int] = None,
+                       confidence: float = 0.95,
+                       seed: Optional[int] = None,
+                       **strategy_params) -> Dict:
+    """
+    Backtest une stratégie puis calcule les intervalles de confiance de ses statistiques
+    
+    Args:
+        backtester: Backtester portant les données
+        strategy_class: Classe de la stratégie (LongStraddle, LongStrangle)
+        holding_period_days: Durée de détention de la position
+        rebalance_frequency_days: Fréquence de rééquilibrage
+        num_resamples: Nombre de ré-échantillons
+        block_size: Longueur des blocs (None = n^(1/3) arrondi)
+        confidence: Niveau de confiance des intervalles
+        seed: Graine du générateur aléatoire
+        **strategy_params: Paramètres additionnels pour la stratégie
+    
+    Returns:
+        Résultats du backtest complétés par la clé 'bootstrap'
+    """
+    result = backtester.backtest_strategy(strategy_class, holding_period_days,
+                                          rebalance_frequency_days, **strategy_params)
+    if not result['success']:
+        return result
+    if result['total_trades'] < 2:
+        return {**result, 'bootstrap': None}
+    
+    profits = np.array([trade['profit'] for trade in result['trades']])
+    result['bootstrap'] = bootstrap_confidence_intervals(
+        profits, rebalance_frequency_days, num_resamples, block_size, confidence, seed
+    )
+    return result
@@ -0,0 +1,286 @@
+"""
+Market Data Cache
+Cache mémoire des données de marché partagé par le processus,
+avec durée de vie par type de donnée, éviction LRU et regroupement
+des requêtes concurrentes (single-flight)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+# Durée de vie des entrées par type de donnée (secondes)
+CACHE_TTLS = {
+    'history': 300,      # historique récent (spot et volatilité en dérivent)
+    'curve': 86400,      # courbe des taux (clé: date du jour)
+}
+
+# Nombre maximal d'entrées par type de donnée
+CACHE_SIZES = {
+    'history': 1024,     # une watchlist de quelques centaines de tickers tient en cache
+    'curve': 2,
+}
+
+# Valeurs par défaut pour un type de donnée non configuré
+DEFAULT_TTL = 300
+DEFAULT_MAXSIZE = 128
+
+
+class _Flight:
+    """Appel en cours partagé par les requêtes concurrentes d'une même clé"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Regroupement des appels concurrents portant sur une même clé
+    
+    Le premier appelant exécute la fonction; les appelants arrivant
+    pendant l'exécution attendent et reçoivent le même résultat (ou la
+    même exception) au lieu de relancer le téléchargement.
+    """
+    
+    def __init__(self):
+        """Initialise un groupe sans appel en cours"""
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Exécute fn pour la clé, ou attend l'exécution déjà en cours
+        
+        Args:
+            key: Clé identifiant la requête (ex: (ticker, type, fenêtre))
+            fn: Fonction sans argument à exécuter
+        
+        Returns:
+            Résultat de fn, partagé entre tous les appelants concurrents
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                flight.waiters += 1
+                self.shared += 1
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+    
+    def in_flight(self) -> int:
+        """Nombre d'appels en cours"""
+        with self._lock:
+            return len(self._flights)
+
+
+class TTLCache:
+    """
+    Cache clé -> valeur avec expiration et éviction LRU
+    
+    Chaque entrée expire ttl secondes après son insertion; au-delà de
+    maxsize entrées, la moins récemment utilisée est évincée. Les accès
+    sont protégés par un verrou (cache partagé entre threads du serveur) et
+    les chargements concurrents d'une même clé sont regroupés.
+    """
+    
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise un cache vide
+        
+        Args:
+            maxsize: Nombre maximal d'entrées
+            ttl: Durée de vie d'une entrée en secondes
+            clock: Horloge monotone (injectable pour les tests)
+        """
+        if maxsize <= 0:
+            raise ValueError("La taille du cache doit être strictement positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Valeur associée à une clé si elle est présente et non expirée
+        
+        Args:
+            key: Clé de l'entrée
+            default: Valeur retournée en cas d'absence
+        
+        Returns:
+            Valeur en cache ou default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Insère ou remplace une entrée
+        
+        Args:
+            key: Clé de l'entrée
+            value: Valeur à conserver
+            ttl: Durée de vie spécifique (défaut: celle du cache)
+        """
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    ttl: Optional[float] = None) -> Any:
+        """
+        Valeur en cache, ou chargée puis mise en cache en cas d'absence
+        
+        Un seul chargement est lancé pour une clé absente, quel que soit le
+        nombre de threads qui la demandent simultanément.
+        
+        Args:
+            key: Clé de l'entrée
+            loader: Fonction sans argument calculant la valeur
+            ttl: Durée de vie spécifique (défaut: celle du cache)
+        
+        Returns:
+            Valeur de l'entrée
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        
+        def load():
+            # Seconde vérification: un chargement a pu se terminer entre-temps
+            value = self.get(key, missing)
+            if value is missing:
+                value = loader()
+                self.set(key, value, ttl)
+            return value
+        
+        return self.flight.do(key, load)
+    
+    def items(self) -> List[Tuple[Hashable, Any, float]]:
+        """
+        Entrées non expirées (pour la sauvegarde du cache sur disque)
+        
+        Returns:
+            Liste de tuples (clé, valeur, durée de vie restante en secondes)
+        """
+        now = self._clock()
+        with self._lock:
+            return [(key, value, expires_at - now)
+                    for key, (expires_at, value) in self._entries.items() if expires_at > now]
+    
+    def invalidate(self, key: Hashable):
+        """Supprime une entrée si elle existe"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def stats(self) -> Dict:
+        """
+        Statistiques d'utilisation du cache
+        
+        Returns:
+            Dictionnaire avec taille, hits, misses, taux de hit et
+            nombre de requêtes servies par un chargement déjà en cours
+        """
+        total = self.hits + self.misses
+        return {
+            'size': len(self),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'loads': self.flight.calls,
+            'coalesced': self.flight.shared
+        }
+
+
+_caches: Dict[str, TTLCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(data_type: str) -> TTLCache:
+    """
+    Cache partagé par le processus pour un type de donnée
+    
+    Args:
+        data_type: Type de donnée (ex: 'history', 'curve')
+    
+    Returns:
+        Instance de TTLCache configurée selon CACHE_TTLS et CACHE_SIZES
+    """
+    with _caches_lock:
+        if data_type not in _caches:
+            _caches[data_type] = TTLCache(CACHE_SIZES.get(data_type, DEFAULT_MAXSIZE),
+                                          CACHE_TTLS.get(data_type, DEFAULT_TTL))
+        return _caches[data_type]
+
+
+def clear_caches():
+    """Vide tous les caches de données de marché"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """
+    Statistiques de tous les caches de données de marché
+    
+    Returns:
+        Dictionnaire type de donnée -> statistiques
+    """
+    with _caches_lock:
+        caches = dict(_caches)
+    return {data_type: cache.stats() for data_type, cache in caches.items()}
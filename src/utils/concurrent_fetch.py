@@ -0,0 +1,119 @@
+"""
+Concurrent Fetch
+Exécution parallèle d'appels indépendants aux sources de données de marché,
+avec délai maximal par appel
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Union
+
+
+# Délai maximal par défaut d'un appel (secondes)
+DEFAULT_TIMEOUT = 20.0
+
+# Nombre de threads du pool partagé (appels bloqués sur le réseau, pas sur le CPU)
+MAX_WORKERS = 16
+
+# Marqueur d'absence de valeur par défaut
+_NO_DEFAULT = object()
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Pool de threads partagé par le processus"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                           thread_name_prefix='market-data',
+                                           initializer=_mark_worker)
+        return _executor
+
+
+def _mark_worker():
+    """Marque les threads du pool (les appels imbriqués s'exécutent sur place)"""
+    _worker.active = True
+
+
+def fetch_concurrently(tasks: Dict[Hashable, Callable[[], Any]],
+                       timeout: Union[float, Dict[Hashable, float]] = DEFAULT_TIMEOUT,
+                       defaults: Optional[Dict[Hashable, Any]] = None) -> Dict[Hashable, Any]:
+    """
+    Lance des appels indépendants en parallèle et attend qu'ils soient tous terminés
+    
+    La latence totale est bornée par l'appel le plus lent plutôt que par la
+    somme des appels. Un appel qui échoue ou dépasse son délai prend sa
+    valeur par défaut si elle est fournie, sinon l'erreur est propagée.
+    Depuis un thread du pool, les appels sont exécutés séquentiellement
+    (pas de blocage du pool par des appels imbriqués).
+    
+    Args:
+        tasks: Dictionnaire nom -> fonction sans argument
+        timeout: Délai maximal en secondes, commun ou par nom d'appel
+        defaults: Valeurs de repli par nom d'appel (en cas d'erreur ou de délai dépassé)
+    
+    Returns:
+        Dictionnaire nom -> résultat
+    """
+    defaults = defaults or {}
+    timeouts = {key: timeout.get(key, DEFAULT_TIMEOUT) if isinstance(timeout, dict) else timeout
+                for key in tasks}
+    
+    if getattr(_worker, 'active', False) or len(tasks) <= 1:
+        results = {}
+        for key, task in tasks.items():
+            try:
+                results[key] = task()
+            except Exception:
+                if defaults.get(key, _NO_DEFAULT) is _NO_DEFAULT:
+                    raise
+                results[key] = defaults[key]
+        return results
+    
+    started = time.monotonic()
+    executor = _get_executor()
+    futures = {key: executor.submit(task) for key, task in tasks.items()}
+    
+    results = {}
+    for key, future in futures.items():
+        remaining = max(started + timeouts[key] - time.monotonic(), 0.0)
+        try:
+            results[key] = future.result(timeout=remaining)
+        except TimeoutError:
+            future.cancel()
+            if defaults.get(key, _NO_DEFAULT) is _NO_DEFAULT:
+                raise TimeoutError(f"Délai dépassé ({timeouts[key]:.1f}s) pour l'appel '{key}'")
+            results[key] = defaults[key]
+        except Exception:
+            if defaults.get(key, _NO_DEFAULT) is _NO_DEFAULT:
+                raise
+            results[key] = defaults[key]
+    return results
+
+
+def map_concurrently(fn: Callable[[Any], Any], items: Iterable[Any],
+                     timeout: float = DEFAULT_TIMEOUT,
+                     default: Any = _NO_DEFAULT) -> List[Any]:
+    """
+    Applique une fonction à chaque élément en parallèle
+    
+    Args:
+        fn: Fonction d'un argument (ex: lambda ticker: get_spot_price(ticker))
+        items: Éléments à traiter
+        timeout: Délai maximal par appel en secondes
+        default: Valeur de repli en cas d'erreur ou de délai dépassé (défaut: erreur propagée)
+    
+    Returns:
+        Liste des résultats dans l'ordre des éléments
+    """
+    items = list(items)
+    tasks = {i: (lambda item=item: fn(item)) for i, item in enumerate(items)}
+    defaults = {} if default is _NO_DEFAULT else {i: default for i in tasks}
+    results = fetch_concurrently(tasks, timeout, defaults)
+    return [results[i] for i in range(len(items))]
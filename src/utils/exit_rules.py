@@ -0,0 +1,206 @@
+"""
+Exit Rule Optimization
+Évaluation vectorisée de règles de sortie (take-profit, stop-loss, time-stop)
+sur les trades d'un backtest revalorisés quotidiennement
+"""
+
+import itertools
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backtesting import _trade_statistics_by_column
+
+
+def revalue_backtest(backtester, strategy_class,
+                     holding_period_days: int = 30,
+                     rebalance_frequency_days: int = 30,
+                     volatility_window: Optional[int] = None,
+                     volatility_estimator: str = 'close_to_close',
+                     **strategy_params) -> Optional[Dict]:
+    """
+    Revalorise une fois chaque trade du backtest à chaque séance de sa vie
+    
+    Args:
+        backtester: Backtester portant les données
+        strategy_class: Classe de la stratégie (LongStraddle, LongStrangle)
+        holding_period_days: Durée de détention maximale (échéance des options)
+        rebalance_frequency_days: Fréquence de rééquilibrage
+        volatility_window: Fenêtre de volatilité historique
+        volatility_estimator: Nom de l'estimateur de volatilité
+        **strategy_params: Paramètres additionnels pour la stratégie
+    
+    Returns:
+        Dictionnaire avec la matrice des ROI (trades x séances de vie, en %),
+        les valeurs, les jours calendaires écoulés et les coûts initiaux;
+        None si aucun trade valide
+    """
+    trades = backtester._build_trades(strategy_class, holding_period_days,
+                                      rebalance_frequency_days, volatility_window,
+                                      strategy_params, volatility_estimator)
+    if trades is None:
+        return None
+    
+    values, days, alive = backtester._revalue_trades(trades, holding_period_days,
+                                                     volatility_window, volatility_estimator)
+    index_ns = backtester.data.index.as_unit('ns').asi8
+    elapsed_days = (index_ns[days] - index_ns[trades['entry_idx']][:, None]) / (86400 * 1e9)
+    
+    initial_cost = trades['initial_cost']
+    values = np.where(alive, values, np.nan)
+    roi = (values - initial_cost[:, None]) / initial_cost[:, None] * 100
+    
+    return {
+        'strategy': strategy_class.__name__,
+        'holding_period_days': holding_period_days,
+        'rebalance_frequency_days': rebalance_frequency_days,
+        'entry_dates': backtester.data.index[trades['entry_idx']],
+        'initial_cost': initial_cost,
+        'values': values,
+        'roi': roi,
+        'elapsed_days': np.where(alive, elapsed_days, np.inf),
+        'last_day': alive.sum(axis=1) - 1
+    }
+
+
+def _first_passage(path: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """
+    Première séance où un chemin croissant atteint chaque seuil
+    
+    Args:
+        path: Maximum courant (trades x séances), croissant par ligne
+        thresholds: Seuils triés ou non
+    
+    Returns:
+        Array (trades x seuils) d'indices de séance (= nombre de séances si jamais atteint)
+    """
+    return (path[:, :, None] < thresholds[None, None, :]).sum(axis=1)
+
+
+def evaluate_exit_rules(revalued: Dict,
+                        take_profits: Iterable[Optional[float]] = (None,),
+                        stop_losses: Iterable[Optional[float]] = (None,),
+                        time_stops: Iterable[Optional[float]] = (None,)) -> pd.DataFrame:
+    """
+    Évalue toute une grille de règles de sortie sur des trades revalorisés
+    
+    Les seuils sont testés aux clôtures, à partir de la séance suivant
+    l'entrée. Les premiers franchissements sont obtenus pour tous les seuils
+    à la fois à partir des maxima et minima courants du ROI, puis chaque
+    combinaison sort à la première des trois échéances.
+    
+    Args:
+        revalued: Résultat de revalue_backtest
+        take_profits: Seuils de ROI de prise de bénéfice en % (None = aucun)
+        stop_losses: Seuils de ROI de stop-loss en %, négatifs (None = aucun)
+        time_stops: Durées de détention maximales en jours calendaires (None = échéance)
+    
+    Returns:
+        DataFrame avec une ligne de statistiques par règle
+    """
+    roi = revalued['roi']
+    num_trades = roi.shape[0]
+    last_day = revalued['last_day']
+    
+    take_profits = list(take_profits)
+    stop_losses = list(stop_losses)
+    time_stops = list(time_stops)
+    tp = np.array([np.inf if x is None else x for x in take_profits], dtype=float)
+    sl = np.array([-np.inf if x is None else x for x in stop_losses], dtype=float)
+    ts = np.array([np.inf if x is None else x for x in time_stops], dtype=float)
+    if (sl > 0).any():
+        raise ValueError("Les stop-loss doivent être exprimés en ROI négatif (ex: -50)")
+    
+    # Séance d'entrée exclue des déclenchements: ROI neutralisé à la colonne 0
+    tracked = roi.copy()
+    tracked[:, 0] = np.nan
+    running_max = np.fmax.accumulate(np.nan_to_num(tracked, nan=-np.inf), axis=1)
+    running_min = np.fmin.accumulate(np.nan_to_num(tracked, nan=np.inf), axis=1)
+    
+    tp_day = _first_passage(running_max, tp)
+    sl_day = _first_passage(-running_min, -sl)
+    ts_day = np.minimum((revalued['elapsed_days'][:, :, None] < ts[None, None, :]).sum(axis=1),
+                        last_day[:, None])
+    
+    # Combinaisons (trades x TP x SL x TS): sortie à la première échéance
+    exit_day = np.minimum(
+        np.minimum(tp_day[:, :, None, None], sl_day[:, None, :, None]),
+        ts_day[:, None, None, :]
+    )
+    exit_day = np.minimum(exit_day, last_day[:, None, None, None])
+    
+    rows = np.arange(num_trades)[:, None, None, None]
+    exit_value = revalued['values'][rows, exit_day]
+    profits = (exit_value - revalued['initial_cost'][:, None, None, None]).reshape(num_trades, -1)
+    
+    by_take_profit = exit_day == tp_day[:, :, None, None]
+    by_stop_loss = (exit_day == sl_day[:, None, :, None]) & ~by_take_profit
+    held_days = np.take_along_axis(revalued['elapsed_days'], exit_day.reshape(num_trades, -1), axis=1)
+    
+    stats = _trade_statistics_by_column(profits, revalued['rebalance_frequency_days'])
+    combinations = list(itertools.product(take_profits, stop_losses, time_stops))
+    rules = pd.DataFrame(combinations, columns=['take_profit', 'stop_loss', 'time_stop'])
+    
+    rules = pd.concat([rules, stats], axis=1)
+    rules['avg_roi'] = (profits / revalued['initial_cost'][:, None]).mean(axis=0) * 100
+    rules['avg_days_held'] = held_days.mean(axis=0)
+    rules['pct_take_profit'] = by_take_profit.reshape(num_trades, -1).mean(axis=0) * 100
+    rules['pct_stop_loss'] = by_stop_loss.reshape(num_trades, -1).mean(axis=0) * 100
+    return rules
+
+
+def optimize_exit_rules(backtester, strategy_class,
+                        take_profits: Iterable[Optional[float]] = (None, 25, 50, 100),
+                        stop_losses: Iterable[Optional[float]] = (None, -25, -50),
+                        time_stops: Iterable[Optional[float]] = (None,),
+                        holding_period_days: int = 30,
+                        rebalance_frequency_days: int = 30,
+                        sort_by: str = 'sharpe_ratio',
+                        volatility_window: Optional[int] = None,
+                        volatility_estimator: str = 'close_to_close',
+                        **strategy_params) -> Dict:
+    """
+    Compare une grille de règles de sortie pour une stratégie
+    
+    Le backtest est revalorisé une seule fois; toutes les règles sont
+    ensuite évaluées sur la même matrice de valeurs.
+    
+    Args:
+        backtester: Backtester portant les données
+        strategy_class: Classe de la stratégie (LongStraddle, LongStrangle)
+        take_profits: Seuils de prise de bénéfice en % de ROI (None = aucun)
+        stop_losses: Seuils de stop-loss en % de ROI négatif (None = aucun)
+        time_stops: Durées de détention maximales en jours (None = échéance)
+        holding_period_days: Échéance des options en jours
+        rebalance_frequency_days: Fréquence de rééquilibrage
+        sort_by: Statistique de classement des règles
+        volatility_window: Fenêtre de volatilité historique
+        volatility_estimator: Nom de l'estimateur de volatilité
+        **strategy_params: Paramètres additionnels pour la stratégie
+    
+    Returns:
+        Règles classées et meilleure règle
+    """
+    revalued = revalue_backtest(backtester, strategy_class, holding_period_days,
+                                rebalance_frequency_days, volatility_window,
+                                volatility_estimator, **strategy_params)
+    if revalued is None:
+        return {
+            'success': False,
+            'error': 'Aucun trade valide trouvé'
+        }
+    
+    rules = evaluate_exit_rules(revalued, take_profits, stop_losses, time_stops)
+    rules = rules.sort_values(sort_by, ascending=False).reset_index(drop=True)
+    
+    return {
+        'success': True,
+        'ticker': backtester.ticker,
+        'strategy': strategy_class.__name__,
+        'holding_period_days': holding_period_days,
+        'rebalance_frequency_days': rebalance_frequency_days,
+        'total_trades': len(revalued['initial_cost']),
+        'rules': rules,
+        'best_rule': rules.iloc[0].to_dict()
+    }
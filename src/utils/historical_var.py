@@ -0,0 +1,207 @@
+"""
+Historical Simulation VaR
+VaR et Expected Shortfall par simulation historique (simple ou filtrée)
+avec revalorisation Black-Scholes complète des positions
+"""
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..models.black_scholes import Call, option_price_array
+from .volatility_forecast import EWMA_LAMBDA, ewma_variance
+
+
+# Méthodes de simulation disponibles
+VAR_METHODS = ('historical', 'filtered')
+
+
+def position_legs(positions) -> Dict[str, np.ndarray]:
+    """
+    Aplatit un book de stratégies en arrays de jambes
+    
+    Args:
+        positions: Stratégie (avec une méthode legs()), liste de stratégies,
+            liste de tuples (stratégie, nombre de positions) ou dictionnaire
+            nom -> stratégie / tuple
+    
+    Returns:
+        Dictionnaire d'arrays par jambe (S, K, T, r, sigma, q, is_call, quantity,
+        position = indice de la position) et noms des positions ('names')
+    """
+    if hasattr(positions, 'legs'):
+        positions = [positions]
+    if isinstance(positions, dict):
+        names, positions = list(positions.keys()), list(positions.values())
+    else:
+        positions = list(positions)
+        names = [
+            f"{i}: {(position[0] if isinstance(position, tuple) else position).__class__.__name__}"
+            for i, position in enumerate(positions)
+        ]
+    
+    legs = []
+    for index, position in enumerate(positions):
+        strategy, count = position if isinstance(position, tuple) else (position, 1)
+        legs.extend((option, quantity * count, index) for option, quantity in strategy.legs())
+    
+    if not legs:
+        raise ValueError("Le book ne contient aucune position")
+    
+    return {
+        'S': np.array([option.S for option, _, _ in legs], dtype=float),
+        'K': np.array([option.K for option, _, _ in legs], dtype=float),
+        'T': np.array([option.T for option, _, _ in legs], dtype=float),
+        'r': np.array([option.r for option, _, _ in legs], dtype=float),
+        'sigma': np.array([option.sigma for option, _, _ in legs], dtype=float),
+        'q': np.array([option.q for option, _, _ in legs], dtype=float),
+        'is_call': np.array([isinstance(option, Call) for option, _, _ in legs]),
+        'quantity': np.array([quantity for _, quantity, _ in legs], dtype=float),
+        'position': np.array([index for _, _, index in legs], dtype=np.int64),
+        'names': names
+    }
+
+
+def revalue_legs(legs: Dict[str, np.ndarray],
+                 spot_factor: Union[float, np.ndarray] = 1.0,
+                 volatility_shift: Union[float, np.ndarray] = 0.0,
+                 days_elapsed: Union[float, np.ndarray] = 0.0,
+                 by_position: bool = False) -> np.ndarray:
+    """
+    Valeur du book pour chaque scénario, toutes jambes pricées d'un bloc
+    
+    Args:
+        legs: Jambes du book (voir position_legs)
+        spot_factor: Multiplicateur du spot par scénario
+        volatility_shift: Variation additive de la volatilité par scénario
+        days_elapsed: Jours calendaires écoulés par scénario
+        by_position: Détailler la valeur par position
+    
+    Returns:
+        Array des valeurs du book (une par scénario), ou (scénarios x positions)
+    """
+    spot_factor = np.asarray(spot_factor, dtype=float)[..., None]
+    volatility_shift = np.asarray(volatility_shift, dtype=float)[..., None]
+    days_elapsed = np.asarray(days_elapsed, dtype=float)[..., None]
+    
+    values = option_price_array(
+        legs['S'] * spot_factor, legs['K'], legs['T'] - days_elapsed / 365.0, legs['r'],
+        np.maximum(legs['sigma'] + volatility_shift, 1e-4), legs['q'], legs['is_call']
+    )
+    if not by_position:
+        return values @ legs['quantity']
+    
+    # Somme des jambes de chaque position par segments contigus: O(scénarios x jambes),
+    # sans matrice (jambes x positions)
+    weighted = values * legs['quantity']
+    position = legs['position']
+    if np.any(np.diff(position) < 0):
+        order = np.argsort(position, kind='stable')
+        weighted, position = weighted[..., order], position[order]
+    counts = np.bincount(position, minlength=len(legs['names']))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    totals = np.add.reduceat(weighted, np.minimum(starts, len(position) - 1), axis=-1)
+    totals[..., counts == 0] = 0.0
+    return totals
+
+
+def historical_returns(close: np.ndarray, horizon_days: int = 1,
+                       filtered: bool = False, decay: float = EWMA_LAMBDA) -> np.ndarray:
+    """
+    Rendements logarithmiques historiques sur l'horizon (fenêtres glissantes)
+    
+    En simulation filtrée, chaque rendement journalier est réduit par la
+    volatilité EWMA connue la veille puis remis à l'échelle de la volatilité
+    EWMA actuelle, avant agrégation sur l'horizon.
+    
+    Args:
+        close: Cours de clôture chronologiques
+        horizon_days: Horizon en séances
+        filtered: Simulation historique filtrée par la volatilité
+        decay: Facteur de lissage EWMA
+    
+    Returns:
+        Array des rendements sur l'horizon (un par scénario)
+    """
+    returns = np.diff(np.log(np.asarray(close, dtype=float)))
+    returns = returns[np.isfinite(returns)]
+    if len(returns) <= horizon_days:
+        raise ValueError("Historique trop court pour l'horizon demandé")
+    
+    if filtered:
+        variance = ewma_variance(returns, decay)
+        # Volatilité connue à la veille de chaque rendement (la première est ignorée)
+        standardized = returns[1:] / np.sqrt(variance[:-1])
+        returns = standardized * np.sqrt(variance[-1])
+    
+    cumulative = np.concatenate(([0.0], np.cumsum(returns)))
+    return cumulative[horizon_days:] - cumulative[:-horizon_days]
+
+
+def historical_var(positions, history,
+                   horizon_days: int = 1,
+                   confidence_level: float = 0.99,
+                   method: str = 'historical',
+                   lookback_days: Optional[int] = None,
+                   decay: float = EWMA_LAMBDA) -> Dict:
+    """
+    VaR et Expected Shortfall d'un book d'options par simulation historique
+    
+    Chaque rendement historique sur l'horizon est appliqué au spot actuel;
+    le book est revalorisé par Black-Scholes (temps écoulé inclus,
+    volatilité inchangée) pour tous les scénarios à la fois.
+    
+    Args:
+        positions: Stratégie, liste de stratégies ou de tuples (stratégie, nombre)
+        history: Backtester (données déjà chargées), DataFrame OHLC ou série de clôtures
+        horizon_days: Horizon de la VaR en séances
+        confidence_level: Niveau de confiance (0.99 = 99%)
+        method: 'historical' ou 'filtered' (volatilité EWMA remise à l'échelle)
+        lookback_days: Nombre de séances d'historique utilisées (None = tout)
+        decay: Facteur de lissage EWMA (méthode filtrée)
+    
+    Returns:
+        Dictionnaire avec VaR et CVaR (P&L négatifs = pertes)
+    """
+    if method not in VAR_METHODS:
+        raise ValueError(f"Méthode de VaR inconnue: {method} (disponibles: {', '.join(VAR_METHODS)})")
+    if not 0 < confidence_level < 1:
+        raise ValueError("Le niveau de confiance doit être compris entre 0 et 1")
+    
+    data = getattr(history, 'data', history)
+    close = data['Close'] if isinstance(data, pd.DataFrame) else pd.Series(data)
+    close = close.dropna()
+    if lookback_days is not None:
+        close = close.iloc[-(lookback_days + 1):]
+    
+    returns = historical_returns(close.to_numpy(), horizon_days, method == 'filtered', decay)
+    # Date de fin de chaque fenêtre de rendement
+    scenario_dates = close.index[-len(returns):]
+    
+    legs = position_legs(positions)
+    current_value = float(revalue_legs(legs))
+    # Horizon calendaire approché: 7 jours pour 5 séances
+    scenario_values = revalue_legs(legs, np.exp(returns), 0.0, horizon_days * 365.0 / 252)
+    pnl = scenario_values - current_value
+    
+    var = float(np.quantile(pnl, 1 - confidence_level))
+    tail = pnl[pnl <= var]
+    cvar = float(tail.mean()) if len(tail) else var
+    worst = int(np.argmin(pnl))
+    
+    return {
+        'method': method,
+        'confidence_level': confidence_level,
+        'horizon_days': horizon_days,
+        'num_scenarios': len(pnl),
+        'current_value': current_value,
+        'value_at_risk': var,
+        'conditional_var': cvar,
+        'worst_loss': float(pnl[worst]),
+        'worst_scenario_date': scenario_dates[worst],
+        'interpretation': (
+            f"Avec {confidence_level*100}% de confiance, la perte sur {horizon_days} séance(s) "
+            f"ne dépassera pas ${abs(min(var, 0.0)):.2f}"
+        )
+    }
@@ -0,0 +1,506 @@
+"""
+Incremental Backtesting
+Backtests persistants qui ne traitent que les nouvelles séances (walk-forward)
+"""
+
+import glob
+import json
+import os
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backtesting import RISK_FREE_RATE, _expiry_payoff, _price_entries, _trade_statistics
+from .price_store import PriceStore, get_default_store
+from .realized_volatility import TRADING_DAYS, _rolling_variance
+from .yield_curve import YieldCurve
+
+
+# Colonnes des trades terminés
+TRADE_COLUMNS = [
+    'entry_date', 'exit_date', 'entry_price', 'exit_price', 'price_change',
+    'price_change_pct', 'initial_cost', 'profit', 'roi', 'volatility', 'holding_days'
+]
+
+# Colonnes des positions ouvertes (sortie pas encore disponible)
+POSITION_COLUMNS = [
+    'entry_date', 'exit_target', 'entry_price', 'volatility',
+    'call_strike', 'put_strike', 'initial_cost'
+]
+
+# Colonnes de dates des trades et positions (ISO 8601 dans les fichiers d'état)
+DATE_COLUMNS = ('entry_date', 'exit_date', 'exit_target')
+
+# Extension des fichiers d'état (JSON: aucun code exécuté au chargement)
+STATE_EXTENSION = '.json'
+
+
+def _frame_to_json(frame: pd.DataFrame) -> Dict[str, list]:
+    """Colonnes d'un DataFrame de trades ou de positions en listes sérialisables"""
+    columns = {}
+    for column in frame.columns:
+        if column in DATE_COLUMNS:
+            columns[column] = [pd.Timestamp(value).isoformat() for value in frame[column]]
+        else:
+            columns[column] = frame[column].to_numpy(dtype=float).tolist()
+    return columns
+
+
+def _frame_from_json(data: Dict[str, list], columns: List[str]) -> pd.DataFrame:
+    """Inverse de _frame_to_json"""
+    frame = pd.DataFrame({column: data.get(column, []) for column in columns}, columns=columns)
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+    for column in DATE_COLUMNS:
+        if column in frame:
+            frame[column] = pd.to_datetime(frame[column], format='ISO8601')
+    return frame
+
+
+class IncrementalBacktest:
+    """
+    Backtest à état persistant d'une stratégie sur un ticker
+    
+    L'état conserve les trades terminés, les positions ouvertes et la fin
+    de la série de rendements nécessaire à la volatilité roulante: une mise
+    à jour ne traite que les séances ajoutées et les trades qu'elles
+    terminent, avec les mêmes règles (pricing, courbe des taux et
+    volatilité close-to-close) que Backtester.backtest_strategy.
+    """
+    
+    def __init__(self, ticker: str, strategy_class,
+                 holding_period_days: int = 30,
+                 rebalance_frequency_days: int = 30,
+                 volatility_window: int = 30,
+                 yield_curve: Optional[YieldCurve] = None,
+                 **strategy_params):
+        """
+        Initialise un backtest incrémental vide
+        
+        Args:
+            ticker: Symbole du ticker
+            strategy_class: Classe de la stratégie (LongStraddle, LongStrangle)
+            holding_period_days: Durée de détention de la position
+            rebalance_frequency_days: Fréquence des entrées en séances
+            volatility_window: Fenêtre de volatilité close-to-close en séances
+            yield_curve: Courbe des taux du pricing (défaut: taux plat RISK_FREE_RATE)
+            **strategy_params: Paramètres additionnels pour la stratégie
+        """
+        self.ticker = ticker
+        self.strategy_name = strategy_class.__name__
+        self.holding_period_days = holding_period_days
+        self.rebalance_frequency_days = rebalance_frequency_days
+        self.volatility_window = volatility_window
+        self.yield_curve = yield_curve or YieldCurve.flat(RISK_FREE_RATE)
+        self.strategy_params = strategy_params
+        
+        self.bar_count = 0
+        self.last_date: Optional[pd.Timestamp] = None
+        self.last_close = np.nan
+        self.recent_returns = np.empty(0)
+        self.trades = pd.DataFrame(columns=TRADE_COLUMNS)
+        self.open_positions = pd.DataFrame(columns=POSITION_COLUMNS)
+    
+    @classmethod
+    def from_backtester(cls, backtester, strategy_class,
+                        holding_period_days: int = 30,
+                        rebalance_frequency_days: int = 30,
+                        volatility_window: int = 30,
+                        **strategy_params) -> 'IncrementalBacktest':
+        """
+        Crée un backtest incrémental initialisé avec les données et la
+        courbe des taux d'un Backtester
+        
+        Args:
+            backtester: Backtester dont les données sont reprises
+            strategy_class: Classe de la stratégie
+            holding_period_days: Durée de détention de la position
+            rebalance_frequency_days: Fréquence des entrées en séances
+            volatility_window: Fenêtre de volatilité close-to-close en séances
+            **strategy_params: Paramètres additionnels pour la stratégie
+        
+        Returns:
+            Instance de IncrementalBacktest à jour à la fin des données
+        """
+        backtest = cls(backtester.ticker, strategy_class, holding_period_days,
+                       rebalance_frequency_days, volatility_window,
+                       backtester.yield_curve, **strategy_params)
+        backtest.update(backtester.data)
+        return backtest
+    
+    def update(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Intègre de nouvelles séances
+        
+        Seules les séances postérieures à la dernière date traitée sont
+        prises en compte.
+        
+        Args:
+            bars: DataFrame indexé par date avec au moins la colonne 'Close'
+        
+        Returns:
+            DataFrame des trades terminés par ces séances
+        """
+        if self.last_date is not None:
+            bars = bars[bars.index > self.last_date]
+        if bars.empty:
+            return pd.DataFrame(columns=TRADE_COLUMNS)
+        
+        dates = pd.DatetimeIndex(bars.index)
+        close = bars['Close'].to_numpy(dtype=float)
+        
+        # Volatilité roulante des nouvelles séances: seuls les window - 1
+        # derniers rendements déjà vus sont nécessaires
+        returns = np.diff(np.log(np.concatenate(([self.last_close], close))))
+        history = np.concatenate((self.recent_returns, returns))
+        variance = _rolling_variance(history, self.volatility_window)[len(self.recent_returns):]
+        volatility = np.sqrt(variance * TRADING_DAYS)
+        self.recent_returns = history[-(self.volatility_window - 1):] if self.volatility_window > 1 else np.empty(0)
+        
+        # Nouvelles entrées aux séances multiples de la fréquence de rééquilibrage
+        positions = np.arange(self.bar_count, self.bar_count + len(bars))
+        is_entry = positions % self.rebalance_frequency_days == 0
+        new_positions = self._open_positions(dates[is_entry], close[is_entry], volatility[is_entry])
+        if not new_positions.empty:
+            self.open_positions = pd.concat([self.open_positions, new_positions], ignore_index=True) \
+                if not self.open_positions.empty else new_positions
+        
+        self.bar_count += len(bars)
+        self.last_date = dates[-1]
+        self.last_close = close[-1]
+        
+        completed = self._close_positions(dates, close)
+        if not completed.empty:
+            self.trades = pd.concat([self.trades, completed], ignore_index=True) \
+                if not self.trades.empty else completed
+        return completed
+    
+    def _open_positions(self, entry_dates: pd.DatetimeIndex, entry_prices: np.ndarray,
+                        volatility: np.ndarray) -> pd.DataFrame:
+        """Price à l'entrée les positions ouvertes aux dates données"""
+        priced = _price_entries(self.strategy_name, entry_prices, volatility,
+                                self.holding_period_days, self.yield_curve, self.strategy_params)
+        if priced is None:
+            raise ValueError(f"Stratégie non supportée pour le backtest: {self.strategy_name}")
+        valid = priced['valid']
+        
+        return pd.DataFrame({
+            'entry_date': entry_dates[valid],
+            'exit_target': entry_dates[valid] + pd.Timedelta(days=self.holding_period_days),
+            'entry_price': entry_prices[valid],
+            'volatility': priced['volatility'][valid],
+            'call_strike': priced['call_strikes'][valid],
+            'put_strike': priced['put_strikes'][valid],
+            'initial_cost': priced['initial_cost'][valid]
+        }, columns=POSITION_COLUMNS)
+    
+    def _close_positions(self, dates: pd.DatetimeIndex, close: np.ndarray) -> pd.DataFrame:
+        """Termine les positions dont la date de sortie tombe dans les nouvelles séances"""
+        if self.open_positions.empty:
+            return pd.DataFrame(columns=TRADE_COLUMNS)
+        
+        exit_idx = dates.searchsorted(pd.DatetimeIndex(self.open_positions['exit_target']), side='left')
+        done = exit_idx < len(dates)
+        if not done.any():
+            return pd.DataFrame(columns=TRADE_COLUMNS)
+        
+        positions = self.open_positions[done]
+        self.open_positions = self.open_positions[~done].reset_index(drop=True)
+        
+        exit_dates = dates[exit_idx[done]]
+        exit_prices = close[exit_idx[done]]
+        entry_prices = positions['entry_price'].to_numpy()
+        initial_cost = positions['initial_cost'].to_numpy()
+        payoff = _expiry_payoff(exit_prices, positions['call_strike'].to_numpy(),
+                                positions['put_strike'].to_numpy())
+        profit = payoff - initial_cost
+        
+        return pd.DataFrame({
+            'entry_date': positions['entry_date'].to_numpy(),
+            'exit_date': exit_dates,
+            'entry_price': entry_prices,
+            'exit_price': exit_prices,
+            'price_change': exit_prices - entry_prices,
+            'price_change_pct': (exit_prices - entry_prices) / entry_prices * 100,
+            'initial_cost': initial_cost,
+            'profit': profit,
+            'roi': np.divide(profit, initial_cost, out=np.zeros_like(profit),
+                             where=initial_cost != 0) * 100,
+            'volatility': positions['volatility'].to_numpy(),
+            'holding_days': (exit_dates - pd.DatetimeIndex(positions['entry_date'])).days
+        }, columns=TRADE_COLUMNS)
+    
+    def next_start(self, start_date: Optional[str] = None) -> pd.Timestamp:
+        """
+        Première date à charger pour compléter le backtest
+        
+        Args:
+            start_date: Date de début si le backtest est vide (format 'YYYY-MM-DD')
+        
+        Returns:
+            Lendemain de la dernière séance traitée, ou start_date
+        """
+        if self.last_date is None:
+            if start_date is None:
+                raise ValueError("start_date est requis pour initialiser un backtest vide")
+            return pd.Timestamp(start_date)
+        return self.last_date + pd.Timedelta(days=1)
+    
+    def refresh(self, store: Optional[PriceStore] = None,
+                start_date: Optional[str] = None,
+                bars: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Complète le backtest avec les séances disponibles jusqu'à aujourd'hui
+        
+        Args:
+            store: Store local des prix (défaut: store partagé du processus)
+            start_date: Date de début si le backtest est vide (format 'YYYY-MM-DD')
+            bars: Séances déjà chargées (défaut: lues dans le store)
+        
+        Returns:
+            DataFrame des trades terminés par les nouvelles séances
+        """
+        start = self.next_start(start_date)
+        if bars is None:
+            bars = (store or get_default_store()).get_history(self.ticker, start, date.today())
+        return self.update(bars[bars.index >= start])
+    
+    def results(self) -> Dict:
+        """
+        Statistiques des trades terminés, au format de Backtester.backtest_strategy
+        
+        Returns:
+            Résultats du backtest
+        """
+        if self.trades.empty:
+            return {
+                'success': False,
+                'error': 'Aucun trade valide trouvé'
+            }
+        
+        profits = self.trades['profit'].to_numpy(dtype=float)
+        return {
+            'success': True,
+            'ticker': self.ticker,
+            'strategy': self.strategy_name,
+            'period': f"{self.trades['entry_date'].iloc[0]:%Y-%m-%d} à {self.last_date:%Y-%m-%d}",
+            **_trade_statistics(profits, self.rebalance_frequency_days),
+            'holding_period_days': self.holding_period_days,
+            'rebalance_frequency_days': self.rebalance_frequency_days,
+            'open_positions': len(self.open_positions),
+            'trades': self.trades.to_dict('records'),
+            'equity_curve': np.cumsum(profits).tolist()
+        }
+    
+    def to_dict(self) -> Dict:
+        """
+        Représentation sérialisable en JSON de l'état
+        
+        Returns:
+            Dictionnaire des paramètres, des accumulateurs, des trades
+            terminés et des positions ouvertes
+        """
+        return {
+            'ticker': self.ticker,
+            'strategy': self.strategy_name,
+            'holding_period_days': self.holding_period_days,
+            'rebalance_frequency_days': self.rebalance_frequency_days,
+            'volatility_window': self.volatility_window,
+            'yield_curve': self.yield_curve.to_dict(),
+            'strategy_params': self.strategy_params,
+            'bar_count': self.bar_count,
+            'last_date': self.last_date.isoformat() if self.last_date is not None else None,
+            'last_close': float(self.last_close),
+            'recent_returns': self.recent_returns.tolist(),
+            'trades': _frame_to_json(self.trades),
+            'open_positions': _frame_to_json(self.open_positions)
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'IncrementalBacktest':
+        """
+        Reconstruit un backtest depuis sa représentation sérialisable
+        
+        Args:
+            data: Dictionnaire produit par to_dict
+        
+        Returns:
+            Instance de IncrementalBacktest
+        """
+        backtest = cls.__new__(cls)
+        backtest.ticker = data['ticker']
+        backtest.strategy_name = data['strategy']
+        backtest.holding_period_days = data['holding_period_days']
+        backtest.rebalance_frequency_days = data['rebalance_frequency_days']
+        backtest.volatility_window = data['volatility_window']
+        backtest.yield_curve = YieldCurve.from_dict(data['yield_curve'])
+        backtest.strategy_params = data['strategy_params']
+        backtest.bar_count = data['bar_count']
+        backtest.last_date = pd.Timestamp(data['last_date']) if data['last_date'] else None
+        backtest.last_close = data['last_close']
+        backtest.recent_returns = np.array(data['recent_returns'], dtype=float)
+        backtest.trades = _frame_from_json(data['trades'], TRADE_COLUMNS)
+        backtest.open_positions = _frame_from_json(data['open_positions'], POSITION_COLUMNS)
+        return backtest
+    
+    def save(self, path: str):
+        """
+        Sauvegarde l'état sur disque (JSON, écriture atomique)
+        
+        Args:
+            path: Chemin du fichier d'état
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'IncrementalBacktest':
+        """
+        Recharge un état sauvegardé
+        
+        Args:
+            path: Chemin du fichier d'état
+        
+        Returns:
+            Instance de IncrementalBacktest
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def refresh_saved_backtests(state_dir: str, store: Optional[PriceStore] = None) -> List[Dict]:
+    """
+    Rafraîchit tous les backtests sauvegardés d'un répertoire (job quotidien)
+    
+    Les états sont tous chargés d'abord; les séances manquantes de tous les
+    tickers sont lues en un appel groupé au store par date de reprise
+    (une seule en régime quotidien), puis chaque backtest est complété sur
+    ces données déjà chargées.
+    
+    Args:
+        state_dir: Répertoire contenant les fichiers d'état (*.json)
+        store: Store local des prix (défaut: store partagé du processus)
+    
+    Returns:
+        Liste de résumés (ticker, nouveaux trades, positions ouvertes, erreur)
+    """
+    store = store or get_default_store()
+    summaries = []
+    backtests = {}
+    for path in sorted(glob.glob(os.path.join(state_dir, '*' + STATE_EXTENSION))):
+        summary = {'path': path}
+        try:
+            backtest = IncrementalBacktest.load(path)
+            backtests[path] = (backtest, backtest.next_start())
+        except Exception as e:
+            summary['error'] = str(e)
+        summaries.append(summary)
+    
+    # Tickers regroupés par date de reprise: un téléchargement groupé par groupe
+    groups: Dict[pd.Timestamp, List[str]] = {}
+    for backtest, start in backtests.values():
+        groups.setdefault(start, [])
+        if backtest.ticker not in groups[start]:
+            groups[start].append(backtest.ticker)
+    histories = {}
+    fetch_errors = {}
+    for start, tickers in groups.items():
+        try:
+            histories[start] = store.get_histories(tickers, start, date.today())
+        except Exception as e:
+            fetch_errors[start] = str(e)
+    
+    for summary in summaries:
+        if summary['path'] not in backtests:
+            continue
+        backtest, start = backtests[summary['path']]
+        if start in fetch_errors:
+            summary['error'] = fetch_errors[start]
+            continue
+        try:
+            completed = backtest.refresh(bars=histories[start][backtest.ticker])
+            backtest.save(summary['path'])
+            summary.update({
+                'ticker': backtest.ticker,
+                'new_trades': len(completed),
+                'open_positions': len(backtest.open_positions),
+                'last_date': backtest.last_date
+            })
+        except Exception as e:
+            summary['error'] = str(e)
+    return summaries
+
+
+def walk_forward(ticker: str, strategy_class, bars: pd.DataFrame,
+                 candidates: List[Dict], initial_bars: int = 252,
+                 step_bars: int = 21, metric: str = 'sharpe_ratio') -> pd.DataFrame:
+    """
+    Optimisation walk-forward des paramètres sur des fenêtres croissantes
+    
+    Chaque jeu de paramètres candidat est suivi par son propre backtest
+    incrémental, alimenté par tranches de step_bars séances après une
+    fenêtre initiale (chaque tranche ne traite que ses propres séances).
+    À chaque découpage, le candidat retenu est celui qui maximise la
+    métrique sur les trades terminés jusque-là (in-sample); seuls ses
+    trades terminés dans la tranche suivante (out-of-sample) sont comptés.
+    
+    Args:
+        ticker: Symbole du ticker
+        strategy_class: Classe de la stratégie
+        bars: Séances à intégrer, indexées par date
+        candidates: Jeux de paramètres (arguments de IncrementalBacktest, ex:
+            {'holding_period_days': 30, 'otm_percent': 0.05})
+        initial_bars: Taille de la première fenêtre en séances
+        step_bars: Taille de chaque tranche en séances
+        metric: Statistique maximisée in-sample (clé de _trade_statistics)
+    
+    Returns:
+        DataFrame avec une ligne par découpage (paramètres retenus,
+        statistiques in-sample et out-of-sample)
+    """
+    if not candidates:
+        raise ValueError("Au moins un jeu de paramètres candidat est requis")
+    
+    backtests = [IncrementalBacktest(ticker, strategy_class, **params) for params in candidates]
+    for backtest in backtests:
+        backtest.update(bars.iloc[:initial_bars])
+    
+    splits = []
+    for start in range(initial_bars, len(bars), step_bars):
+        # Sélection sur les seuls trades terminés à la fin de la fenêtre d'entraînement
+        in_sample = [
+            _trade_statistics(backtest.trades['profit'].to_numpy(dtype=float),
+                              backtest.rebalance_frequency_days) if len(backtest.trades) else None
+            for backtest in backtests
+        ]
+        best = int(np.argmax([stats[metric] if stats else -np.inf for stats in in_sample]))
+        train_stats = in_sample[best]
+        train_trades = len(backtests[best].trades)
+        
+        completed = [backtest.update(bars.iloc[start:start + step_bars]) for backtest in backtests]
+        out_of_sample = completed[best]['profit'].to_numpy(dtype=float)
+        
+        split = {
+            'train_end': bars.index[start - 1],
+            'test_end': backtests[best].last_date,
+            'params': candidates[best],
+            'train_trades': train_trades,
+            'test_trades': len(out_of_sample),
+            'test_profit': float(out_of_sample.sum()) if len(out_of_sample) else 0.0
+        }
+        if train_stats is not None:
+            split.update({
+                'train_profit': train_stats['total_profit'],
+                'train_win_rate': train_stats['win_rate'],
+                'train_sharpe_ratio': train_stats['sharpe_ratio']
+            })
+        if len(out_of_sample):
+            split['test_win_rate'] = float((out_of_sample > 0).mean() * 100)
+        splits.append(split)
+    
+    return pd.DataFrame(splits)
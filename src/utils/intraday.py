@@ -0,0 +1,368 @@
+"""
+Intraday Bars Ingestion
+Ingestion par blocs de barres intraday (minute, 5 minutes) dans le store local
+et agrégation en ligne en estimateurs journaliers de variance réalisée
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from .price_store import PRICE_COLUMNS, PriceStore, get_default_store
+from .providers import get_provider
+from .realized_volatility import TRADING_DAYS, _rolling_mean
+
+
+# Limites Yahoo Finance par fréquence: (jours par requête, profondeur d'historique en jours)
+INTRADAY_LIMITS = {
+    '1m': (7, 30),
+    '2m': (60, 60),
+    '5m': (60, 60),
+    '15m': (60, 60),
+    '30m': (60, 60),
+    '60m': (730, 730),
+}
+
+# Colonnes des agrégats journaliers (variances journalières, non annualisées)
+DAILY_COLUMNS = [
+    'Open', 'High', 'Low', 'Close', 'realized_variance', 'bipower_variation',
+    'jump_variation', 'range_variance', 'parkinson_variance', 'num_bars'
+]
+
+# Estimateurs de volatilité disponibles à partir des agrégats intraday
+INTRADAY_ESTIMATORS = {
+    'realized_variance': 'realized_variance',
+    'bipower_variation': 'bipower_variation',
+    'intraday_range': 'range_variance',
+}
+
+# Préfixe des colonnes intraday ajoutées aux données du Backtester
+INTRADAY_PREFIX = 'intraday_'
+
+# Constantes des estimateurs de bipower variation et de range
+_BIPOWER_SCALE = np.pi / 2
+_RANGE_SCALE = 1 / (4 * np.log(2))
+
+
+class IntradayAggregator:
+    """
+    Agrégation en ligne de barres intraday en estimateurs journaliers
+    
+    Les barres arrivent par blocs chronologiques; chaque bloc est traité de
+    façon vectorisée et seul l'état de la séance en cours est conservé
+    (dernier cours, dernier rendement, sommes partielles), si bien que la
+    mémoire ne dépend pas de la profondeur d'historique.
+    """
+    
+    def __init__(self):
+        """Initialise un agrégateur vide"""
+        self.day: Optional[int] = None
+        self.last_close = np.nan
+        self.last_abs_return = np.nan
+        self._partial: Optional[Dict[str, float]] = None
+    
+    def update(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Intègre un bloc de barres
+        
+        Args:
+            bars: Barres OHLC indexées par horodatage croissant (sans fuseau)
+        
+        Returns:
+            DataFrame des séances terminées par ce bloc (une ligne par jour)
+        """
+        if bars.empty:
+            return pd.DataFrame(columns=DAILY_COLUMNS, index=pd.DatetimeIndex([]), dtype=float)
+        
+        index = pd.DatetimeIndex(bars.index)
+        day = index.normalize().as_unit('ns').asi8
+        open_ = bars['Open'].to_numpy(dtype=float)
+        high = bars['High'].to_numpy(dtype=float)
+        low = bars['Low'].to_numpy(dtype=float)
+        close = bars['Close'].to_numpy(dtype=float)
+        
+        # Rendements intra-séance: close-to-close entre barres d'une même séance,
+        # open-to-close pour la première barre (le gap overnight est exclu)
+        previous_day = np.concatenate(([self.day if self.day is not None else -1], day[:-1]))
+        same_day = day == previous_day
+        previous_close = np.concatenate(([self.last_close], close[:-1]))
+        returns = np.log(close / np.where(same_day, previous_close, open_))
+        
+        abs_returns = np.abs(returns)
+        previous_abs = np.concatenate(([self.last_abs_return], abs_returns[:-1]))
+        bipower = np.where(same_day, abs_returns * previous_abs, 0.0)
+        range_sq = np.log(high / low) ** 2
+        
+        # Sommes par séance du bloc (première séance éventuellement déjà entamée)
+        starts = np.flatnonzero(np.concatenate(([True], day[1:] != day[:-1])))
+        groups = {
+            'realized_variance': np.add.reduceat(np.nan_to_num(returns**2), starts),
+            'bipower_sum': np.add.reduceat(np.nan_to_num(bipower), starts),
+            'range_sum': np.add.reduceat(np.nan_to_num(range_sq), starts),
+            'num_bars': np.diff(np.append(starts, len(day))).astype(float),
+            'Open': open_[starts],
+            'High': np.fmax.reduceat(high, starts),
+            'Low': np.fmin.reduceat(low, starts),
+            'Close': close[np.append(starts[1:], len(day)) - 1],
+        }
+        days = day[starts]
+        
+        if self._partial is not None and days[0] == self.day:
+            partial = self._partial
+            for key in ('realized_variance', 'bipower_sum', 'range_sum', 'num_bars'):
+                groups[key][0] += partial[key]
+            groups['Open'][0] = partial['Open']
+            groups['High'][0] = np.fmax(groups['High'][0], partial['High'])
+            groups['Low'][0] = np.fmin(groups['Low'][0], partial['Low'])
+            completed_before = []
+        else:
+            completed_before = [self._daily_row(self.day, self._partial)] if self._partial is not None else []
+        
+        # La dernière séance du bloc reste ouverte
+        rows = completed_before + [
+            self._daily_row(days[i], {key: values[i] for key, values in groups.items()})
+            for i in range(len(days) - 1)
+        ]
+        self._partial = {key: values[-1] for key, values in groups.items()}
+        self.day = int(days[-1])
+        self.last_close = close[-1]
+        self.last_abs_return = abs_returns[-1]
+        
+        return self._frame(rows)
+    
+    def flush(self) -> pd.DataFrame:
+        """
+        Clôt la séance en cours (fin de flux ou séance terminée)
+        
+        Returns:
+            DataFrame d'au plus une ligne
+        """
+        rows = [self._daily_row(self.day, self._partial)] if self._partial is not None else []
+        self._partial = None
+        self.last_abs_return = np.nan
+        return self._frame(rows)
+    
+    @staticmethod
+    def _daily_row(day: int, sums: Dict[str, float]) -> Dict:
+        """Estimateurs journaliers d'une séance à partir de ses sommes"""
+        bipower = _BIPOWER_SCALE * sums['bipower_sum']
+        return {
+            'date': pd.Timestamp(day),
+            'Open': sums['Open'],
+            'High': sums['High'],
+            'Low': sums['Low'],
+            'Close': sums['Close'],
+            'realized_variance': sums['realized_variance'],
+            'bipower_variation': bipower,
+            'jump_variation': max(sums['realized_variance'] - bipower, 0.0),
+            'range_variance': _RANGE_SCALE * sums['range_sum'],
+            'parkinson_variance': _RANGE_SCALE * np.log(sums['High'] / sums['Low']) ** 2,
+            'num_bars': sums['num_bars']
+        }
+    
+    @staticmethod
+    def _frame(rows) -> pd.DataFrame:
+        """DataFrame des agrégats journaliers"""
+        if not rows:
+            return pd.DataFrame(columns=DAILY_COLUMNS, index=pd.DatetimeIndex([]), dtype=float)
+        return pd.DataFrame(rows).set_index('date')[DAILY_COLUMNS]
+
+
+def normalize_intraday(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise des barres intraday: colonnes OHLCV, heure locale de la place sans fuseau
+    
+    Args:
+        history: Barres retournées par yfinance ou lues depuis un fichier
+    
+    Returns:
+        DataFrame OHLCV indexé par horodatage croissant
+    """
+    if history is None or history.empty:
+        return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([]), dtype=float)
+    
+    index = pd.DatetimeIndex(history.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    
+    frame = history.reindex(columns=PRICE_COLUMNS).astype(float)
+    frame.index = index
+    frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+    return frame.dropna(subset=['Open', 'High', 'Low', 'Close'])
+
+
+def iter_yahoo_intraday(ticker: str, start, end, interval: str = '5m') -> Iterator[pd.DataFrame]:
+    """
+    Télécharge des barres intraday depuis Yahoo Finance, bloc par bloc
+    
+    Args:
+        ticker: Symbole du ticker
+        start: Date de début (bornée à la profondeur disponible)
+        end: Date de fin (exclue)
+        interval: Fréquence des barres (voir INTRADAY_LIMITS)
+    
+    Yields:
+        DataFrame de barres normalisées par requête
+    """
+    if interval not in INTRADAY_LIMITS:
+        raise ValueError(f"Fréquence intraday non supportée: {interval} (disponibles: {', '.join(INTRADAY_LIMITS)})")
+    
+    chunk_days, max_lookback_days = INTRADAY_LIMITS[interval]
+    earliest = pd.Timestamp(date.today() - timedelta(days=max_lookback_days - 1))
+    chunk_start = max(pd.Timestamp(start), earliest)
+    end = pd.Timestamp(end)
+    
+    while chunk_start < end:
+        chunk_end = min(chunk_start + pd.Timedelta(days=chunk_days), end)
+        history = get_provider().history(ticker, chunk_start, chunk_end, interval=interval)
+        yield normalize_intraday(history)
+        chunk_start = chunk_end
+
+
+def iter_csv_intraday(path: str, timestamp_column: str = 'timestamp',
+                      chunk_size: int = 500_000) -> Iterator[pd.DataFrame]:
+    """
+    Lit un fichier CSV de barres intraday par blocs (fichiers fournisseurs volumineux)
+    
+    Args:
+        path: Chemin du fichier (colonnes Open, High, Low, Close, Volume et horodatage)
+        timestamp_column: Nom de la colonne d'horodatage
+        chunk_size: Nombre de lignes par bloc
+    
+    Yields:
+        DataFrame de barres normalisées par bloc
+    """
+    for chunk in pd.read_csv(path, chunksize=chunk_size, parse_dates=[timestamp_column]):
+        yield normalize_intraday(chunk.set_index(timestamp_column))
+
+
+def _daily_table_name(interval: str) -> str:
+    """Nom de la table des agrégats journaliers d'une fréquence"""
+    return f"{interval}_daily"
+
+
+def ingest_intraday(ticker: str, chunks: Iterable[pd.DataFrame],
+                    interval: str = '5m', store: Optional[PriceStore] = None,
+                    close_last_session: Optional[bool] = None) -> int:
+    """
+    Ingère un flux de blocs de barres intraday dans le store local
+    
+    Les barres brutes sont ajoutées à la table '<interval>' du ticker et les
+    agrégats des séances terminées à la table '<interval>_daily'. Les barres
+    déjà stockées sont ignorées; la séance entamée lors d'une ingestion
+    précédente est reprise depuis les barres brutes.
+    
+    Args:
+        ticker: Symbole du ticker
+        chunks: Blocs de barres chronologiques (voir iter_yahoo_intraday, iter_csv_intraday)
+        interval: Fréquence des barres
+        store: Store local (défaut: store partagé du processus)
+        close_last_session: Clore la dernière séance du flux (None = si antérieure à aujourd'hui)
+    
+    Returns:
+        Nombre de séances agrégées
+    """
+    store = store or get_default_store()
+    raw_table = store.table(ticker, interval)
+    daily_table = store.table(ticker, _daily_table_name(interval), DAILY_COLUMNS)
+    
+    # Reprise de la séance en cours depuis les barres brutes
+    aggregator = IntradayAggregator()
+    last_day = daily_table.last_timestamp()
+    resume_from = last_day + pd.Timedelta(days=1) if last_day is not None else None
+    pending = aggregator.update(raw_table.read(resume_from))
+    daily_table.append(pending)
+    num_days = len(pending)
+    
+    last_bar = raw_table.last_timestamp()
+    for chunk in chunks:
+        if last_bar is not None:
+            chunk = chunk[chunk.index > last_bar]
+        if chunk.empty:
+            continue
+        
+        raw_table.append(chunk)
+        completed = aggregator.update(chunk)
+        daily_table.append(completed)
+        num_days += len(completed)
+        last_bar = chunk.index[-1]
+    
+    if aggregator.day is not None:
+        if close_last_session is None:
+            close_last_session = pd.Timestamp(aggregator.day) < pd.Timestamp(date.today())
+        if close_last_session:
+            completed = aggregator.flush()
+            daily_table.append(completed)
+            num_days += len(completed)
+    
+    return num_days
+
+
+def update_intraday(ticker: str, interval: str = '5m',
+                    store: Optional[PriceStore] = None) -> int:
+    """
+    Complète les barres intraday d'un ticker depuis Yahoo Finance
+    
+    Seules les barres postérieures à la dernière barre stockée sont
+    téléchargées (dans la limite de profondeur de Yahoo).
+    
+    Args:
+        ticker: Symbole du ticker
+        interval: Fréquence des barres
+        store: Store local (défaut: store partagé du processus)
+    
+    Returns:
+        Nombre de séances agrégées
+    """
+    store = store or get_default_store()
+    last_bar = store.table(ticker, interval).last_timestamp()
+    start = last_bar.normalize() if last_bar is not None else pd.Timestamp('1970-01-01')
+    end = pd.Timestamp(date.today() + timedelta(days=1))
+    return ingest_intraday(ticker, iter_yahoo_intraday(ticker, start, end, interval), interval, store)
+
+
+def get_intraday_features(ticker: str, start=None, end=None, interval: str = '5m',
+                          store: Optional[PriceStore] = None) -> pd.DataFrame:
+    """
+    Agrégats journaliers intraday stockés pour un ticker
+    
+    Args:
+        ticker: Symbole du ticker
+        start: Date de début (incluse, None = début)
+        end: Date de fin (exclue, None = fin)
+        interval: Fréquence des barres sources
+        store: Store local (défaut: store partagé du processus)
+    
+    Returns:
+        DataFrame des agrégats indexé par date
+    """
+    store = store or get_default_store()
+    return store.table(ticker, _daily_table_name(interval), DAILY_COLUMNS).read(start, end)
+
+
+def intraday_volatility(features: pd.DataFrame, window: int = 30,
+                        estimator: str = 'realized_variance') -> pd.Series:
+    """
+    Volatilité annualisée glissante à partir des agrégats intraday
+    
+    Args:
+        features: Agrégats journaliers (colonnes de DAILY_COLUMNS, préfixées ou non)
+        window: Fenêtre en séances
+        estimator: 'realized_variance', 'bipower_variation' ou 'intraday_range'
+    
+    Returns:
+        Série des volatilités annualisées
+    """
+    if estimator not in INTRADAY_ESTIMATORS:
+        raise ValueError(f"Estimateur intraday inconnu: {estimator} (disponibles: {', '.join(INTRADAY_ESTIMATORS)})")
+    
+    column = INTRADAY_ESTIMATORS[estimator]
+    if column not in features:
+        column = INTRADAY_PREFIX + column
+    if column not in features:
+        raise ValueError(f"Agrégats intraday absents: {INTRADAY_ESTIMATORS[estimator]}")
+    
+    variance = _rolling_mean(features[column].to_numpy(dtype=float), window)
+    return pd.Series(np.sqrt(variance * TRADING_DAYS), index=features.index)
@@ -1,12 +1,84 @@
 """
 Market Data Fetcher
-Module pour récupérer les données de marché depuis Yahoo Finance
+Module pour récupérer les données de marché (Yahoo Finance par défaut, voir providers)
 """
 
-import yfinance as yf
 import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
+from .cache import get_cache
+from .concurrent_fetch import fetch_concurrently
+from .metadata_cache import get_metadata_cache
+from .price_store import PRICE_COLUMNS, get_default_store, stack_histories
+from .providers import get_provider
+from .realized_volatility import sample_volatility, sample_volatility_panel
+from .volatility_forecast import get_default_forecaster
+from .yield_curve import SHORT_RATE_MATURITY, get_yield_curve
+
+
+# Profondeur minimale (jours de trading) de l'historique récent mis en cache:
+# couvre la volatilité historique par défaut et la prévision GARCH
+HISTORY_CACHE_DAYS = 756
+
+# Champs de la fiche yfinance conservés dans le cache persistant: seules les
+# données lentes y figurent, les données de marché sont tirées de l'historique
+STATIC_INFO_FIELDS = ('longName', 'shortName', 'currency', 'sector', 'industry',
+                      'dividendYield', 'sharesOutstanding')
+
+# Séances de la moyenne des volumes (3 mois, comme averageVolume de yfinance)
+AVERAGE_VOLUME_DAYS = 63
+
+
+def _history_window(period: int) -> Tuple[datetime, datetime, datetime]:
+    """
+    Bornes de l'historique récent couvrant period jours de trading
+    
+    Returns:
+        Tuple (début requis, début téléchargé, fin exclue = demain)
+    """
+    end_date = datetime.combine(datetime.now().date(), datetime.min.time()) + timedelta(days=1)
+    start_date = end_date - timedelta(days=int(period * 1.5))  # Marge pour les jours non-trading
+    fetch_start = min(start_date, end_date - timedelta(days=int(HISTORY_CACHE_DAYS * 1.5)))
+    return start_date, fetch_start, end_date
+
+
+def get_recent_history(ticker: str, period: int = HISTORY_CACHE_DAYS):
+    """
+    Historique quotidien récent (séance du jour incluse), mis en cache
+    
+    Un seul téléchargement par ticker et par durée de vie du cache 'history'
+    sert le spot, la volatilité historique et la prévision de volatilité;
+    une requête plus profonde que l'entrée en cache la remplace. Les requêtes
+    simultanées pour le même ticker partagent le téléchargement en cours.
+    
+    Args:
+        ticker: Le symbole du ticker
+        period: Nombre de jours de trading requis
+        
+    Returns:
+        DataFrame OHLCV indexé par date
+    """
+    cache = get_cache('history')
+    key = ticker.upper()
+    start_date, fetch_start, end_date = _history_window(period)
+    
+    cached = cache.get(key)
+    if cached is not None and cached[0] <= start_date:
+        return cached[1].loc[start_date:]
+    
+    def load():
+        # Seconde vérification: un téléchargement concurrent a pu couvrir la fenêtre
+        cached = cache.get(key)
+        if cached is not None and cached[0] <= fetch_start:
+            return cached
+        entry = (fetch_start, get_default_store().get_history(ticker, fetch_start, end_date))
+        cache.set(key, entry)
+        return entry
+    
+    # Requêtes concurrentes pour le même (ticker, fenêtre): un seul téléchargement
+    _, data = cache.flight.do((key, fetch_start, end_date), load)
+    return data.loc[start_date:]
 
 
 def get_spot_price(ticker: str) -> float:
@@ -17,10 +89,9 @@ def get_spot_price(ticker: str) -> float:
         ticker: Le symbole du ticker (ex: 'AAPL', 'MSFT')
         
     Returns:
-        Le prix spot actuel
+        Le prix spot actuel (dernière clôture de l'historique en cache)
     """
-    stock = yf.Ticker(ticker)
-    data = stock.history(period='1d')
+    data = get_recent_history(ticker)
     
     if data.empty:
         raise ValueError(f"Aucune donnée disponible pour {ticker}")
@@ -28,77 +99,194 @@ def get_spot_price(ticker: str) -> float:
     return float(data['Close'].iloc[-1])
 
 
-def get_historical_volatility(ticker: str, period: int = 252) -> float:
+def get_historical_volatility(ticker: str, period: int = 252,
+                              estimator: str = 'close_to_close') -> float:
     """
     Calcule la volatilité historique annualisée
     
     Args:
         ticker: Le symbole du ticker
         period: Nombre de jours de trading pour le calcul (défaut: 252)
+        estimator: Estimateur de volatilité réalisée ('close_to_close', 'parkinson',
+            'garman_klass', 'rogers_satchell', 'yang_zhang')
         
     Returns:
         La volatilité annualisée (en décimal, pas en %)
     """
-    stock = yf.Ticker(ticker)
-    
-    # Récupérer les données historiques
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=int(period * 1.5))  # Marge pour les jours non-trading
-    
-    data = stock.history(start=start_date, end=end_date)
+    # Récupérer les données historiques (cache mémoire, puis store local)
+    data = get_recent_history(ticker, period)
     
     if len(data) < 30:
         raise ValueError(f"Pas assez de données historiques pour {ticker}")
     
-    # Calculer les rendements logarithmiques
-    returns = np.log(data['Close'] / data['Close'].shift(1))
-    returns = returns.dropna()
+    # Volatilité annualisée sur tout l'échantillon
+    return sample_volatility(data, estimator)
+
+
+def get_forecast_volatility(ticker: str, horizon_days: int = 30,
+                            model: str = 'garch', period: int = 756) -> float:
+    """
+    Prévoit la volatilité annualisée moyenne sur l'horizon de l'option
     
-    # Volatilité annualisée
-    volatility = returns.std() * np.sqrt(252)
+    Args:
+        ticker: Le symbole du ticker
+        horizon_days: Horizon de la prévision en jours calendaires
+        model: Modèle de prévision ('ewma' ou 'garch')
+        period: Nombre de jours de trading utilisés pour l'estimation (défaut: 3 ans)
+        
+    Returns:
+        La volatilité annualisée prévue (en décimal)
+    """
+    data = get_recent_history(ticker, period)
     
-    return float(volatility)
+    if len(data) < 252:
+        raise ValueError(f"Pas assez de données historiques pour {ticker}")
+    
+    prices = data[['Close']].rename(columns={'Close': ticker.upper()})
+    forecast = get_default_forecaster().forecast(prices, horizon_days, model)
+    return float(forecast.iloc[0, 0])
 
 
-def get_risk_free_rate() -> float:
+def get_risk_free_rate(maturity_years: float = SHORT_RATE_MATURITY) -> float:
     """
-    Récupère le taux sans risque approximatif (US Treasury 3-month)
+    Taux sans risque pour une maturité, lu sur la courbe des taux du Trésor
+    
+    Args:
+        maturity_years: Maturité en années (défaut: 3 mois)
     
     Returns:
-        Le taux sans risque annualisé (en décimal)
+        Le taux sans risque annualisé (en décimal, composition continue)
     """
-    try:
-        treasury = yf.Ticker("^IRX")  # 13 Week Treasury Bill
-        data = treasury.history(period='5d')
-        
-        if not data.empty:
-            # Le taux est en pourcentage, on le convertit en décimal
-            rate = float(data['Close'].iloc[-1]) / 100
-            return rate
-    except:
-        pass
-    
-    # Valeur par défaut si échec
-    return 0.05  # 5% par défaut
+    return get_yield_curve().rate(maturity_years)
 
 
 def get_market_data(ticker: str, 
-                    volatility_period: int = 252) -> Tuple[float, float, float]:
+                    volatility_period: int = 252,
+                    volatility_estimator: str = 'close_to_close',
+                    volatility_model: str = 'historical',
+                    horizon_days: int = 30) -> Tuple[float, float, float]:
     """
     Récupère toutes les données de marché nécessaires pour le pricing
     
     Args:
         ticker: Le symbole du ticker
         volatility_period: Période pour le calcul de volatilité
+        volatility_estimator: Estimateur de volatilité réalisée
+        volatility_model: 'historical' (volatilité réalisée), 'ewma' ou 'garch'
+        horizon_days: Horizon de la prévision de volatilité et maturité du taux en jours
         
     Returns:
         Tuple (spot_price, volatility, risk_free_rate)
     """
-    spot_price = get_spot_price(ticker)
-    volatility = get_historical_volatility(ticker, volatility_period)
-    risk_free_rate = get_risk_free_rate()
+    if volatility_model == 'historical':
+        fetch_volatility = lambda: get_historical_volatility(ticker, volatility_period, volatility_estimator)
+    else:
+        fetch_volatility = lambda: get_forecast_volatility(ticker, horizon_days, volatility_model)
+    
+    # Appels indépendants en parallèle (spot et volatilité partagent le même historique)
+    results = fetch_concurrently({
+        'spot': lambda: get_spot_price(ticker),
+        'volatility': fetch_volatility,
+        'rate': lambda: get_risk_free_rate(horizon_days / 365.0)
+    })
+    
+    return results['spot'], results['volatility'], results['rate']
+
+
+def get_history_bulk(tickers: List[str], period: int = HISTORY_CACHE_DAYS,
+                     batch_size: int = 100, refresh: bool = False) -> pd.DataFrame:
+    """
+    Historique quotidien récent de plusieurs tickers, en téléchargements groupés
     
-    return spot_price, volatility, risk_free_rate
+    Les tickers déjà en cache ne sont pas retéléchargés; les autres sont
+    chargés par lots en un seul appel groupé chacun, puis mis en cache
+    individuellement (les appels mono-ticker suivants en profitent).
+    
+    Args:
+        tickers: Liste de symboles
+        period: Nombre de jours de trading requis
+        batch_size: Nombre maximal de tickers par téléchargement groupé
+        refresh: Recharge tous les tickers (la séance du jour est mise à jour)
+            et remplace leurs entrées en cache
+        
+    Returns:
+        DataFrame (dates x (champ, ticker)) OHLCV
+    """
+    tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+    cache = get_cache('history')
+    start_date, fetch_start, end_date = _history_window(period)
+    
+    histories = {}
+    missing = []
+    for ticker in tickers:
+        cached = None if refresh else cache.get(ticker)
+        if cached is not None and cached[0] <= start_date:
+            histories[ticker] = cached[1]
+        else:
+            missing.append(ticker)
+    
+    if missing:
+        fetched = get_default_store().get_histories(missing, fetch_start, end_date, batch_size)
+        for ticker, history in fetched.items():
+            cache.set(ticker, (fetch_start, history))
+            histories[ticker] = history
+    
+    panel = stack_histories({ticker: histories[ticker] for ticker in tickers}, PRICE_COLUMNS)
+    return panel.loc[start_date:]
+
+
+def get_market_data_bulk(tickers: List[str],
+                         volatility_period: int = 252,
+                         volatility_estimator: str = 'close_to_close',
+                         volatility_model: str = 'historical',
+                         horizon_days: int = 30) -> pd.DataFrame:
+    """
+    Données de marché de toute une liste de tickers (screening d'une watchlist)
+    
+    Un historique groupé (dates x tickers) est chargé une seule fois; spot,
+    rendements et volatilités sont calculés pour toutes les colonnes à la fois.
+    
+    Args:
+        tickers: Liste de symboles
+        volatility_period: Période pour le calcul de volatilité
+        volatility_estimator: Estimateur de volatilité réalisée
+        volatility_model: 'historical' (volatilité réalisée), 'ewma' ou 'garch'
+        horizon_days: Horizon de la prévision de volatilité et maturité du taux en jours
+        
+    Returns:
+        DataFrame indexé par ticker (spot, volatility, risk_free_rate,
+        daily_return, last_date, num_observations); volatilité NaN si
+        l'historique est insuffisant
+    """
+    period = volatility_period if volatility_model == 'historical' else max(volatility_period, HISTORY_CACHE_DAYS)
+    results = fetch_concurrently({
+        'history': lambda: get_history_bulk(tickers, period),
+        'rate': lambda: get_risk_free_rate(horizon_days / 365.0)
+    })
+    history = results['history']
+    close = history['Close']
+    
+    # Rendements depuis la dernière cotation de chaque ticker
+    log_close = np.log(close)
+    returns = (log_close - log_close.ffill().shift(1)).where(close.notna())
+    observations = close.notna()
+    
+    if volatility_model == 'historical':
+        start_date = _history_window(volatility_period)[0]
+        volatility = sample_volatility_panel(history.loc[start_date:], volatility_estimator)
+    else:
+        valid = close.columns[observations.sum() >= 252]
+        forecast = get_default_forecaster().forecast(close[valid], horizon_days, volatility_model)
+        volatility = forecast.iloc[:, 0].reindex(close.columns)
+    
+    return pd.DataFrame({
+        'spot': close.ffill().iloc[-1],
+        'volatility': volatility.to_numpy(),
+        'risk_free_rate': results['rate'],
+        'daily_return': np.expm1(returns.ffill().iloc[-1]),
+        'last_date': observations.iloc[::-1].idxmax().where(observations.any()),
+        'num_observations': observations.sum()
+    }, index=pd.Index(close.columns, name='ticker'))
 
 
 def get_dividend_yield(ticker: str) -> float:
@@ -112,8 +300,7 @@ def get_dividend_yield(ticker: str) -> float:
         Le rendement du dividende annualisé (en décimal)
     """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = _get_info(ticker)
         
         dividend_yield = info.get('dividendYield', 0.0)
         if dividend_yield is None:
@@ -124,6 +311,19 @@ def get_dividend_yield(ticker: str) -> float:
         return 0.0
 
 
+def _get_info(ticker: str) -> Dict:
+    """
+    Champs statiques de la fiche d'un ticker (voir STATIC_INFO_FIELDS)
+    
+    Servis depuis le cache persistant, rafraîchis en arrière-plan si périmés.
+    """
+    def load():
+        info = get_provider().info(ticker)
+        return {field: info[field] for field in STATIC_INFO_FIELDS if info.get(field) is not None}
+    
+    return get_metadata_cache().get(f"static_info:{ticker.upper()}", load)
+
+
 def validate_ticker(ticker: str) -> bool:
     """
     Vérifie si un ticker est valide
@@ -135,9 +335,7 @@ def validate_ticker(ticker: str) -> bool:
         True si le ticker est valide, False sinon
     """
     try:
-        stock = yf.Ticker(ticker)
-        data = stock.history(period='1d')
-        return not data.empty
+        return not get_recent_history(ticker).empty
     except:
         return False
 
@@ -146,29 +344,36 @@ def get_ticker_info(ticker: str) -> Dict:
     """
     Récupère les informations détaillées d'un ticker
     
+    Les champs descriptifs viennent du cache des fiches; prix, variation,
+    volumes, extrêmes sur 52 semaines et capitalisation sont calculés sur
+    l'historique récent, jamais sur une fiche éventuellement périmée.
+    
     Args:
         ticker: Le symbole du ticker
         
     Returns:
         Dictionnaire avec les informations du ticker
     """
-    stock = yf.Ticker(ticker)
-    info = stock.info
-    history = stock.history(period='5d')
+    results = fetch_concurrently({
+        'info': lambda: _get_info(ticker),
+        'history': lambda: get_recent_history(ticker)
+    })
+    info, history = results['info'], results['history']
     
     if history.empty:
         raise ValueError(f"Aucune donnée disponible pour {ticker}")
     
     # Prix actuel et précédent
     current_price = float(history['Close'].iloc[-1])
-    previous_close = info.get('previousClose', current_price)
+    previous_close = float(history['Close'].iloc[-2]) if len(history) > 1 else current_price
     
     # Calcul de la variation
     day_change = current_price - previous_close
     day_change_pct = (day_change / previous_close) * 100 if previous_close else 0
     
-    # Market cap
-    market_cap = info.get('marketCap', 0)
+    # Market cap au prix actuel
+    market_cap = float(info.get('sharesOutstanding', 0)) * current_price
+    last_year = history.iloc[-252:]
     
     # Formater le market cap
     if market_cap >= 1e12:
@@ -190,12 +395,12 @@ def get_ticker_info(ticker: str) -> Dict:
         'day_change_pct': day_change_pct,
         'market_cap': market_cap,
         'market_cap_str': market_cap_str,
-        'volume': info.get('volume', 0),
-        'avg_volume': info.get('averageVolume', 0),
+        'volume': float(history['Volume'].iloc[-1]),
+        'avg_volume': float(history['Volume'].iloc[-AVERAGE_VOLUME_DAYS:].mean()),
         'day_high': history['High'].iloc[-1],
         'day_low': history['Low'].iloc[-1],
-        'week_52_high': info.get('fiftyTwoWeekHigh', 0),
-        'week_52_low': info.get('fiftyTwoWeekLow', 0),
+        'week_52_high': float(last_year['High'].max()),
+        'week_52_low': float(last_year['Low'].min()),
         'sector': info.get('sector', 'N/A'),
         'industry': info.get('industry', 'N/A'),
     }
@@ -0,0 +1,210 @@
+"""
+Metadata Cache
+Cache persistant (SQLite) des métadonnées lentes des tickers, servi en
+stale-while-revalidate avec rafraîchissement en arrière-plan
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .cache import SingleFlight
+
+
+# Chemin par défaut de la base (surchargé par la variable METADATA_CACHE_PATH)
+DEFAULT_METADATA_PATH = os.path.join('data', 'metadata.sqlite')
+
+# Âge (secondes) en deçà duquel une entrée est servie sans rafraîchissement
+FRESH_SECONDS = 86400
+
+# Âge maximal (secondes) d'une entrée servie pendant son rafraîchissement;
+# au-delà, l'appel attend un chargement synchrone
+MAX_STALE_SECONDS = 30 * 86400
+
+# Nombre de threads de rafraîchissement en arrière-plan
+REFRESH_WORKERS = 2
+
+
+class MetadataCache:
+    """
+    Cache clé -> document JSON persistant entre redémarrages
+    
+    Une entrée fraîche est servie directement; une entrée périmée (mais pas
+    trop ancienne) est servie immédiatement et rafraîchie par un thread
+    d'arrière-plan; une entrée absente est chargée de façon synchrone, une
+    seule fois pour tous les appelants concurrents. Si la source est
+    indisponible, une entrée trop ancienne est servie plutôt qu'une erreur.
+    """
+    
+    def __init__(self, path: Optional[str] = None,
+                 fresh_seconds: float = FRESH_SECONDS,
+                 max_stale_seconds: float = MAX_STALE_SECONDS,
+                 refresh_workers: int = REFRESH_WORKERS):
+        """
+        Initialise le cache
+        
+        Args:
+            path: Fichier SQLite (défaut: $METADATA_CACHE_PATH ou data/metadata.sqlite)
+            fresh_seconds: Âge en deçà duquel une entrée est fraîche
+            max_stale_seconds: Âge maximal d'une entrée servie périmée
+            refresh_workers: Nombre de threads de rafraîchissement
+        """
+        self.path = path or os.environ.get('METADATA_CACHE_PATH', DEFAULT_METADATA_PATH)
+        self.fresh_seconds = fresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self._local = threading.local()
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers,
+                                            thread_name_prefix='metadata-refresh')
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.stats = {'fresh': 0, 'stale': 0, 'miss': 0, 'refreshes': 0, 'refresh_errors': 0}
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS metadata ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL)'
+        )
+        connection.commit()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion SQLite propre au thread courant"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            self._local.connection = connection
+        return connection
+    
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+    
+    def read(self, key: str) -> Optional[tuple]:
+        """
+        Entrée brute du cache
+        
+        Args:
+            key: Clé de l'entrée
+        
+        Returns:
+            Tuple (valeur, âge en secondes) ou None si absente
+        """
+        row = self._connection().execute(
+            'SELECT value, fetched_at FROM metadata WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), time.time() - row[1]
+    
+    def write(self, key: str, value: Any):
+        """
+        Enregistre une entrée (horodatée maintenant)
+        
+        Args:
+            key: Clé de l'entrée
+            value: Document sérialisable en JSON
+        """
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO metadata (key, value, fetched_at) VALUES (?, ?, ?)',
+            (key, json.dumps(value, default=str), time.time())
+        )
+        connection.commit()
+    
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Valeur d'une clé, servie depuis le cache dès que possible
+        
+        Args:
+            key: Clé de l'entrée (ex: 'static_info:AAPL')
+            loader: Fonction sans argument interrogeant la source lente
+        
+        Returns:
+            Valeur en cache (éventuellement périmée) ou chargée
+        """
+        entry = self.read(key)
+        if entry is not None:
+            value, age = entry
+            if age < self.fresh_seconds:
+                self._count('fresh')
+                return value
+            if age < self.max_stale_seconds:
+                self._count('stale')
+                self._schedule_refresh(key, loader)
+                return value
+        
+        self._count('miss')
+        try:
+            return self._flight.do(key, lambda: self._load(key, loader))
+        except Exception:
+            if entry is None:
+                raise
+            return entry[0]
+    
+    def _load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Charge une valeur depuis la source et l'enregistre"""
+        value = loader()
+        self.write(key, value)
+        return value
+    
+    def _schedule_refresh(self, key: str, loader: Callable[[], Any]):
+        """Lance un rafraîchissement en arrière-plan (un seul par clé à la fois)"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._executor.submit(self._refresh, key, loader)
+    
+    def _refresh(self, key: str, loader: Callable[[], Any]):
+        """Rafraîchit une entrée; en cas d'échec, l'entrée périmée reste servie"""
+        try:
+            self._flight.do(key, lambda: self._load(key, loader))
+            self._count('refreshes')
+        except Exception:
+            self._count('refresh_errors')
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+    
+    def pending_refreshes(self) -> int:
+        """Nombre de rafraîchissements en cours"""
+        with self._lock:
+            return len(self._refreshing)
+    
+    def invalidate(self, key: str):
+        """Supprime une entrée"""
+        connection = self._connection()
+        connection.execute('DELETE FROM metadata WHERE key = ?', (key,))
+        connection.commit()
+    
+    def clear(self):
+        """Vide le cache"""
+        connection = self._connection()
+        connection.execute('DELETE FROM metadata')
+        connection.commit()
+
+
+_metadata_cache: Optional[MetadataCache] = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """
+    Cache de métadonnées partagé par le processus
+    
+    Returns:
+        Instance de MetadataCache
+    """
+    global _metadata_cache
+    with _metadata_cache_lock:
+        if _metadata_cache is None:
+            _metadata_cache = MetadataCache()
+        return _metadata_cache
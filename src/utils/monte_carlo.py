@@ -4,7 +4,7 @@ Simule des milliers de scénarios pour estimer la probabilité de profit
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Callable
+from typing import Dict, List, Tuple, Callable, Optional
 
 
 class MonteCarloAnalysis:
@@ -237,3 +237,233 @@ class MonteCarloAnalysis:
             'lower_break_even': lower_be,
             'upper_break_even': upper_be
         }
+    
+    def _coupled_level_sums(self, path_payoff_func: Callable[[np.ndarray], np.ndarray],
+                            time_to_expiry_years: float,
+                            level: int,
+                            num_samples: int,
+                            base_steps: int,
+                            refinement_factor: int,
+                            rng: np.random.Generator,
+                            max_batch_elements: int = 2_000_000) -> Tuple[float, float]:
+        """
+        Simule la correction P_l - P_{l-1} d'un niveau MLMC
+        
+        Les chemins fin (base_steps * M^l pas) et grossier (M fois moins de pas)
+        partagent les mêmes incréments browniens: les incréments grossiers sont
+        les sommes de M incréments fins consécutifs.
+        
+        Args:
+            path_payoff_func: Fonction vectorisée chemins (n, pas) -> payoffs (n,)
+            time_to_expiry_years: Horizon en années
+            level: Niveau l (0 = niveau le plus grossier, sans correction)
+            num_samples: Nombre de chemins à simuler
+            base_steps: Nombre de pas au niveau 0
+            refinement_factor: Facteur de raffinement M entre deux niveaux
+            rng: Générateur aléatoire
+            max_batch_elements: Taille maximale d'un lot (chemins x pas)
+            
+        Returns:
+            Tuple (somme des corrections, somme des carrés des corrections)
+        """
+        fine_steps = base_steps * refinement_factor ** level
+        dt = time_to_expiry_years / fine_steps
+        drift = (self.risk_free_rate - 0.5 * self.volatility**2) * dt
+        
+        batch_size = max(1, max_batch_elements // fine_steps)
+        sum_y = 0.0
+        sum_y2 = 0.0
+        remaining = num_samples
+        
+        while remaining > 0:
+            n = min(batch_size, remaining)
+            remaining -= n
+            
+            dw = np.sqrt(dt) * rng.standard_normal((n, fine_steps))
+            fine_paths = self.spot_price * np.exp(
+                np.cumsum(drift + self.volatility * dw, axis=1)
+            )
+            y = np.asarray(path_payoff_func(fine_paths), dtype=float)
+            
+            if level > 0:
+                coarse_steps = fine_steps // refinement_factor
+                coarse_dw = dw.reshape(n, coarse_steps, refinement_factor).sum(axis=2)
+                coarse_paths = self.spot_price * np.exp(
+                    np.cumsum(drift * refinement_factor + self.volatility * coarse_dw, axis=1)
+                )
+                y = y - np.asarray(path_payoff_func(coarse_paths), dtype=float)
+            
+            sum_y += float(np.sum(y))
+            sum_y2 += float(np.sum(y**2))
+        
+        return sum_y, sum_y2
+    
+    def multilevel_monte_carlo(self, path_payoff_func: Callable[[np.ndarray], np.ndarray],
+                               time_to_expiry_years: float,
+                               target_rmse: float,
+                               base_steps: int = 4,
+                               refinement_factor: int = 2,
+                               min_levels: int = 3,
+                               max_levels: int = 10,
+                               initial_samples: int = 2000,
+                               weak_order: Optional[float] = None,
+                               seed: Optional[int] = None) -> Dict:
+        """
+        Estimateur Monte Carlo multiniveau (Giles) pour payoffs dépendant du chemin
+        
+        Chaque niveau l estime E[P_l - P_{l-1}] avec des chemins fin et grossier
+        couplés; le nombre de chemins par niveau est alloué à partir des variances
+        estimées (N_l proportionnel à sqrt(V_l / C_l)) et des niveaux sont ajoutés
+        tant que le biais de discrétisation estimé dépasse la tolérance. Le biais
+        est estimé sur les seuls niveaux de correction (l >= 1); si max_levels est
+        atteint avant, le résultat est marqué non convergé.
+        
+        Args:
+            path_payoff_func: Fonction vectorisée qui prend un array de chemins
+                (num_chemins, num_pas), au format de simulate_price_paths, et
+                retourne un array de payoffs (num_chemins,)
+            time_to_expiry_years: Temps jusqu'à l'expiration en années
+            target_rmse: Erreur quadratique moyenne visée sur l'estimation
+            base_steps: Nombre de pas de temps au niveau le plus grossier
+            refinement_factor: Facteur M de raffinement entre niveaux
+            min_levels: Nombre minimal de niveaux
+            max_levels: Nombre maximal de niveaux
+            initial_samples: Chemins pilotes par nouveau niveau
+            weak_order: Ordre faible alpha du schéma (None = estimé par régression)
+            seed: Graine du générateur aléatoire
+            
+        Returns:
+            Dictionnaire avec l'estimation, le biais estimé (inf sans niveau de
+            correction), l'indicateur de convergence et les statistiques par niveau
+        """
+        if target_rmse <= 0:
+            raise ValueError("La RMSE cible doit être positive")
+        if refinement_factor < 2:
+            raise ValueError("Le facteur de raffinement doit être au moins 2")
+        
+        rng = np.random.default_rng(seed)
+        M = refinement_factor
+        min_levels = max(1, min(min_levels, max_levels))
+        
+        num_levels = min_levels
+        converged = False
+        bias = float('inf')
+        samples = np.zeros(num_levels, dtype=np.int64)
+        sums = np.zeros((num_levels, 2))
+        pending = np.full(num_levels, initial_samples, dtype=np.int64)
+        
+        def remaining_bias(means: np.ndarray, alpha: float) -> float:
+            # Biais estimé sur les niveaux de correction uniquement: la moyenne
+            # du niveau 0 est le prix lui-même, pas une correction
+            corrections = np.abs(means[1:])
+            if len(corrections) == 0:
+                return float('inf')
+            if len(corrections) == 1:
+                return float(corrections[-1] / (M**alpha - 1))
+            return float(max(corrections[-1], corrections[-2] / M**alpha) / (M**alpha - 1))
+        
+        def level_cost(level: int) -> float:
+            fine = base_steps * M ** level
+            return float(fine + (fine // M if level > 0 else 0))
+        
+        while np.any(pending > 0):
+            # Simulation des chemins manquants sur chaque niveau
+            for level in np.nonzero(pending)[0]:
+                sum_y, sum_y2 = self._coupled_level_sums(
+                    path_payoff_func, time_to_expiry_years, int(level),
+                    int(pending[level]), base_steps, M, rng
+                )
+                sums[level] += (sum_y, sum_y2)
+                samples[level] += pending[level]
+            
+            means = sums[:, 0] / samples
+            variances = np.maximum(sums[:, 1] / samples - means**2, 0.0)
+            costs = np.array([level_cost(l) for l in range(num_levels)])
+            
+            # Ordres de convergence estimés sur les niveaux de correction
+            levels = np.arange(1, num_levels)
+            alpha = weak_order
+            if alpha is None:
+                alpha = self._decay_rate(np.abs(means[1:]), levels, M, default=1.0)
+            beta = self._decay_rate(variances[1:], levels, M, default=1.0)
+            
+            # Variances trop petites (estimation bruitée) remplacées par extrapolation
+            for level in range(2, num_levels):
+                variances[level] = max(variances[level], 0.5 * variances[level - 1] / M**beta)
+            
+            # Allocation optimale des chemins par niveau
+            optimal = np.ceil(
+                2.0 / target_rmse**2 * np.sqrt(variances / costs) *
+                np.sum(np.sqrt(variances * costs))
+            ).astype(np.int64)
+            pending = np.maximum(0, optimal - samples)
+            
+            # Test de convergence du biais lorsque l'échantillonnage est suffisant
+            if np.all(pending <= 0.01 * samples):
+                bias = remaining_bias(means, alpha)
+                converged = bias <= target_rmse / np.sqrt(2)
+                
+                if not converged and num_levels < max_levels:
+                    variances = np.append(variances, variances[-1] / M**beta)
+                    costs = np.append(costs, level_cost(num_levels))
+                    samples = np.append(samples, 0)
+                    sums = np.vstack([sums, np.zeros(2)])
+                    num_levels += 1
+                    
+                    optimal = np.ceil(
+                        2.0 / target_rmse**2 * np.sqrt(variances / costs) *
+                        np.sum(np.sqrt(variances * costs))
+                    ).astype(np.int64)
+                    pending = np.maximum(0, optimal - samples)
+                    pending[-1] = max(pending[-1], initial_samples)
+                else:
+                    pending[:] = 0
+        
+        means = sums[:, 0] / samples
+        variances = np.maximum(sums[:, 1] / samples - means**2, 0.0)
+        costs = np.array([level_cost(l) for l in range(num_levels)])
+        estimate = float(np.sum(means))
+        total_cost = float(np.sum(samples * costs))
+        
+        # Coût d'un Monte Carlo standard au pas le plus fin pour la même RMSE
+        # (la variance du niveau 0 approxime celle du payoff)
+        finest_steps = base_steps * M ** (num_levels - 1)
+        single_level_cost = float(2.0 * variances[0] / target_rmse**2 * finest_steps)
+        
+        return {
+            'estimate': estimate,
+            'target_rmse': target_rmse,
+            'statistical_error': float(np.sqrt(np.sum(variances / samples))),
+            'bias_estimate': bias,
+            'converged': bool(converged),
+            'num_levels': num_levels,
+            'steps_per_level': [base_steps * M ** l for l in range(num_levels)],
+            'samples_per_level': samples.tolist(),
+            'level_means': means.tolist(),
+            'level_variances': variances.tolist(),
+            'total_cost': total_cost,
+            'single_level_cost': single_level_cost,
+            'cost_ratio': total_cost / single_level_cost if single_level_cost > 0 else float('nan')
+        }
+    
+    @staticmethod
+    def _decay_rate(values: np.ndarray, levels: np.ndarray, refinement_factor: int,
+                    default: float = 1.0) -> float:
+        """
+        Estime le taux de décroissance géométrique log_M(values_l) ~ -rate * l
+        
+        Args:
+            values: Valeurs positives par niveau (moyennes ou variances)
+            levels: Indices des niveaux correspondants
+            refinement_factor: Facteur de raffinement M
+            default: Valeur retournée si la régression est impossible
+            
+        Returns:
+            Taux de décroissance (au moins 0.5)
+        """
+        mask = values > 0
+        if np.sum(mask) < 2:
+            return default
+        
+        slope = np.polyfit(levels[mask], np.log(values[mask]) / np.log(refinement_factor), 1)[0]
+        return max(0.5, -slope)
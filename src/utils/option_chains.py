@@ -0,0 +1,467 @@
+"""
+Option Chain Store
+Ingestion des chaînes d'options cotées et stockage colonnaire de snapshots sur
+disque (memory-mappé), avec index trié (type, échéance, strike)
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .concurrent_fetch import map_concurrently
+from .market_data import get_spot_price
+from .providers import MarketDataProvider, get_provider
+
+
+# Types d'options (code stocké = position dans le tuple)
+OPTION_TYPES = ('call', 'put')
+
+# Colonnes yfinance conservées -> noms stockés
+QUOTE_COLUMNS = {
+    'strike': 'strike',
+    'bid': 'bid',
+    'ask': 'ask',
+    'lastPrice': 'last_price',
+    'volume': 'volume',
+    'openInterest': 'open_interest',
+    'impliedVolatility': 'implied_volatility',
+}
+
+# Colonnes d'un snapshot: clé de tri (type << 32 | jour d'échéance), descripteurs et cotations
+SNAPSHOT_COLUMNS = ['group', 'option_type', 'expiry', 'contract'] + list(QUOTE_COLUMNS.values()) + ['mid']
+
+# Répertoire par défaut du store (surchargé par la variable OPTION_STORE_DIR)
+DEFAULT_OPTION_STORE_DIR = os.path.join('data', 'options')
+
+
+def _type_code(option_type: str) -> int:
+    """Code stocké d'un type d'option"""
+    if option_type not in OPTION_TYPES:
+        raise ValueError(f"Type d'option inconnu: {option_type} (disponibles: {', '.join(OPTION_TYPES)})")
+    return OPTION_TYPES.index(option_type)
+
+
+def _expiry_day(expiry) -> int:
+    """Échéance en nombre de jours depuis l'epoch"""
+    return int(pd.Timestamp(expiry).normalize().value // (86400 * 10**9))
+
+
+def _group_key(option_type: str, expiry) -> int:
+    """Clé de tri (type, échéance)"""
+    return (_type_code(option_type) << 32) | _expiry_day(expiry)
+
+
+def normalize_option_chain(chain: pd.DataFrame, expiry) -> pd.DataFrame:
+    """
+    Normalise une chaîne d'options au format du store
+    
+    Args:
+        chain: DataFrame au format yfinance avec une colonne option_type
+        expiry: Date d'échéance
+    
+    Returns:
+        DataFrame avec les colonnes de SNAPSHOT_COLUMNS
+    """
+    frame = chain.reindex(columns=list(QUOTE_COLUMNS)).rename(columns=QUOTE_COLUMNS).astype(float)
+    codes = chain['option_type'].map({name: code for code, name in enumerate(OPTION_TYPES)})
+    if codes.isna().any():
+        raise ValueError("Type d'option inconnu dans la chaîne")
+    
+    expiry_day = _expiry_day(expiry)
+    option_type = codes.to_numpy(dtype=np.int64)
+    frame['option_type'] = option_type
+    frame['expiry'] = expiry_day
+    frame['group'] = np.left_shift(option_type, 32) | expiry_day
+    frame['contract'] = chain['contractSymbol'].astype(str) if 'contractSymbol' in chain else ''
+    
+    # Milieu de fourchette, dernier prix si la fourchette est absente
+    quoted = (frame['bid'] > 0) & (frame['ask'] >= frame['bid'])
+    frame['mid'] = np.where(quoted, (frame['bid'] + frame['ask']) / 2, frame['last_price'])
+    return frame[SNAPSHOT_COLUMNS]
+
+
+class OptionChainSnapshot:
+    """
+    Snapshot des chaînes d'options d'un ticker, lu par memory-mapping
+    
+    Les contrats sont triés par (type, échéance, strike): la tranche d'une
+    échéance et le strike le plus proche sont trouvés par recherche
+    dichotomique, sans charger la chaîne complète en mémoire.
+    """
+    
+    META_FILE = 'meta.json'
+    
+    def __init__(self, path: str):
+        """
+        Ouvre un snapshot
+        
+        Args:
+            path: Répertoire du snapshot
+        """
+        self.path = path
+        with open(os.path.join(path, self.META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self._columns: Dict[str, np.ndarray] = {}
+    
+    @property
+    def ticker(self) -> str:
+        return self.meta['ticker']
+    
+    @property
+    def spot(self) -> float:
+        """Prix du sous-jacent au moment du snapshot"""
+        return self.meta['spot']
+    
+    @property
+    def taken_at(self) -> pd.Timestamp:
+        return pd.Timestamp(self.meta['taken_at'])
+    
+    def __len__(self) -> int:
+        return self.meta['length']
+    
+    def column(self, name: str) -> np.ndarray:
+        """Colonne du snapshot (memory-mappée, lecture seule)"""
+        if name not in self._columns:
+            self._columns[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+        return self._columns[name]
+    
+    def expiries(self) -> pd.DatetimeIndex:
+        """Échéances disponibles, triées"""
+        days = np.unique(np.asarray(self.column('expiry')))
+        return pd.DatetimeIndex(days.astype('datetime64[D]')).as_unit('ns')
+    
+    def nearest_expiry(self, days_to_expiry: float) -> pd.Timestamp:
+        """
+        Échéance la plus proche d'une maturité cible
+        
+        Args:
+            days_to_expiry: Maturité cible en jours calendaires depuis le snapshot
+        
+        Returns:
+            Date d'échéance
+        """
+        expiries = self.expiries()
+        if len(expiries) == 0:
+            raise ValueError(f"Aucune échéance dans le snapshot {self.ticker}")
+        target = self.taken_at.normalize() + pd.Timedelta(days=days_to_expiry)
+        position = int(np.searchsorted(expiries.asi8, target.as_unit('ns').value))
+        candidates = expiries[max(position - 1, 0):position + 1]
+        return candidates[np.argmin(np.abs(candidates - target))]
+    
+    def _bounds(self, option_type: str, expiry) -> slice:
+        """Tranche (type, échéance) par recherche dichotomique"""
+        groups = self.column('group')
+        key = _group_key(option_type, expiry)
+        return slice(int(np.searchsorted(groups, key, side='left')),
+                     int(np.searchsorted(groups, key, side='right')))
+    
+    def _frame(self, rows) -> pd.DataFrame:
+        """DataFrame des contrats pour des indices de lignes"""
+        frame = pd.DataFrame({
+            name: np.asarray(self.column(name)[rows])
+            for name in SNAPSHOT_COLUMNS if name != 'group'
+        })
+        frame['option_type'] = np.asarray(OPTION_TYPES)[frame['option_type'].to_numpy()]
+        frame['expiry'] = frame['expiry'].to_numpy().astype('datetime64[D]').astype('datetime64[ns]')
+        return frame
+    
+    def chain(self, expiry=None, option_type: Optional[str] = None) -> pd.DataFrame:
+        """
+        Contrats d'une échéance et/ou d'un type
+        
+        Args:
+            expiry: Date d'échéance (None = toutes)
+            option_type: 'call', 'put' ou None (les deux)
+        
+        Returns:
+            DataFrame des contrats triés par (type, échéance, strike)
+        """
+        if expiry is None:
+            rows = np.arange(len(self))
+            if option_type is not None:
+                rows = rows[np.asarray(self.column('option_type')) == _type_code(option_type)]
+            return self._frame(rows)
+        
+        types = [option_type] if option_type is not None else list(OPTION_TYPES)
+        rows = np.concatenate([np.arange(len(self))[self._bounds(name, expiry)] for name in types])
+        return self._frame(rows)
+    
+    def nearest_strikes(self, expiry, strike: float, option_type: str = 'call',
+                        n: int = 1) -> pd.DataFrame:
+        """
+        Contrats dont le strike est le plus proche d'un niveau donné
+        
+        Args:
+            expiry: Date d'échéance
+            strike: Strike cible
+            option_type: 'call' ou 'put'
+            n: Nombre de contrats retournés
+        
+        Returns:
+            DataFrame des n contrats les plus proches, triés par distance
+        """
+        bounds = self._bounds(option_type, expiry)
+        strikes = np.asarray(self.column('strike')[bounds])
+        if len(strikes) == 0:
+            raise ValueError(f"Aucun {option_type} à l'échéance {pd.Timestamp(expiry).date()}")
+        
+        # Fenêtre de 2n strikes autour du point d'insertion, puis tri par distance
+        position = int(np.searchsorted(strikes, strike))
+        window = np.arange(max(position - n, 0), min(position + n, len(strikes)))
+        nearest = window[np.argsort(np.abs(strikes[window] - strike), kind='stable')[:n]]
+        return self._frame(bounds.start + nearest).reset_index(drop=True)
+    
+    def quote(self, option_type: str, expiry, strike: float) -> Dict:
+        """
+        Cotation du contrat le plus proche (type, échéance, strike)
+        
+        Returns:
+            Dictionnaire des colonnes du contrat
+        """
+        return self.nearest_strikes(expiry, strike, option_type, 1).iloc[0].to_dict()
+    
+    def atm_strike(self, expiry, option_type: str = 'call') -> float:
+        """Strike coté le plus proche du spot"""
+        return float(self.nearest_strikes(expiry, self.spot, option_type, 1)['strike'].iloc[0])
+    
+    def straddle_quote(self, days_to_expiry: float = 30, strike: Optional[float] = None) -> Dict:
+        """
+        Cotation de marché d'un straddle (call et put au même strike)
+        
+        Args:
+            days_to_expiry: Maturité cible en jours (échéance cotée la plus proche)
+            strike: Strike cible (None = ATM); le strike retenu est le plus
+                proche coté à la fois en call et en put
+        
+        Returns:
+            Dictionnaire avec échéance, strike, prix milieu et volatilités implicites
+        """
+        expiry = self.nearest_expiry(days_to_expiry)
+        target = self.spot if strike is None else strike
+        call_strikes = np.asarray(self.column('strike')[self._bounds('call', expiry)])
+        put_strikes = np.asarray(self.column('strike')[self._bounds('put', expiry)])
+        common = np.intersect1d(call_strikes, put_strikes, assume_unique=True)
+        if len(common) == 0:
+            raise ValueError(f"Aucun strike commun aux calls et puts à l'échéance {expiry.date()}")
+        strike = float(common[np.argmin(np.abs(common - target))])
+        
+        call = self.quote('call', expiry, strike)
+        put = self.quote('put', expiry, strike)
+        return {
+            'ticker': self.ticker,
+            'spot': self.spot,
+            'expiry': expiry,
+            'days_to_expiry': int((expiry - self.taken_at.normalize()).days),
+            'strike': strike,
+            'call_price': call['mid'],
+            'put_price': put['mid'],
+            'total_cost': call['mid'] + put['mid'],
+            'call_implied_volatility': call['implied_volatility'],
+            'put_implied_volatility': put['implied_volatility'],
+            'call_contract': call['contract'],
+            'put_contract': put['contract']
+        }
+
+
+class OptionChainStore:
+    """
+    Store local des snapshots de chaînes d'options, un répertoire par ticker et par jour
+    
+    Chaque snapshot est un ensemble de fichiers .npy (une colonne chacun)
+    écrits une fois puis ouverts en memory-mapping; un snapshot du même
+    jour est remplacé atomiquement.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialise le store
+        
+        Args:
+            root: Répertoire racine (défaut: $OPTION_STORE_DIR ou data/options)
+        """
+        self.root = root or os.environ.get('OPTION_STORE_DIR', DEFAULT_OPTION_STORE_DIR)
+        self._snapshots: Dict[str, OptionChainSnapshot] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(ticker: str) -> str:
+        """Nom de répertoire associé à un ticker"""
+        return re.sub(r'[^A-Za-z0-9._^=-]', '_', ticker.upper())
+    
+    def snapshots(self, ticker: str) -> List[str]:
+        """
+        Identifiants (dates 'YYYY-MM-DD') des snapshots d'un ticker
+        
+        Returns:
+            Liste triée chronologiquement
+        """
+        directory = os.path.join(self.root, self._key(ticker))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory)
+                      if re.fullmatch(r'\d{4}-\d{2}-\d{2}', name)
+                      and os.path.exists(os.path.join(directory, name, OptionChainSnapshot.META_FILE)))
+    
+    def snapshot(self, ticker: str, snapshot_id: Optional[str] = None) -> OptionChainSnapshot:
+        """
+        Ouvre un snapshot (le plus récent par défaut)
+        
+        Args:
+            ticker: Symbole du ticker
+            snapshot_id: Date du snapshot 'YYYY-MM-DD' (None = le plus récent)
+        
+        Returns:
+            OptionChainSnapshot
+        """
+        if snapshot_id is None:
+            available = self.snapshots(ticker)
+            if not available:
+                raise ValueError(f"Aucun snapshot de chaîne d'options pour {ticker}")
+            snapshot_id = available[-1]
+        
+        path = os.path.join(self.root, self._key(ticker), snapshot_id)
+        with self._lock:
+            if path not in self._snapshots:
+                if not os.path.isdir(path):
+                    raise ValueError(f"Snapshot inexistant: {ticker} {snapshot_id}")
+                self._snapshots[path] = OptionChainSnapshot(path)
+            return self._snapshots[path]
+    
+    def write_snapshot(self, ticker: str, chains: pd.DataFrame, spot: float,
+                       taken_at: Optional[datetime] = None) -> OptionChainSnapshot:
+        """
+        Écrit un snapshot à partir de chaînes normalisées
+        
+        Args:
+            ticker: Symbole du ticker
+            chains: Contrats au format de normalize_option_chain (toutes échéances)
+            spot: Prix du sous-jacent
+            taken_at: Horodatage du snapshot (défaut: maintenant)
+        
+        Returns:
+            Snapshot écrit
+        """
+        taken_at = pd.Timestamp(taken_at or datetime.now())
+        snapshot_id = taken_at.strftime('%Y-%m-%d')
+        directory = os.path.join(self.root, self._key(ticker))
+        path = os.path.join(directory, snapshot_id)
+        
+        order = np.lexsort((chains['strike'].to_numpy(), chains['group'].to_numpy()))
+        chains = chains.iloc[order]
+        
+        tmp_path = path + '.tmp'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for name in SNAPSHOT_COLUMNS:
+            values = chains[name].to_numpy()
+            if name == 'contract':
+                values = values.astype(str)
+            elif name in ('group', 'option_type', 'expiry'):
+                values = values.astype(np.int64)
+            else:
+                values = values.astype(np.float64)
+            np.save(os.path.join(tmp_path, f"{name}.npy"), values)
+        with open(os.path.join(tmp_path, OptionChainSnapshot.META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'ticker': ticker.upper(), 'spot': float(spot),
+                       'taken_at': taken_at.isoformat(), 'length': len(chains)}, f)
+        
+        # Remplacement atomique d'un éventuel snapshot du même jour
+        with self._lock:
+            self._snapshots.pop(path, None)
+            if os.path.exists(path):
+                old_path = path + '.old'
+                shutil.rmtree(old_path, ignore_errors=True)
+                os.replace(path, old_path)
+                os.replace(tmp_path, path)
+                shutil.rmtree(old_path, ignore_errors=True)
+            else:
+                os.replace(tmp_path, path)
+        return self.snapshot(ticker, snapshot_id)
+    
+    def contract_history(self, ticker: str, option_type: str, expiry, strike: float) -> pd.DataFrame:
+        """
+        Historique d'un contrat à travers les snapshots stockés
+        
+        Args:
+            ticker: Symbole du ticker
+            option_type: 'call' ou 'put'
+            expiry: Date d'échéance
+            strike: Strike (contrat le plus proche dans chaque snapshot)
+        
+        Returns:
+            DataFrame indexé par date de snapshot (spot et cotations)
+        """
+        rows = {}
+        for snapshot_id in self.snapshots(ticker):
+            snapshot = self.snapshot(ticker, snapshot_id)
+            try:
+                quote = snapshot.quote(option_type, expiry, strike)
+            except ValueError:
+                continue
+            if quote['strike'] == strike:
+                rows[pd.Timestamp(snapshot_id)] = {'spot': snapshot.spot, **quote}
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def ingest_option_chain(ticker: str,
+                        store: Optional[OptionChainStore] = None,
+                        provider: Optional[MarketDataProvider] = None,
+                        expiries: Optional[Iterable[str]] = None,
+                        max_days: Optional[int] = None,
+                        spot: Optional[float] = None) -> OptionChainSnapshot:
+    """
+    Télécharge toutes les échéances d'un ticker et enregistre un snapshot
+    
+    Les échéances sont récupérées en parallèle.
+    
+    Args:
+        ticker: Symbole du ticker
+        store: Store de destination (défaut: store partagé)
+        provider: Source des données (défaut: provider partagé)
+        expiries: Échéances à récupérer (défaut: toutes les échéances cotées)
+        max_days: Maturité maximale en jours calendaires (None = sans limite)
+        spot: Prix du sous-jacent (défaut: dernier cours)
+    
+    Returns:
+        Snapshot écrit
+    """
+    store = store or get_default_option_store()
+    provider = provider or get_provider()
+    
+    expiries = list(expiries) if expiries is not None else provider.option_expiries(ticker)
+    if max_days is not None:
+        horizon = pd.Timestamp(date.today()) + pd.Timedelta(days=max_days)
+        expiries = [expiry for expiry in expiries if pd.Timestamp(expiry) <= horizon]
+    if not expiries:
+        raise ValueError(f"Aucune échéance d'options cotée pour {ticker}")
+    
+    chains = map_concurrently(lambda expiry: provider.option_chain(ticker, expiry), expiries)
+    frames = [normalize_option_chain(chain, expiry)
+              for chain, expiry in zip(chains, expiries) if not chain.empty]
+    
+    if spot is None:
+        spot = get_spot_price(ticker)
+    return store.write_snapshot(ticker, pd.concat(frames, ignore_index=True), spot)
+
+
+_default_option_store: Optional[OptionChainStore] = None
+
+
+def get_default_option_store() -> OptionChainStore:
+    """
+    Store de chaînes d'options partagé par le processus
+    
+    Returns:
+        Instance de OptionChainStore
+    """
+    global _default_option_store
+    if _default_option_store is None:
+        _default_option_store = OptionChainStore()
+    return _default_option_store
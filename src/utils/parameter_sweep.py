@@ -0,0 +1,204 @@
+"""
+Parameter Sweep Engine
+Évaluation parallèle d'une grille de paramètres de backtest
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .backtesting import Backtester
+from .yield_curve import YieldCurve
+
+
+# Statistiques du backtest reprises dans la table de résultats
+RESULT_COLUMNS = [
+    'total_trades', 'win_rate', 'total_profit', 'avg_profit_per_trade',
+    'profit_factor', 'sharpe_ratio', 'max_drawdown', 'best_trade', 'worst_trade'
+]
+
+# Stratégies dont le backtest utilise le paramètre otm_percent
+OTM_STRATEGIES = {'LongStrangle'}
+
+# Nombre minimal de configurations par processus: en deçà, le coût de
+# démarrage des workers dépasse le gain de la parallélisation
+MIN_CONFIGS_PER_WORKER = 4
+
+# Backtester du processus worker (données partagées en lecture seule)
+_worker_backtester: Optional[Backtester] = None
+
+
+def _init_worker(ticker: str, data: pd.DataFrame, yield_curve: YieldCurve):
+    """
+    Initialise un worker avec les données et la courbe des taux du backtester
+    parent, transmises une seule fois (les colonnes intraday sont conservées)
+    """
+    global _worker_backtester
+    _worker_backtester = Backtester.from_dataframe(ticker, data, yield_curve)
+
+
+def _evaluate_configs(configs: List[Dict]) -> List[Dict]:
+    """Évalue un lot de configurations dans le worker courant"""
+    return [_evaluate_config(_worker_backtester, config) for config in configs]
+
+
+def _evaluate_config(backtester: Backtester, config: Dict) -> Dict:
+    """
+    Backtest d'une configuration de la grille
+    
+    Args:
+        backtester: Backtester portant les données
+        config: Paramètres de la configuration (voir evaluate_configs)
+    
+    Returns:
+        Ligne de la table de résultats
+    """
+    strategy_params = dict(config.get('strategy_params') or {})
+    if not np.isnan(config.get('otm_percent', np.nan)):
+        strategy_params['otm_percent'] = config['otm_percent']
+    
+    result = backtester.backtest_strategy(
+        config['strategy_class'],
+        holding_period_days=config['holding_period_days'],
+        rebalance_frequency_days=config['rebalance_frequency_days'],
+        volatility_window=config.get('volatility_window'),
+        volatility_estimator=config.get('volatility_estimator', 'close_to_close'),
+        include_trades=False,
+        **strategy_params
+    )
+    
+    row = {key: value for key, value in config.items() if key not in ('strategy_class', 'strategy_params')}
+    row['strategy'] = config['strategy_class'].__name__
+    row['success'] = result['success']
+    for column in RESULT_COLUMNS:
+        row[column] = result.get(column, np.nan)
+    return row
+
+
+def build_parameter_grid(strategy_classes: Sequence,
+                         holding_periods: Iterable[int],
+                         rebalance_frequencies: Optional[Iterable[int]] = None,
+                         otm_percents: Iterable[float] = (0.05,),
+                         volatility_windows: Iterable[int] = (30,),
+                         volatility_estimators: Iterable[str] = ('close_to_close',)) -> List[Dict]:
+    """
+    Construit la grille holding period x rééquilibrage x % OTM x fenêtre de vol x stratégie
+    (x estimateur de volatilité)
+    
+    Args:
+        strategy_classes: Classes de stratégie (LongStraddle, LongStrangle)
+        holding_periods: Durées de détention en jours
+        rebalance_frequencies: Fréquences de rééquilibrage (None = égale à la durée de détention)
+        otm_percents: Pourcentages OTM (stratégies OTM uniquement)
+        volatility_windows: Fenêtres de volatilité historique
+        volatility_estimators: Estimateurs de volatilité réalisée
+    
+    Returns:
+        Liste de configurations
+    """
+    holding_periods = list(holding_periods)
+    otm_percents = list(otm_percents)
+    volatility_windows = list(volatility_windows)
+    volatility_estimators = list(volatility_estimators)
+    frequencies = None if rebalance_frequencies is None else list(rebalance_frequencies)
+    
+    grid = []
+    for strategy_class in strategy_classes:
+        # Le % OTM n'a pas d'effet sur un straddle: une seule valeur évaluée
+        otm_values = otm_percents if strategy_class.__name__ in OTM_STRATEGIES else [np.nan]
+        
+        for holding, otm, window, estimator in itertools.product(
+                holding_periods, otm_values, volatility_windows, volatility_estimators):
+            for frequency in (frequencies or [holding]):
+                grid.append({
+                    'strategy_class': strategy_class,
+                    'holding_period_days': int(holding),
+                    'rebalance_frequency_days': int(frequency),
+                    'otm_percent': float(otm),
+                    'volatility_window': int(window),
+                    'volatility_estimator': estimator
+                })
+    return grid
+
+
+def run_parameter_sweep(backtester: Backtester,
+                        strategy_classes: Sequence,
+                        holding_periods: Iterable[int],
+                        rebalance_frequencies: Optional[Iterable[int]] = None,
+                        otm_percents: Iterable[float] = (0.05,),
+                        volatility_windows: Iterable[int] = (30,),
+                        volatility_estimators: Iterable[str] = ('close_to_close',),
+                        max_workers: Optional[int] = None,
+                        chunk_size: Optional[int] = None) -> pd.DataFrame:
+    """
+    Évalue toute la grille de paramètres en parallèle sur les données d'un backtester
+    
+    Les prix sont chargés une seule fois et transmis en lecture seule à
+    chaque worker du pool de processus à son initialisation; les
+    configurations sont ensuite distribuées par lots.
+    
+    Args:
+        backtester: Backtester dont les données sont réutilisées
+        strategy_classes: Classes de stratégie à tester
+        holding_periods: Durées de détention en jours
+        rebalance_frequencies: Fréquences de rééquilibrage (None = égale à la durée de détention)
+        otm_percents: Pourcentages OTM pour les strangles
+        volatility_windows: Fenêtres de volatilité historique
+        volatility_estimators: Estimateurs de volatilité réalisée
+        max_workers: Nombre de processus (None = nombre de cœurs, 1 = sans pool)
+        chunk_size: Configurations par lot (None = réparti automatiquement)
+    
+    Returns:
+        DataFrame avec une ligne par configuration
+    """
+    grid = build_parameter_grid(strategy_classes, holding_periods, rebalance_frequencies,
+                                otm_percents, volatility_windows, volatility_estimators)
+    return evaluate_configs(backtester, grid, max_workers, chunk_size)
+
+
+def evaluate_configs(backtester: Backtester, configs: List[Dict],
+                     max_workers: Optional[int] = None,
+                     chunk_size: Optional[int] = None) -> pd.DataFrame:
+    """
+    Évalue une liste de configurations de backtest, en parallèle si elle est assez longue
+    
+    Chaque worker reçoit une seule fois les données complètes et la courbe
+    des taux du backtester: les résultats sont identiques à une évaluation
+    en série.
+    
+    Args:
+        backtester: Backtester dont les données sont réutilisées
+        configs: Configurations (strategy_class, holding_period_days,
+            rebalance_frequency_days et, optionnels, otm_percent,
+            volatility_window, volatility_estimator, strategy_params)
+        max_workers: Nombre de processus (None = nombre de cœurs, 1 = sans pool)
+        chunk_size: Configurations par lot (None = réparti automatiquement)
+    
+    Returns:
+        DataFrame avec une ligne par configuration, dans l'ordre de configs
+    """
+    if not configs:
+        return pd.DataFrame()
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, max(1, len(configs) // MIN_CONFIGS_PER_WORKER))
+    
+    if max_workers == 1:
+        rows = [_evaluate_config(backtester, config) for config in configs]
+    else:
+        if chunk_size is None:
+            chunk_size = max(1, len(configs) // (max_workers * 4))
+        chunks = [configs[i:i + chunk_size] for i in range(0, len(configs), chunk_size)]
+        
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(backtester.ticker, backtester.data,
+                                           backtester.yield_curve)) as executor:
+            rows = [row for chunk_rows in executor.map(_evaluate_configs, chunks) for row in chunk_rows]
+    
+    results = pd.DataFrame(rows)
+    results.insert(0, 'ticker', backtester.ticker)
+    return results
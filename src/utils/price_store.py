@@ -0,0 +1,569 @@
+"""
+Local Price Store
+Stockage local incrémental des historiques OHLCV, colonne par colonne sur disque
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .providers import get_provider
+from .upstream import CircuitOpenError
+
+
+# Colonnes OHLCV conservées (prix ajustés des splits et dividendes)
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Événements retournés avec les barres: un split ou un dividende postérieur
+# aux barres stockées change leur base d'ajustement
+ACTION_COLUMNS = ['Dividends', 'Stock Splits']
+
+# Écart relatif toléré entre la clôture stockée et la clôture retéléchargée
+# d'une même séance avant de considérer que l'ajustement a changé
+ADJUSTMENT_TOLERANCE = 1e-4
+
+# Répertoire par défaut du store (surchargé par la variable PRICE_STORE_DIR)
+DEFAULT_STORE_DIR = os.path.join('data', 'prices')
+
+# Durée (secondes) pendant laquelle la séance du jour, encore ouverte, n'est
+# pas retéléchargée: sa barre provisoire est servie telle quelle
+OPEN_SESSION_TTL = 300
+
+
+class ColumnTable:
+    """
+    Table colonnaire append-only indexée par date
+    
+    Chaque colonne est un fichier binaire brut (float64, index en int64
+    nanosecondes) lu par memory-mapping; meta.json contient le nombre de
+    lignes valides et des métadonnées libres. Un seul écrivain par table.
+    """
+    
+    INDEX_COLUMN = 'index'
+    META_FILE = 'meta.json'
+    
+    def __init__(self, path: str, columns: List[str]):
+        """
+        Initialise (ou ouvre) une table
+        
+        Args:
+            path: Répertoire de la table
+            columns: Noms des colonnes de données
+        """
+        self.path = path
+        self.columns = list(columns)
+        self._meta = self._read_meta()
+    
+    def _read_meta(self) -> Dict:
+        """Lit les métadonnées (table vide si absentes)"""
+        meta_path = os.path.join(self.path, self.META_FILE)
+        if not os.path.exists(meta_path):
+            return {'length': 0, 'columns': self.columns, 'info': {}}
+        
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.columns = meta['columns']
+        return meta
+    
+    def _write_meta(self):
+        """Écrit les métadonnées de façon atomique"""
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, self.META_FILE)
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._meta, f)
+        os.replace(tmp_path, meta_path)
+    
+    def _column_path(self, column: str) -> str:
+        """Chemin du fichier d'une colonne"""
+        suffix = 'i8' if column == self.INDEX_COLUMN else 'f8'
+        return os.path.join(self.path, f"{column}.{suffix}")
+    
+    def __len__(self) -> int:
+        return self._meta['length']
+    
+    @property
+    def info(self) -> Dict:
+        """Métadonnées libres associées à la table"""
+        return self._meta['info']
+    
+    def set_info(self, **values):
+        """Met à jour les métadonnées libres"""
+        self._meta['info'].update(values)
+        self._write_meta()
+    
+    def _memmap(self, column: str, dtype) -> np.ndarray:
+        """Ouvre une colonne (ou l'index) en lecture seule par memory-mapping"""
+        return np.memmap(self._column_path(column), dtype=dtype,
+                         mode='r', shape=(len(self),))
+    
+    def index_values(self) -> np.ndarray:
+        """Index de la table (int64 nanosecondes, memory-mappé)"""
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64)
+        return self._memmap(self.INDEX_COLUMN, np.int64)
+    
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """Dernière date stockée"""
+        if len(self) == 0:
+            return None
+        return pd.Timestamp(int(self.index_values()[-1]))
+    
+    def read(self, start: Optional[pd.Timestamp] = None,
+             end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Lit les lignes de l'intervalle [start, end)
+        
+        Seule la tranche demandée est copiée depuis les fichiers memory-mappés.
+        
+        Args:
+            start: Borne inférieure incluse (None = début)
+            end: Borne supérieure exclue (None = fin)
+        
+        Returns:
+            DataFrame indexé par date
+        """
+        if len(self) == 0:
+            return pd.DataFrame(columns=self.columns, index=pd.DatetimeIndex([]), dtype=float)
+        
+        index = self.index_values()
+        lo = 0 if start is None else int(np.searchsorted(index, pd.Timestamp(start).value, side='left'))
+        hi = len(index) if end is None else int(np.searchsorted(index, pd.Timestamp(end).value, side='left'))
+        
+        data = {
+            column: np.array(self._memmap(column, np.float64)[lo:hi])
+            for column in self.columns
+        }
+        return pd.DataFrame(data, index=pd.DatetimeIndex(np.array(index[lo:hi]).astype('datetime64[ns]')))
+    
+    def append(self, frame: pd.DataFrame):
+        """
+        Ajoute des lignes en fin de table
+        
+        Les lignes déjà stockées à partir de la première date de frame sont
+        remplacées (barre du jour incomplète, révisions).
+        
+        Args:
+            frame: DataFrame indexé par date croissante avec les colonnes de la table
+        """
+        if frame.empty:
+            return
+        
+        new_index = pd.DatetimeIndex(frame.index).as_unit('ns').asi8
+        length = len(self)
+        if length > 0:
+            length = int(np.searchsorted(self.index_values(), new_index[0], side='left'))
+        
+        os.makedirs(self.path, exist_ok=True)
+        self._write_at(self.INDEX_COLUMN, new_index.astype(np.int64), length)
+        for column in self.columns:
+            values = frame[column].to_numpy(dtype=np.float64) if column in frame else np.full(len(frame), np.nan)
+            self._write_at(column, values, length)
+        
+        self._meta['length'] = length + len(frame)
+        self._write_meta()
+    
+    def replace(self, frame: pd.DataFrame):
+        """
+        Réécrit entièrement la table
+        
+        Args:
+            frame: DataFrame indexé par date croissante
+        """
+        self._meta['length'] = 0
+        self.append(frame)
+    
+    def _write_at(self, column: str, values: np.ndarray, offset: int):
+        """Écrit values à partir de la ligne offset et tronque le reste du fichier"""
+        file_path = self._column_path(column)
+        mode = 'r+b' if os.path.exists(file_path) else 'wb'
+        with open(file_path, mode) as f:
+            f.seek(offset * values.itemsize)
+            f.write(values.tobytes())
+            f.truncate()
+
+
+class PriceStore:
+    """
+    Store local des historiques OHLCV ajustés, par ticker
+    
+    Seules les plages de dates non encore couvertes sont téléchargées, puis
+    ajoutées incrémentalement au store; les lectures passent par des fichiers
+    colonnaires memory-mappés.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialise le store
+        
+        Args:
+            root: Répertoire racine (défaut: $PRICE_STORE_DIR ou data/prices)
+        """
+        self.root = root or os.environ.get('PRICE_STORE_DIR', DEFAULT_STORE_DIR)
+        self._tables: Dict[str, ColumnTable] = {}
+        self._ticker_locks: Dict[str, threading.RLock] = {}
+        self._lock = threading.RLock()
+    
+    @staticmethod
+    def _key(ticker: str) -> str:
+        """Nom de répertoire associé à un ticker"""
+        return re.sub(r'[^A-Za-z0-9._^=-]', '_', ticker.upper())
+    
+    def _ticker_lock(self, ticker: str) -> threading.RLock:
+        """Verrou d'un ticker: les téléchargements de tickers différents restent parallèles"""
+        key = self._key(ticker)
+        with self._lock:
+            if key not in self._ticker_locks:
+                self._ticker_locks[key] = threading.RLock()
+            return self._ticker_locks[key]
+    
+    def table(self, ticker: str, interval: str = '1d',
+              columns: Optional[List[str]] = None) -> ColumnTable:
+        """
+        Table d'un ticker pour une fréquence de barres donnée
+        
+        Args:
+            ticker: Symbole du ticker
+            interval: Fréquence des barres (ex: '1d', '5m') ou nom de table dérivée
+            columns: Colonnes de la table (défaut: OHLCV)
+        
+        Returns:
+            ColumnTable du ticker
+        """
+        key = f"{self._key(ticker)}/{interval}"
+        with self._lock:
+            if key not in self._tables:
+                self._tables[key] = ColumnTable(os.path.join(self.root, key), columns or PRICE_COLUMNS)
+            return self._tables[key]
+    
+    def get_history(self, ticker: str, start, end) -> pd.DataFrame:
+        """
+        Historique OHLCV quotidien de [start, end), complété depuis le provider si besoin
+        
+        Args:
+            ticker: Symbole du ticker
+            start: Date de début (incluse)
+            end: Date de fin (exclue, comme yfinance)
+        
+        Returns:
+            DataFrame OHLCV indexé par date
+        """
+        start = _to_day(start)
+        end = _to_day(end)
+        
+        with self._ticker_lock(ticker):
+            table = self.table(ticker)
+            for fetch_start, fetch_end in self._missing_ranges(table, start, end):
+                try:
+                    self._fetch_into(table, ticker, fetch_start, fetch_end)
+                except CircuitOpenError:
+                    # Source en panne: l'historique déjà stocké est servi tel quel
+                    if not len(table):
+                        raise
+                    break
+            
+            return table.read(start, end)
+    
+    def _missing_ranges(self, table: ColumnTable, start: pd.Timestamp,
+                        end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Plages à télécharger pour que la couverture contienne [start, end)
+        
+        La couverture reste toujours un intervalle contigu et ne contient
+        jamais la séance du jour: celle-ci n'est retéléchargée qu'après
+        OPEN_SESSION_TTL secondes. Les plages sans jour ouvré sont ignorées;
+        les autres sont étendues à la barre stockée adjacente (dernière barre
+        définitive ou première barre), qui sert à vérifier l'ajustement.
+        """
+        covered = table.info.get('covered')
+        ranges = []
+        if not covered:
+            ranges.append((start, end))
+        else:
+            covered_start, covered_end = (pd.Timestamp(d) for d in covered)
+            if start < covered_start:
+                ranges.append((start, covered_start))
+            if end > covered_end:
+                ranges.append((covered_end, end))
+        
+        today = pd.Timestamp(date.today())
+        open_session = table.info.get('open_session')
+        if open_session and open_session[0] == today.strftime('%Y-%m-%d') \
+                and time.time() - open_session[1] < OPEN_SESSION_TTL:
+            ranges = [(range_start, min(range_end, today)) for range_start, range_end in ranges]
+        
+        ranges = [(range_start, range_end) for range_start, range_end in ranges
+                  if range_start < range_end and np.busday_count(range_start.date(), range_end.date()) > 0]
+        
+        if covered and len(table):
+            index = table.index_values()
+            last_final = int(np.searchsorted(index, covered_end.value, side='left')) - 1
+            first = int(np.searchsorted(index, covered_start.value, side='left'))
+            overlapping = []
+            for range_start, range_end in ranges:
+                if range_start == covered_end and last_final >= 0:
+                    range_start = pd.Timestamp(int(index[last_final]))
+                elif range_end == covered_start and first < len(index):
+                    range_end = pd.Timestamp(int(index[first])) + pd.Timedelta(days=1)
+                overlapping.append((range_start, range_end))
+            ranges = overlapping
+        return ranges
+    
+    def _fetch_into(self, table: ColumnTable, ticker: str,
+                    start: pd.Timestamp, end: pd.Timestamp):
+        """Télécharge [start, end) et l'intègre à la table"""
+        self._ingest(table, ticker, self._download(ticker, start, end), start, end)
+    
+    def _adjustment_changed(self, table: ColumnTable, frame: pd.DataFrame) -> bool:
+        """
+        Indique si les barres stockées sont dans une autre base d'ajustement
+        
+        C'est le cas si un split ou un dividende est survenu après la
+        dernière barre définitive stockée, ou si les clôtures retéléchargées
+        des séances déjà stockées (barre de recouvrement) ont changé.
+        """
+        covered = table.info.get('covered')
+        if frame.empty or not covered or not len(table):
+            return False
+        covered_end = pd.Timestamp(covered[1])
+        stored = table.read(frame.index[0], covered_end)
+        
+        actions = frame.reindex(columns=ACTION_COLUMNS).fillna(0.0)
+        if len(stored) and (actions.loc[actions.index > stored.index[-1]] != 0).any().any():
+            return True
+        
+        common = stored.index.intersection(frame.index)
+        stored_close = stored.loc[common, 'Close'].to_numpy()
+        fetched_close = frame.loc[common, 'Close'].to_numpy()
+        valid = np.isfinite(stored_close) & np.isfinite(fetched_close)
+        return not np.allclose(fetched_close[valid], stored_close[valid], rtol=ADJUSTMENT_TOLERANCE, atol=0.0)
+    
+    def _ingest(self, table: ColumnTable, ticker: str, frame: pd.DataFrame,
+                start: pd.Timestamp, end: pd.Timestamp):
+        """
+        Intègre les barres téléchargées pour [start, end) et étend la couverture
+        
+        Si l'ajustement des barres stockées a changé (split, dividende),
+        tout l'historique couvert est retéléchargé et la table réécrite:
+        elle ne mélange jamais deux bases de prix. La couverture ne progresse
+        que sur la plage effectivement retournée: du début demandé (aucune
+        séance avant la première barre) jusqu'au lendemain de la dernière
+        barre; une réponse vide couvre toute la plage (avant l'introduction
+        en bourse, jours fériés) sauf la dernière séance close, et n'est plus
+        redemandée. La séance du jour,
+        encore ouverte, n'est jamais couverte; sa date de téléchargement est
+        notée à part (voir OPEN_SESSION_TTL).
+        """
+        today = pd.Timestamp(date.today())
+        info = {}
+        if start <= today < end:
+            info['open_session'] = [today.strftime('%Y-%m-%d'), time.time()]
+        
+        covered = table.info.get('covered')
+        covered_start = pd.Timestamp(covered[0]) if covered else None
+        covered_end = pd.Timestamp(covered[1]) if covered else None
+        if self._adjustment_changed(table, frame):
+            start, end = min(start, covered_start), max(end, covered_end)
+            frame = self._download(ticker, start, end)
+            if frame.empty:
+                # Source indisponible: l'ancien historique reste servi, nouvel essai au prochain appel
+                return
+            table.replace(frame)
+            covered_start = covered_end = None
+        elif not frame.empty:
+            if covered and start < covered_start:
+                # Extension vers le passé: réécriture complète (cas rare)
+                merged = pd.concat([frame, table.read()])
+                merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                table.replace(merged)
+            else:
+                table.append(frame)
+        
+        # Barres nouvelles (hors barre de recouvrement déjà couverte); sans
+        # barre nouvelle, la dernière séance close reste non couverte: la
+        # source peut ne pas l'avoir encore publiée
+        new_bars = frame.index if covered_end is None else frame.index[frame.index >= covered_end]
+        if new_bars.empty:
+            last_session = pd.Timestamp(np.busday_offset(today.date(), -1, roll='forward'))
+            returned_end = min(end, last_session)
+        else:
+            returned_end = min(new_bars[-1] + pd.Timedelta(days=1), end)
+        if covered_start is not None:
+            covered_start, covered_end = min(covered_start, start), max(covered_end, returned_end)
+        else:
+            covered_start, covered_end = start, returned_end
+        
+        # La séance du jour n'est jamais considérée comme définitive
+        covered_end = min(covered_end, today)
+        if covered_start < covered_end:
+            info['covered'] = [covered_start.strftime('%Y-%m-%d'), covered_end.strftime('%Y-%m-%d')]
+        
+        if info:
+            table.set_info(**info)
+    
+    def get_histories(self, tickers: List[str], start, end,
+                      batch_size: int = 100) -> Dict[str, pd.DataFrame]:
+        """
+        Historiques OHLCV de plusieurs tickers sur [start, end)
+        
+        Les tickers ayant la même plage manquante sont téléchargés ensemble,
+        par lots, en un seul appel groupé au provider de données.
+        
+        Args:
+            tickers: Liste de symboles
+            start: Date de début (incluse)
+            end: Date de fin (exclue)
+            batch_size: Nombre maximal de tickers par téléchargement groupé
+            
+        Returns:
+            Dictionnaire ticker -> DataFrame OHLCV indexé par date (éventuellement
+            incomplet si la source est indisponible)
+        """
+        start = _to_day(start)
+        end = _to_day(end)
+        
+        # Regroupement des tickers par plage manquante identique
+        pending: Dict[Tuple[pd.Timestamp, pd.Timestamp], List[str]] = {}
+        for ticker in tickers:
+            for missing in self._missing_ranges(self.table(ticker), start, end):
+                pending.setdefault(missing, []).append(ticker)
+        
+        for (fetch_start, fetch_end), group in pending.items():
+            for i in range(0, len(group), batch_size):
+                batch = group[i:i + batch_size]
+                try:
+                    frames = self._download_bulk(batch, fetch_start, fetch_end)
+                except CircuitOpenError:
+                    # Source en panne: les historiques déjà stockés sont servis tels quels
+                    continue
+                for ticker in batch:
+                    with self._ticker_lock(ticker):
+                        self._ingest(self.table(ticker), ticker,
+                                     frames.get(ticker, normalize_history(None)), fetch_start, fetch_end)
+        
+        histories = {}
+        for ticker in tickers:
+            with self._ticker_lock(ticker):
+                histories[ticker] = self.table(ticker).read(start, end)
+        return histories
+    
+    def get_history_panel(self, tickers: List[str], start, end,
+                          field: Union[str, List[str]] = 'Close',
+                          batch_size: int = 100) -> pd.DataFrame:
+        """
+        Panel (dates x tickers) d'un ou plusieurs champs OHLCV sur [start, end)
+        
+        Args:
+            tickers: Liste de symboles
+            start: Date de début (incluse)
+            end: Date de fin (exclue)
+            field: Champ OHLCV à extraire (ex: 'Close') ou liste de champs
+            batch_size: Nombre maximal de tickers par téléchargement groupé
+            
+        Returns:
+            DataFrame indexé par date, une colonne par ticker (colonnes
+            (champ, ticker) si plusieurs champs sont demandés)
+        """
+        histories = self.get_histories(tickers, start, end, batch_size)
+        if isinstance(field, str):
+            return stack_histories(histories, [field])[field]
+        return stack_histories(histories, field)
+    
+    @staticmethod
+    def _download(ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Télécharge les barres quotidiennes ajustées depuis le provider de données"""
+        return normalize_history(get_provider().history(ticker, start, end))
+    
+    @staticmethod
+    def _download_bulk(tickers: List[str], start: pd.Timestamp,
+                       end: pd.Timestamp) -> Dict[str, pd.DataFrame]:
+        """Télécharge en un appel groupé les barres quotidiennes ajustées de plusieurs tickers"""
+        frames = get_provider().download(tickers, start, end)
+        return {ticker: normalize_history(frame) for ticker, frame in frames.items()}
+
+
+def normalize_history(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise un historique yfinance: colonnes OHLCV, index de dates naïves trié
+    
+    Les colonnes de dividendes et de splits sont conservées quand la source
+    les fournit (détection des changements d'ajustement, non stockées).
+    
+    Args:
+        history: DataFrame retourné par yfinance
+    
+    Returns:
+        DataFrame OHLCV indexé par date (sans fuseau horaire)
+    """
+    if history is None or history.empty:
+        return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([]), dtype=float)
+    
+    index = pd.DatetimeIndex(history.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    
+    columns = PRICE_COLUMNS + [column for column in ACTION_COLUMNS if column in history]
+    frame = history.reindex(columns=columns).astype(float)
+    frame.index = index.normalize()
+    frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+    return frame
+
+
+def stack_histories(histories: Dict[str, pd.DataFrame], fields: List[str]) -> pd.DataFrame:
+    """
+    Assemble des historiques par ticker en un panel (dates x (champ, ticker))
+    
+    Les valeurs sont placées en une passe dans un array préalloué, sur
+    l'union triée des dates (NaN pour un ticker sans cotation ce jour-là).
+    
+    Args:
+        histories: Dictionnaire ticker -> DataFrame indexé par date
+        fields: Champs à extraire (ex: ['Open', 'High', 'Low', 'Close'])
+    
+    Returns:
+        DataFrame avec colonnes MultiIndex (champ, ticker)
+    """
+    tickers = list(histories)
+    indexes = [pd.DatetimeIndex(history.index).as_unit('ns').asi8 for history in histories.values()]
+    dates = np.unique(np.concatenate(indexes)) if indexes else np.empty(0, dtype=np.int64)
+    
+    values = np.full((len(fields), len(dates), len(tickers)), np.nan)
+    for j, (history, index) in enumerate(zip(histories.values(), indexes)):
+        if len(index):
+            rows = np.searchsorted(dates, index)
+            values[:, rows, j] = history.reindex(columns=fields).to_numpy(dtype=float).T
+    
+    columns = pd.MultiIndex.from_product([fields, tickers])
+    return pd.DataFrame(values.transpose(1, 0, 2).reshape(len(dates), -1),
+                        index=pd.DatetimeIndex(dates), columns=columns)
+
+
+def _to_day(value) -> pd.Timestamp:
+    """Convertit une date (str, datetime, Timestamp) en Timestamp à minuit sans fuseau"""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tz is not None:
+        timestamp = timestamp.tz_localize(None)
+    return timestamp.normalize()
+
+
+_default_store: Optional[PriceStore] = None
+
+
+def get_default_store() -> PriceStore:
+    """
+    Store partagé par le processus
+    
+    Returns:
+        Instance de PriceStore
+    """
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore()
+    return _default_store
@@ -0,0 +1,636 @@
+"""
+Market Data Providers
+Interface commune des sources de données de marché: Yahoo Finance, fixtures
+locales (CSV/Parquet) et enregistrement/rejeu, avec injection de latence
+"""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .upstream import UpstreamClient, get_upstream
+
+
+# Backends disponibles (sélection par la variable MARKET_DATA_PROVIDER)
+PROVIDER_NAMES = ('yfinance', 'fixture', 'record', 'replay')
+
+# Répertoires par défaut des fixtures et des enregistrements
+DEFAULT_FIXTURE_DIR = os.path.join('data', 'fixtures')
+DEFAULT_RECORDING_DIR = os.path.join('data', 'recordings')
+
+# Durées calendaires approchées des périodes yfinance ('5d', '1mo', '1y', ...)
+PERIOD_UNITS = {'d': 1, 'wk': 7, 'mo': 31, 'y': 366}
+
+
+class MarketDataProvider(ABC):
+    """
+    Source de données de marché
+    
+    Les sous-classes implémentent _history, _info et les chaînes d'options
+    (_option_expiries, _option_chain), méthodes abstraites; la latence injectée
+    (moyenne et dispersion en millisecondes, tirage reproductible) est
+    appliquée à chaque appel, ce qui permet des tests de charge et des
+    benchmarks déterministes sans accès réseau.
+    """
+    
+    name = 'base'
+    
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Initialise le provider
+        
+        Args:
+            latency_ms: Latence moyenne injectée par appel (millisecondes)
+            jitter_ms: Écart-type de la latence injectée (millisecondes)
+            seed: Graine du tirage de latence
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+    
+    def _before_call(self, method: str):
+        """Compte l'appel et applique la latence injectée"""
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            delay = self.latency_ms
+            if self.jitter_ms > 0:
+                delay = max(delay + self._rng.normal(0.0, self.jitter_ms), 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+    
+    def history(self, ticker: str, start=None, end=None, period: Optional[str] = None,
+                interval: str = '1d') -> pd.DataFrame:
+        """
+        Barres OHLCV ajustées d'un ticker
+        
+        Args:
+            ticker: Symbole du ticker
+            start: Date de début incluse (ou None avec period)
+            end: Date de fin exclue
+            period: Période relative à la dernière barre (ex: '5d', '1mo')
+            interval: Fréquence des barres (ex: '1d', '5m')
+        
+        Returns:
+            DataFrame OHLCV indexé par horodatage (vide si aucune donnée)
+        """
+        self._before_call('history')
+        return self._history(ticker, start, end, period, interval)
+    
+    def download(self, tickers: List[str], start, end,
+                 interval: str = '1d') -> Dict[str, pd.DataFrame]:
+        """
+        Barres OHLCV ajustées de plusieurs tickers sur [start, end)
+        
+        Args:
+            tickers: Liste de symboles
+            start: Date de début incluse
+            end: Date de fin exclue
+            interval: Fréquence des barres
+        
+        Returns:
+            Dictionnaire ticker -> DataFrame (tickers sans données omis)
+        """
+        self._before_call('download')
+        return self._download(tickers, start, end, interval)
+    
+    def info(self, ticker: str) -> Dict:
+        """
+        Fiche descriptive d'un ticker (nom, secteur, capitalisation, ...)
+        
+        Args:
+            ticker: Symbole du ticker
+        
+        Returns:
+            Dictionnaire au format yfinance
+        """
+        self._before_call('info')
+        return self._info(ticker)
+    
+    def option_expiries(self, ticker: str) -> List[str]:
+        """
+        Échéances d'options cotées d'un ticker
+        
+        Args:
+            ticker: Symbole du ticker
+        
+        Returns:
+            Liste de dates d'échéance 'YYYY-MM-DD' triées
+        """
+        self._before_call('option_expiries')
+        return self._option_expiries(ticker)
+    
+    def option_chain(self, ticker: str, expiry: str) -> pd.DataFrame:
+        """
+        Chaîne d'options d'une échéance (calls et puts)
+        
+        Args:
+            ticker: Symbole du ticker
+            expiry: Date d'échéance 'YYYY-MM-DD'
+        
+        Returns:
+            DataFrame au format yfinance (strike, bid, ask, lastPrice, volume,
+            openInterest, impliedVolatility, ...) avec une colonne option_type
+            ('call' ou 'put')
+        """
+        self._before_call('option_chain')
+        return self._option_chain(ticker, expiry)
+    
+    @abstractmethod
+    def _history(self, ticker, start, end, period, interval) -> pd.DataFrame:
+        raise NotImplementedError
+    
+    def _download(self, tickers, start, end, interval) -> Dict[str, pd.DataFrame]:
+        """Par défaut, un appel history par ticker"""
+        frames = {}
+        for ticker in tickers:
+            frame = self._history(ticker, start, end, None, interval)
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+    
+    @abstractmethod
+    def _info(self, ticker: str) -> Dict:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def _option_expiries(self, ticker: str) -> List[str]:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def _option_chain(self, ticker: str, expiry: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Données Yahoo Finance via yfinance (prix ajustés des splits et dividendes)
+    
+    Tous les appels passent par le client d'accès amont (limitation de
+    débit, délais bornés, relances et disjoncteur, voir utils.upstream).
+    """
+    
+    name = 'yfinance'
+    
+    def __init__(self, client: Optional[UpstreamClient] = None, **kwargs):
+        """
+        Initialise le provider
+        
+        Args:
+            client: Client d'accès amont (défaut: client partagé du processus)
+            **kwargs: Paramètres de MarketDataProvider (latency_ms, ...)
+        """
+        super().__init__(**kwargs)
+        self.client = client or get_upstream()
+    
+    def _ticker(self, ticker: str) -> yf.Ticker:
+        """Objet yfinance utilisant la session HTTP du client amont"""
+        return yf.Ticker(ticker, session=self.client.session)
+    
+    def _history(self, ticker, start, end, period, interval) -> pd.DataFrame:
+        timeout = self.client.timeout
+        if period is not None:
+            return self.client.call(lambda: self._ticker(ticker).history(
+                period=period, interval=interval, auto_adjust=True, timeout=timeout))
+        return self.client.call(lambda: self._ticker(ticker).history(
+            start=_date_string(start), end=_date_string(end), interval=interval,
+            auto_adjust=True, timeout=timeout))
+    
+    def _download(self, tickers, start, end, interval) -> Dict[str, pd.DataFrame]:
+        history = self.client.call(lambda: yf.download(
+            tickers, start=_date_string(start), end=_date_string(end), interval=interval,
+            auto_adjust=True, actions=True, group_by='ticker', threads=True, progress=False,
+            timeout=self.client.timeout, session=self.client.session))
+        if history is None or history.empty:
+            return {}
+        
+        frames = {}
+        for ticker in tickers:
+            if isinstance(history.columns, pd.MultiIndex):
+                if ticker not in history.columns.get_level_values(0):
+                    continue
+                frame = history[ticker]
+            else:
+                frame = history
+            frames[ticker] = frame.dropna(how='all')
+        return frames
+    
+    def _info(self, ticker: str) -> Dict:
+        return self.client.call(lambda: self._ticker(ticker).info)
+    
+    def _option_expiries(self, ticker: str) -> List[str]:
+        return sorted(self.client.call(lambda: self._ticker(ticker).options))
+    
+    def _option_chain(self, ticker: str, expiry: str) -> pd.DataFrame:
+        chain = self.client.call(lambda: self._ticker(ticker).option_chain(expiry))
+        return pd.concat([chain.calls.assign(option_type='call'),
+                          chain.puts.assign(option_type='put')], ignore_index=True)
+
+
+class FixtureProvider(MarketDataProvider):
+    """
+    Données lues depuis un répertoire de fixtures, sans accès réseau
+    
+    Organisation: <root>/<TICKER>/<interval>.parquet ou .csv (horodatage en
+    première colonne, heure locale sans fuseau, colonnes OHLCV),
+    <root>/<TICKER>/info.json pour la fiche descriptive et
+    <root>/<TICKER>/options/<YYYY-MM-DD>.csv pour les chaînes d'options.
+    """
+    
+    name = 'fixture'
+    
+    def __init__(self, root: Optional[str] = None, **kwargs):
+        """
+        Initialise le provider
+        
+        Args:
+            root: Répertoire des fixtures (défaut: $MARKET_DATA_DIR ou data/fixtures)
+            **kwargs: Paramètres de latence (voir MarketDataProvider)
+        """
+        super().__init__(**kwargs)
+        self.root = root or os.environ.get('MARKET_DATA_DIR', DEFAULT_FIXTURE_DIR)
+        self._frames: Dict[str, pd.DataFrame] = {}
+    
+    def _load(self, ticker: str, interval: str) -> pd.DataFrame:
+        """Fichier de barres d'un ticker, lu une seule fois"""
+        key = f"{_file_key(ticker)}/{interval}"
+        with self._lock:
+            if key not in self._frames:
+                path = os.path.join(self.root, key)
+                if os.path.exists(path + '.parquet'):
+                    frame = pd.read_parquet(path + '.parquet')
+                elif os.path.exists(path + '.csv'):
+                    frame = read_frame(path + '.csv')
+                else:
+                    frame = pd.DataFrame(index=pd.DatetimeIndex([]))
+                self._frames[key] = frame.sort_index()
+            return self._frames[key]
+    
+    def _history(self, ticker, start, end, period, interval) -> pd.DataFrame:
+        return _slice_history(self._load(ticker, interval), start, end, period)
+    
+    def _info(self, ticker: str) -> Dict:
+        path = os.path.join(self.root, _file_key(ticker), 'info.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _option_expiries(self, ticker: str) -> List[str]:
+        directory = os.path.join(self.root, _file_key(ticker), 'options')
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith('.csv'))
+    
+    def _option_chain(self, ticker: str, expiry: str) -> pd.DataFrame:
+        path = os.path.join(self.root, _file_key(ticker), 'options', f"{expiry}.csv")
+        if not os.path.exists(path):
+            raise ValueError(f"Aucune chaîne d'options pour {ticker} à l'échéance {expiry}")
+        return pd.read_csv(path)
+
+
+class RecordReplayProvider(MarketDataProvider):
+    """
+    Enregistrement des réponses d'un provider réel, puis rejeu hors ligne
+    
+    Les barres sont enregistrées par ticker et par fréquence, au format des
+    fixtures (<root>/<TICKER>/<interval>.csv), avec la liste des plages
+    demandées: un rejeu sert la tranche [start, end) ou la période demandée
+    quel que soit le jour où il est exécuté, même si les bornes ont été
+    calculées à partir de la date du jour. Les autres appels sont
+    identifiés par leur méthode et leurs arguments. En mode 'record' la
+    réponse du provider amont est écrite sur disque, en mode 'replay' elle
+    est relue (erreur si absente), en mode 'auto' elle est relue si la
+    requête est couverte par l'enregistrement et enregistrée sinon.
+    """
+    
+    name = 'replay'
+    MODES = ('record', 'replay', 'auto')
+    
+    def __init__(self, root: Optional[str] = None,
+                 upstream: Optional[MarketDataProvider] = None,
+                 mode: str = 'replay', **kwargs):
+        """
+        Initialise le provider
+        
+        Args:
+            root: Répertoire des enregistrements (défaut: $MARKET_DATA_RECORDING_DIR
+                ou data/recordings)
+            upstream: Provider interrogé en enregistrement (défaut: yfinance)
+            mode: 'record', 'replay' ou 'auto'
+            **kwargs: Paramètres de latence (voir MarketDataProvider)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode inconnu: {mode} (disponibles: {', '.join(self.MODES)})")
+        super().__init__(**kwargs)
+        self.root = root or os.environ.get('MARKET_DATA_RECORDING_DIR', DEFAULT_RECORDING_DIR)
+        self.upstream = upstream
+        self.mode = mode
+    
+    def _upstream(self) -> MarketDataProvider:
+        if self.upstream is None:
+            self.upstream = YFinanceProvider()
+        return self.upstream
+    
+    def _path(self, method: str, ticker: str, *args) -> str:
+        """Chemin de l'enregistrement d'un appel"""
+        digest = hashlib.sha1(repr((method, ticker.upper()) + args).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.root, _file_key(ticker), f"{method}_{digest}")
+    
+    def _replay_or_record(self, path: str, extension: str, fetch, read, write):
+        """Relit un enregistrement ou interroge le provider amont selon le mode"""
+        path = path + extension
+        if self.mode != 'record' and os.path.exists(path):
+            return read(path)
+        if self.mode == 'replay':
+            raise ValueError(f"Aucun enregistrement pour cet appel ({path})")
+        
+        result = fetch()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        write(result, tmp_path)
+        os.replace(tmp_path, path)
+        return result
+    
+    def _bars_path(self, ticker: str, interval: str) -> str:
+        """Fichier des barres enregistrées d'un ticker (format des fixtures)"""
+        return os.path.join(self.root, _file_key(ticker), f"{interval}.csv")
+    
+    def _is_recorded(self, path: str, start, end, period: Optional[str]) -> bool:
+        """
+        Indique si une requête de barres est couverte par l'enregistrement
+        
+        Une période relative est rapportée à la dernière barre enregistrée
+        (comme au rejeu): elle est couverte si la plage de dates qu'elle
+        représente l'est.
+        """
+        if not os.path.exists(path):
+            return False
+        if period is not None:
+            bars = read_frame(path)
+            if bars.empty:
+                return False
+            last = bars.index[-1].normalize()
+            start, end = _period_start(last, period), last + pd.Timedelta(days=1)
+        ranges = _read_json(path + '.json') if os.path.exists(path + '.json') else []
+        start = _date_string(start)
+        end = _date_string(end)
+        return any(
+            (recorded_start is None or (start is not None and recorded_start <= start)) and
+            (recorded_end is None or (end is not None and end <= recorded_end))
+            for recorded_start, recorded_end in ranges
+        )
+    
+    def _record_bars(self, path: str, frame: pd.DataFrame, start, end, period: Optional[str]):
+        """Fusionne des barres téléchargées dans l'enregistrement et note la plage demandée"""
+        with self._lock:
+            if os.path.exists(path):
+                frame = pd.concat([read_frame(path), frame])
+                frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_frame(frame, path + '.tmp')
+            os.replace(path + '.tmp', path)
+            
+            if period is not None:
+                if frame.empty:
+                    return
+                # Période relative: plage qu'elle représente à la date de la dernière barre
+                last = frame.index[-1].normalize()
+                start, end = _period_start(last, period), last + pd.Timedelta(days=1)
+            ranges = _read_json(path + '.json') if os.path.exists(path + '.json') else []
+            _write_json(_merge_ranges(ranges + [[_date_string(start), _date_string(end)]]), path + '.json')
+    
+    def _history(self, ticker, start, end, period, interval) -> pd.DataFrame:
+        path = self._bars_path(ticker, interval)
+        if self.mode == 'replay' or (self.mode == 'auto' and self._is_recorded(path, start, end, period)):
+            if not os.path.exists(path):
+                raise ValueError(f"Aucun enregistrement pour cet appel ({path})")
+            return _slice_history(read_frame(path), start, end, period)
+        
+        frame = _naive_local(self._upstream().history(ticker, start, end, period, interval))
+        self._record_bars(path, frame, start, end, period)
+        return frame
+    
+    def _download(self, tickers, start, end, interval) -> Dict[str, pd.DataFrame]:
+        # Enregistrement par ticker: un rejeu peut regrouper les tickers différemment
+        paths = {ticker: self._bars_path(ticker, interval) for ticker in tickers}
+        if self.mode != 'replay':
+            pending = [ticker for ticker in tickers
+                       if self.mode == 'record' or not self._is_recorded(paths[ticker], start, end, None)]
+            if pending:
+                fetched = self._upstream().download(pending, start, end, interval)
+                for ticker in pending:
+                    self._record_bars(paths[ticker], _naive_local(fetched.get(ticker)), start, end, None)
+        
+        frames = {}
+        for ticker, path in paths.items():
+            if not os.path.exists(path):
+                raise ValueError(f"Aucun enregistrement pour cet appel ({path})")
+            frame = _slice_history(read_frame(path), start, end, None)
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+    
+    def _info(self, ticker: str) -> Dict:
+        return self._replay_or_record(
+            self._path('info', ticker), '.json',
+            lambda: self._upstream().info(ticker),
+            _read_json, _write_json
+        )
+    
+    def _option_expiries(self, ticker: str) -> List[str]:
+        return self._replay_or_record(
+            self._path('option_expiries', ticker), '.json',
+            lambda: list(self._upstream().option_expiries(ticker)),
+            _read_json, _write_json
+        )
+    
+    def _option_chain(self, ticker: str, expiry: str) -> pd.DataFrame:
+        return self._replay_or_record(
+            self._path('option_chain', ticker, expiry), '.csv',
+            lambda: self._upstream().option_chain(ticker, expiry),
+            pd.read_csv, lambda frame, path: frame.to_csv(path, index=False)
+        )
+
+
+def read_frame(path: str) -> pd.DataFrame:
+    """
+    Lit un fichier CSV de barres (horodatage en première colonne)
+    
+    Args:
+        path: Chemin du fichier
+    
+    Returns:
+        DataFrame indexé par horodatage
+    """
+    frame = pd.read_csv(path, index_col=0)
+    frame.index = pd.DatetimeIndex(pd.to_datetime(frame.index, format='ISO8601'))
+    return frame
+
+
+def write_frame(frame: pd.DataFrame, path: str):
+    """
+    Écrit un DataFrame de barres en CSV (format lu par read_frame)
+    
+    Args:
+        frame: DataFrame indexé par horodatage
+        path: Chemin du fichier
+    """
+    frame.to_csv(path, index_label='timestamp')
+
+
+def _read_json(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(data: Dict, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, default=str)
+
+
+def _naive_local(frame: pd.DataFrame) -> pd.DataFrame:
+    """Retire le fuseau horaire en conservant l'heure locale de la place"""
+    if frame is None:
+        return pd.DataFrame(index=pd.DatetimeIndex([]))
+    frame = frame.copy()
+    index = pd.DatetimeIndex(frame.index)
+    frame.index = index.tz_localize(None) if index.tz is not None else index
+    return frame
+
+
+def _slice_history(frame: pd.DataFrame, start, end, period: Optional[str]) -> pd.DataFrame:
+    """Barres d'un historique complet sur [start, end) ou sur une période yfinance"""
+    if frame.empty:
+        return frame.copy()
+    if period is not None:
+        return _period_slice(frame, period)
+    
+    mask = np.ones(len(frame), dtype=bool)
+    if start is not None:
+        mask &= frame.index >= pd.Timestamp(start)
+    if end is not None:
+        mask &= frame.index < pd.Timestamp(end)
+    return frame[mask].copy()
+
+
+def _merge_ranges(ranges: List[List[Optional[str]]]) -> List[List[Optional[str]]]:
+    """Fusionne des plages de dates [début, fin) qui se chevauchent ou se touchent (None = non borné)"""
+    merged: List[List[Optional[str]]] = []
+    for start, end in sorted(ranges, key=lambda r: r[0] or ''):
+        if merged and (merged[-1][1] is None or start is None or start <= merged[-1][1]):
+            if merged[-1][1] is not None and (end is None or end > merged[-1][1]):
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _period_slice(frame: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Dernières barres couvrant une période yfinance ('5d' = 5 séances, '1mo', 'max')"""
+    if period == 'max':
+        return frame.copy()
+    match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period)
+    if match is None:
+        raise ValueError(f"Période non reconnue: {period}")
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == 'd':
+        days = frame.index.normalize().unique()[-count:]
+        return frame[frame.index.normalize().isin(days)].copy()
+    start = frame.index[-1] - pd.Timedelta(days=count * PERIOD_UNITS[unit])
+    return frame[frame.index > start].copy()
+
+
+def _period_start(last: pd.Timestamp, period: str) -> Optional[pd.Timestamp]:
+    """Première date couverte par une période yfinance se terminant à last (None pour 'max')"""
+    if period == 'max':
+        return None
+    match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period)
+    if match is None:
+        raise ValueError(f"Période non reconnue: {period}")
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == 'd':
+        return pd.Timestamp(np.busday_offset(last.date(), -(count - 1), roll='backward'))
+    return (last - pd.Timedelta(days=count * PERIOD_UNITS[unit])).normalize()
+
+
+def _date_string(value) -> Optional[str]:
+    """Date au format attendu par yfinance"""
+    if value is None:
+        return None
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def _file_key(ticker: str) -> str:
+    """Nom de répertoire associé à un ticker"""
+    return re.sub(r'[^A-Za-z0-9._^=-]', '_', ticker.upper())
+
+
+def create_provider(name: Optional[str] = None, **kwargs) -> MarketDataProvider:
+    """
+    Construit un provider à partir de son nom
+    
+    La configuration par défaut est lue dans l'environnement:
+    MARKET_DATA_PROVIDER (yfinance, fixture, record, replay),
+    MARKET_DATA_DIR (fixtures), MARKET_DATA_RECORDING_DIR (enregistrements),
+    MARKET_DATA_LATENCY_MS et MARKET_DATA_JITTER_MS.
+    
+    Args:
+        name: Nom du backend (défaut: $MARKET_DATA_PROVIDER ou 'yfinance')
+        **kwargs: Paramètres du backend (root, upstream, latency_ms, ...)
+    
+    Returns:
+        Instance de MarketDataProvider
+    """
+    name = name or os.environ.get('MARKET_DATA_PROVIDER', 'yfinance')
+    kwargs.setdefault('latency_ms', float(os.environ.get('MARKET_DATA_LATENCY_MS', 0)))
+    kwargs.setdefault('jitter_ms', float(os.environ.get('MARKET_DATA_JITTER_MS', 0)))
+    
+    if name == 'yfinance':
+        return YFinanceProvider(**kwargs)
+    if name == 'fixture':
+        return FixtureProvider(**kwargs)
+    if name in ('record', 'replay'):
+        return RecordReplayProvider(mode=kwargs.pop('mode', name), **kwargs)
+    raise ValueError(f"Provider inconnu: {name} (disponibles: {', '.join(PROVIDER_NAMES)})")
+
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    """
+    Provider partagé par le processus
+    
+    Returns:
+        Instance de MarketDataProvider (configurée par l'environnement)
+    """
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = create_provider()
+        return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]):
+    """
+    Remplace le provider partagé (None = reconstruction depuis l'environnement)
+    
+    Args:
+        provider: Instance de MarketDataProvider
+    """
+    global _provider
+    with _provider_lock:
+        _provider = provider
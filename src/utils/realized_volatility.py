@@ -0,0 +1,326 @@
+"""
+Realized Volatility Estimators
+Estimateurs de volatilité réalisée (close-to-close, Parkinson, Garman-Klass,
+Rogers-Satchell, Yang-Zhang) calculés en O(n) par fenêtre via sommes cumulées
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Nombre de séances par an pour l'annualisation
+TRADING_DAYS = 252
+
+# Estimateurs disponibles et colonnes OHLC requises
+ESTIMATORS = {
+    'close_to_close': ('Close',),
+    'parkinson': ('High', 'Low'),
+    'garman_klass': ('Open', 'High', 'Low', 'Close'),
+    'rogers_satchell': ('Open', 'High', 'Low', 'Close'),
+    'yang_zhang': ('Open', 'High', 'Low', 'Close'),
+}
+
+# Nombre maximal de séries conservées en cache
+CACHE_SIZE = 512
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sommes glissantes et nombre de valeurs valides sur une fenêtre, en O(n)
+    
+    Les NaN sont ignorés (comptés comme absents). Une matrice est traitée
+    colonne par colonne (fenêtre le long des lignes).
+    
+    Args:
+        values: Série de valeurs, ou matrice (séances x tickers)
+        window: Taille de la fenêtre
+    
+    Returns:
+        Tuple (sommes glissantes, nombre de valeurs valides)
+    """
+    valid = ~np.isnan(values)
+    origin = np.zeros((1,) + values.shape[1:])
+    cumsum = np.concatenate((origin, np.cumsum(np.where(valid, values, 0.0), axis=0)))
+    cumcount = np.concatenate((origin.astype(np.int64), np.cumsum(valid, axis=0)))
+    
+    sums = np.full(values.shape, np.nan)
+    counts = np.zeros(values.shape, dtype=np.int64)
+    if window <= len(values):
+        sums[window - 1:] = cumsum[window:] - cumsum[:-window]
+        counts[window - 1:] = cumcount[window:] - cumcount[:-window]
+    return sums, counts
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Moyenne glissante (NaN si la fenêtre n'est pas complète)"""
+    sums, counts = _rolling_sum(values, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts == window, sums / window, np.nan)
+
+
+def _rolling_variance(values: np.ndarray, window: int) -> np.ndarray:
+    """Variance glissante échantillon (ddof=1) à partir des sommes et sommes de carrés"""
+    sums, counts = _rolling_sum(values, window)
+    squares, _ = _rolling_sum(values**2, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (squares - sums**2 / window) / (window - 1)
+    return np.where(counts == window, np.maximum(variance, 0.0), np.nan)
+
+
+def _log_prices(data: pd.DataFrame, estimator: str) -> Dict[str, np.ndarray]:
+    """Logarithmes des colonnes OHLC requises par un estimateur"""
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"Estimateur inconnu: {estimator} (disponibles: {', '.join(ESTIMATORS)})")
+    
+    missing = [column for column in ESTIMATORS[estimator] if column not in data]
+    if missing:
+        raise ValueError(f"L'estimateur {estimator} requiert les colonnes {', '.join(missing)}")
+    
+    return {column: np.log(data[column].to_numpy(dtype=float)) for column in ESTIMATORS[estimator]}
+
+
+def _daily_variance(prices: Dict[str, np.ndarray], estimator: str, window: int) -> np.ndarray:
+    """
+    Variance journalière glissante d'un estimateur pour une fenêtre
+    
+    Args:
+        prices: Log-prix OHLC
+        estimator: Nom de l'estimateur
+        window: Fenêtre en séances
+    
+    Returns:
+        Array des variances journalières
+    """
+    if estimator == 'close_to_close':
+        returns = np.diff(prices['Close'], prepend=np.nan)
+        return _rolling_variance(returns, window)
+    
+    if estimator == 'parkinson':
+        range_sq = (prices['High'] - prices['Low'])**2
+        return _rolling_mean(range_sq, window) / (4 * np.log(2))
+    
+    if estimator == 'garman_klass':
+        range_sq = (prices['High'] - prices['Low'])**2
+        body_sq = (prices['Close'] - prices['Open'])**2
+        return _rolling_mean(0.5 * range_sq - (2 * np.log(2) - 1) * body_sq, window)
+    
+    rogers_satchell = (
+        (prices['High'] - prices['Close']) * (prices['High'] - prices['Open']) +
+        (prices['Low'] - prices['Close']) * (prices['Low'] - prices['Open'])
+    )
+    if estimator == 'rogers_satchell':
+        return _rolling_mean(rogers_satchell, window)
+    
+    # Yang-Zhang: variance overnight + k * variance open-to-close + (1 - k) * Rogers-Satchell
+    overnight = prices['Open'] - np.concatenate(([np.nan], prices['Close'][:-1]))
+    open_to_close = prices['Close'] - prices['Open']
+    rogers_satchell = np.where(np.isnan(overnight), np.nan, rogers_satchell)
+    open_to_close = np.where(np.isnan(overnight), np.nan, open_to_close)
+    
+    k = 0.34 / (1.34 + (window + 1) / (window - 1))
+    return (
+        _rolling_variance(overnight, window) +
+        k * _rolling_variance(open_to_close, window) +
+        (1 - k) * _rolling_mean(rogers_satchell, window)
+    )
+
+
+def realized_volatility(data: pd.DataFrame,
+                        windows: Union[int, Iterable[int]] = 30,
+                        estimator: str = 'close_to_close') -> pd.DataFrame:
+    """
+    Volatilité réalisée annualisée glissante pour plusieurs fenêtres à la fois
+    
+    Les termes par séance de l'estimateur sont calculés une seule fois, puis
+    chaque fenêtre est obtenue en O(n) par différences de sommes cumulées.
+    
+    Args:
+        data: DataFrame OHLC indexé par date
+        windows: Fenêtre ou liste de fenêtres en séances
+        estimator: Nom de l'estimateur (voir ESTIMATORS)
+    
+    Returns:
+        DataFrame avec une colonne de volatilités annualisées par fenêtre
+    """
+    windows = [windows] if isinstance(windows, (int, np.integer)) else list(windows)
+    if any(window < 2 for window in windows):
+        raise ValueError("La fenêtre doit contenir au moins 2 séances")
+    
+    prices = _log_prices(data, estimator)
+    return pd.DataFrame({
+        window: np.sqrt(_daily_variance(prices, estimator, window) * TRADING_DAYS)
+        for window in windows
+    }, index=data.index)
+
+
+def sample_volatility(data: pd.DataFrame, estimator: str = 'close_to_close') -> float:
+    """
+    Volatilité réalisée annualisée sur tout l'échantillon
+    
+    Args:
+        data: DataFrame OHLC indexé par date
+        estimator: Nom de l'estimateur
+    
+    Returns:
+        La volatilité annualisée (en décimal)
+    """
+    # Les estimateurs utilisant la clôture précédente perdent la première séance
+    window = len(data) - 1 if estimator in ('close_to_close', 'yang_zhang') else len(data)
+    return float(realized_volatility(data, window, estimator).iloc[-1, 0])
+
+
+def _column_variance(values: np.ndarray, mean_only: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Variance échantillon (ddof=1) ou moyenne par colonne, NaN ignorés
+    
+    Args:
+        values: Array (séances x tickers)
+        mean_only: Retourner la moyenne plutôt que la variance
+    
+    Returns:
+        Tuple (statistique par colonne, nombre de valeurs valides)
+    """
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+    sums = np.where(valid, values, 0.0).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / counts
+        if mean_only:
+            return mean, counts
+        squares = np.where(valid, values**2, 0.0).sum(axis=0)
+        variance = (squares - sums * mean) / (counts - 1)
+    return np.maximum(variance, 0.0), counts
+
+
+def sample_volatility_panel(prices: pd.DataFrame, estimator: str = 'close_to_close',
+                            min_observations: int = 30) -> pd.Series:
+    """
+    Volatilité réalisée annualisée sur tout l'échantillon, pour chaque ticker d'un panel
+    
+    Équivalent vectorisé de sample_volatility: chaque ticker utilise ses
+    propres séances (les NaN d'un ticker absent du marché ce jour-là sont
+    ignorés, le rendement suivant est calculé depuis sa dernière cotation).
+    
+    Args:
+        prices: DataFrame (dates x (champ, ticker)) avec colonnes MultiIndex OHLC
+        estimator: Nom de l'estimateur
+        min_observations: Nombre minimal de séances (NaN en deçà)
+    
+    Returns:
+        Série des volatilités annualisées indexée par ticker
+    """
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"Estimateur inconnu: {estimator} (disponibles: {', '.join(ESTIMATORS)})")
+    missing = [column for column in ESTIMATORS[estimator] if column not in prices.columns.get_level_values(0)]
+    if missing:
+        raise ValueError(f"L'estimateur {estimator} requiert les colonnes {', '.join(missing)}")
+    
+    tickers = prices['Close'].columns if 'Close' in prices else prices[ESTIMATORS[estimator][0]].columns
+    log = {column: np.log(prices[column][tickers].to_numpy(dtype=float)) for column in ESTIMATORS[estimator]}
+    
+    if estimator == 'parkinson':
+        variance, counts = _column_variance((log['High'] - log['Low'])**2 / (4 * np.log(2)), mean_only=True)
+    elif estimator == 'garman_klass':
+        range_sq = (log['High'] - log['Low'])**2
+        body_sq = (log['Close'] - log['Open'])**2
+        variance, counts = _column_variance(0.5 * range_sq - (2 * np.log(2) - 1) * body_sq, mean_only=True)
+    else:
+        # Clôture précédente de chaque ticker (dernière cotation disponible)
+        previous_close = pd.DataFrame(log['Close']).ffill().shift(1).to_numpy()
+        if estimator == 'close_to_close':
+            variance, counts = _column_variance(log['Close'] - previous_close)
+        else:
+            rogers_satchell = (
+                (log['High'] - log['Close']) * (log['High'] - log['Open']) +
+                (log['Low'] - log['Close']) * (log['Low'] - log['Open'])
+            )
+            if estimator == 'rogers_satchell':
+                variance, counts = _column_variance(rogers_satchell, mean_only=True)
+            else:
+                overnight = log['Open'] - previous_close
+                valid = ~np.isnan(overnight)
+                overnight_variance, counts = _column_variance(overnight)
+                open_to_close_variance, _ = _column_variance(np.where(valid, log['Close'] - log['Open'], np.nan))
+                rogers_satchell_mean, _ = _column_variance(np.where(valid, rogers_satchell, np.nan), mean_only=True)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    k = 0.34 / (1.34 + (counts + 1) / (counts - 1))
+                variance = overnight_variance + k * open_to_close_variance + (1 - k) * rogers_satchell_mean
+    
+    volatility = np.sqrt(variance * TRADING_DAYS)
+    return pd.Series(np.where(counts >= min_observations, volatility, np.nan),
+                     index=pd.Index(tickers, name='ticker'), name='volatility')
+
+
+def rolling_volatility_panel(close: pd.DataFrame, window: int = 30) -> pd.DataFrame:
+    """
+    Volatilité close-to-close glissante annualisée de tous les tickers d'un panel
+    
+    Équivalent vectorisé de realized_volatility(..., 'close_to_close') appliqué
+    à chaque colonne: la fenêtre glisse sur toute la matrice des clôtures en
+    un seul calcul.
+    
+    Args:
+        close: DataFrame des clôtures (dates x tickers)
+        window: Taille de la fenêtre en séances
+    
+    Returns:
+        DataFrame des volatilités annualisées (mêmes index et colonnes)
+    """
+    returns = np.diff(np.log(close.to_numpy(dtype=float)), axis=0, prepend=np.nan)
+    return pd.DataFrame(np.sqrt(_rolling_variance(returns, window) * TRADING_DAYS),
+                        index=close.index, columns=close.columns)
+
+
+_cache: 'OrderedDict[Tuple, Tuple[Tuple, pd.Series]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_realized_volatility(ticker: str, data: pd.DataFrame, window: int = 30,
+                            estimator: str = 'close_to_close') -> pd.Series:
+    """
+    Volatilité réalisée glissante avec cache par (ticker, fenêtre, estimateur)
+    
+    Le cache est invalidé dès que les données changent: la signature est
+    une empreinte des dates et de toutes les colonnes utilisées par
+    l'estimateur (une correction au milieu de l'historique est détectée).
+    
+    Args:
+        ticker: Symbole du ticker
+        data: DataFrame OHLC indexé par date
+        window: Fenêtre en séances
+        estimator: Nom de l'estimateur
+    
+    Returns:
+        Série des volatilités annualisées
+    """
+    columns = [column for column in ESTIMATORS.get(estimator, ('Close',)) if column in data]
+    signature = (
+        len(data),
+        hash(pd.DatetimeIndex(data.index).as_unit('ns').asi8.tobytes()),
+        hash(data[columns].to_numpy(dtype=float).tobytes())
+    )
+    key = (ticker.upper(), int(window), estimator)
+    
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == signature:
+            _cache.move_to_end(key)
+            return cached[1]
+    
+    series = realized_volatility(data, window, estimator)[window]
+    with _cache_lock:
+        _cache[key] = (signature, series)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return series
+
+
+def clear_cache():
+    """Vide le cache des volatilités réalisées"""
+    with _cache_lock:
+        _cache.clear()
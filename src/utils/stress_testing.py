@@ -0,0 +1,164 @@
+"""
+Stress Testing
+Revalorisation des positions sous scénarios de stress historiques
+(choc de spot, choc de volatilité, temps écoulé)
+"""
+
+import itertools
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .historical_var import position_legs, revalue_legs
+
+
+# Colonnes d'un scénario
+SCENARIO_COLUMNS = ['spot_shock', 'vol_shock', 'days_elapsed']
+
+# Bibliothèque de scénarios inspirés d'épisodes historiques (ordres de grandeur
+# sur indice large): choc de spot en rendement simple, choc de volatilité en
+# points absolus, jours calendaires écoulés
+SCENARIO_LIBRARY: Dict[str, Dict] = {
+    'black_monday_1987': {
+        'spot_shock': -0.205, 'vol_shock': 0.50, 'days_elapsed': 1,
+        'description': "Krach du 19 octobre 1987"
+    },
+    'lehman_2008': {
+        'spot_shock': -0.088, 'vol_shock': 0.15, 'days_elapsed': 1,
+        'description': "Rejet du plan TARP, 29 septembre 2008"
+    },
+    'october_2008': {
+        'spot_shock': -0.169, 'vol_shock': 0.40, 'days_elapsed': 30,
+        'description': "Mois d'octobre 2008"
+    },
+    'relief_rally_2008': {
+        'spot_shock': 0.116, 'vol_shock': -0.15, 'days_elapsed': 1,
+        'description': "Rebond du 13 octobre 2008"
+    },
+    'flash_crash_2010': {
+        'spot_shock': -0.032, 'vol_shock': 0.10, 'days_elapsed': 1,
+        'description': "Flash crash du 6 mai 2010"
+    },
+    'volmageddon_2018': {
+        'spot_shock': -0.041, 'vol_shock': 0.20, 'days_elapsed': 1,
+        'description': "Explosion de la volatilité, 5 février 2018"
+    },
+    'covid_crash_2020': {
+        'spot_shock': -0.120, 'vol_shock': 0.30, 'days_elapsed': 1,
+        'description': "Séance du 16 mars 2020"
+    },
+    'covid_month_2020': {
+        'spot_shock': -0.340, 'vol_shock': 0.55, 'days_elapsed': 33,
+        'description': "Du 19 février au 23 mars 2020"
+    },
+    'vol_crush': {
+        'spot_shock': 0.0, 'vol_shock': -0.10, 'days_elapsed': 1,
+        'description': "Effondrement de la volatilité implicite (après résultats)"
+    },
+    'calm_month': {
+        'spot_shock': 0.02, 'vol_shock': -0.05, 'days_elapsed': 30,
+        'description': "Mois calme: faible dérive et baisse de volatilité"
+    },
+}
+
+
+def scenario_table(scenarios: Optional[Union[Iterable[str], Dict[str, Dict], pd.DataFrame]] = None) -> pd.DataFrame:
+    """
+    Normalise un ensemble de scénarios en DataFrame indexé par nom
+    
+    Args:
+        scenarios: None (toute la bibliothèque), liste de noms de la
+            bibliothèque, dictionnaire nom -> paramètres, ou DataFrame
+    
+    Returns:
+        DataFrame des scénarios (spot_shock, vol_shock, days_elapsed)
+    """
+    if scenarios is None:
+        scenarios = SCENARIO_LIBRARY
+    if isinstance(scenarios, pd.DataFrame):
+        table = scenarios.copy()
+    elif isinstance(scenarios, dict):
+        table = pd.DataFrame.from_dict(scenarios, orient='index')
+    else:
+        names = list(scenarios)
+        unknown = [name for name in names if name not in SCENARIO_LIBRARY]
+        if unknown:
+            raise ValueError(f"Scénarios inconnus: {', '.join(unknown)}")
+        table = pd.DataFrame.from_dict({name: SCENARIO_LIBRARY[name] for name in names}, orient='index')
+    
+    for column in SCENARIO_COLUMNS:
+        if column not in table:
+            table[column] = 0.0
+    if (table['spot_shock'] <= -1).any():
+        raise ValueError("Un choc de spot doit être supérieur à -100%")
+    return table
+
+
+def scenario_grid(spot_shocks: Iterable[float],
+                  vol_shocks: Iterable[float] = (0.0,),
+                  days_elapsed: Iterable[float] = (0,)) -> pd.DataFrame:
+    """
+    Grille de scénarios choc de spot x choc de volatilité x temps écoulé
+    
+    Args:
+        spot_shocks: Chocs de spot (rendements simples, ex: -0.2)
+        vol_shocks: Chocs de volatilité en points absolus (ex: 0.1)
+        days_elapsed: Jours calendaires écoulés
+    
+    Returns:
+        DataFrame des scénarios
+    """
+    rows = list(itertools.product(spot_shocks, vol_shocks, days_elapsed))
+    names = [f"spot{spot:+.1%}_vol{vol * 100:+.0f}pts_{days:g}j" for spot, vol, days in rows]
+    return pd.DataFrame(rows, columns=SCENARIO_COLUMNS, index=names)
+
+
+def run_stress_test(positions,
+                    scenarios: Optional[Union[Iterable[str], Dict[str, Dict], pd.DataFrame]] = None) -> Dict:
+    """
+    Revalorise un book de positions sous chaque scénario de stress
+    
+    Toutes les jambes sont repricées par Black-Scholes en un seul calcul
+    (scénarios x jambes), puis agrégées par position.
+    
+    Args:
+        positions: Stratégie, liste de stratégies, de tuples (stratégie, nombre)
+            ou dictionnaire nom -> stratégie
+        scenarios: Scénarios (voir scenario_table; None = bibliothèque complète)
+    
+    Returns:
+        P&L par scénario et par position, et synthèse par scénario
+    """
+    table = scenario_table(scenarios)
+    legs = position_legs(positions)
+    
+    base_values = revalue_legs(legs, by_position=True)
+    stressed_values = revalue_legs(
+        legs,
+        1 + table['spot_shock'].to_numpy(dtype=float),
+        table['vol_shock'].to_numpy(dtype=float),
+        table['days_elapsed'].to_numpy(dtype=float),
+        by_position=True
+    )
+    pnl = pd.DataFrame(stressed_values - base_values, index=table.index, columns=legs['names'])
+    
+    book_value = float(base_values.sum())
+    book_pnl = pnl.sum(axis=1)
+    summary = table[SCENARIO_COLUMNS].copy()
+    summary['book_pnl'] = book_pnl
+    summary['book_pnl_pct'] = book_pnl / abs(book_value) * 100 if book_value != 0 else np.nan
+    summary['worst_position'] = pnl.idxmin(axis=1)
+    summary['worst_position_pnl'] = pnl.min(axis=1)
+    summary = summary.sort_values('book_pnl')
+    
+    return {
+        'success': True,
+        'num_scenarios': len(table),
+        'num_positions': len(legs['names']),
+        'book_value': book_value,
+        'position_values': pd.Series(base_values, index=legs['names']),
+        'pnl': pnl,
+        'summary': summary,
+        'worst_scenario': {'name': summary.index[0], **summary.iloc[0].to_dict()}
+    }
@@ -0,0 +1,169 @@
+"""
+Universe Backtesting
+Backtest d'une stratégie d'options sur tout un univers de tickers à la fois
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backtesting import (RISK_FREE_RATE, _expiry_payoff, _price_entries, _trade_statistics,
+                          _trade_statistics_by_column)
+from .price_store import PriceStore, get_default_store
+from .realized_volatility import rolling_volatility_panel
+from .yield_curve import YieldCurve
+
+
+class UniverseBacktester:
+    """Backtesting vectorisé d'une stratégie sur un panel (dates x tickers)"""
+    
+    def __init__(self, tickers: List[str], start_date: str, end_date: str,
+                 store: Optional[PriceStore] = None, volatility_window: int = 30,
+                 yield_curve: Optional[YieldCurve] = None):
+        """
+        Initialise le backtester d'univers et charge le panel de prix
+        
+        Args:
+            tickers: Liste de symboles (ex: composants du S&P 500)
+            start_date: Date de début (format 'YYYY-MM-DD')
+            end_date: Date de fin (format 'YYYY-MM-DD')
+            store: Store local des prix (défaut: store partagé du processus)
+            volatility_window: Fenêtre de la volatilité historique en jours
+            yield_curve: Courbe des taux du pricing (défaut: taux plat RISK_FREE_RATE)
+        """
+        self.tickers = [ticker.upper() for ticker in tickers]
+        self.start_date = start_date
+        self.end_date = end_date
+        self.store = store or get_default_store()
+        self.volatility_window = volatility_window
+        self.yield_curve = yield_curve or YieldCurve.flat(RISK_FREE_RATE)
+        self.prices = None
+        self.volatility = None
+        self.load_data()
+    
+    @classmethod
+    def from_panel(cls, prices: pd.DataFrame, volatility_window: int = 30,
+                   yield_curve: Optional[YieldCurve] = None) -> 'UniverseBacktester':
+        """
+        Crée un backtester d'univers à partir d'un panel de prix déjà chargé
+        
+        Args:
+            prices: DataFrame (dates x tickers) des cours de clôture
+            volatility_window: Fenêtre de la volatilité historique en jours
+            yield_curve: Courbe des taux du pricing (défaut: taux plat RISK_FREE_RATE)
+        
+        Returns:
+            Instance de UniverseBacktester
+        """
+        backtester = cls.__new__(cls)
+        backtester.tickers = list(prices.columns)
+        backtester.start_date = prices.index[0].strftime('%Y-%m-%d') if len(prices) else None
+        backtester.end_date = prices.index[-1].strftime('%Y-%m-%d') if len(prices) else None
+        backtester.store = None
+        backtester.volatility_window = volatility_window
+        backtester.yield_curve = yield_curve or YieldCurve.flat(RISK_FREE_RATE)
+        backtester.prices = prices.astype(float)
+        backtester._prepare_data()
+        return backtester
+    
+    def load_data(self):
+        """Charge le panel des cours de clôture en téléchargements groupés"""
+        self.prices = self.store.get_history_panel(self.tickers, self.start_date, self.end_date)
+        self._prepare_data()
+    
+    def _prepare_data(self):
+        """Retire les tickers sans données et calcule les volatilités de toutes les colonnes"""
+        self.prices = self.prices.dropna(axis=1, how='all')
+        if self.prices.empty:
+            raise ValueError(f"Aucune donnée disponible entre {self.start_date} et {self.end_date}")
+        
+        self.tickers = list(self.prices.columns)
+        # Même estimateur que Backtester, sur toute la matrice des clôtures
+        self.volatility = rolling_volatility_panel(self.prices, self.volatility_window)
+    
+    def backtest_strategy(self, strategy_class,
+                          holding_period_days: int = 30,
+                          rebalance_frequency_days: int = 30,
+                          **strategy_params) -> Dict:
+        """
+        Backtest une stratégie sur tous les tickers du panel à la fois
+        
+        Les trades de tous les tickers sont évalués comme des matrices
+        (dates d'entrée x tickers), avec les mêmes règles que
+        Backtester.backtest_strategy.
+        
+        Args:
+            strategy_class: Classe de la stratégie (LongStraddle, LongStrangle)
+            holding_period_days: Durée de détention de la position
+            rebalance_frequency_days: Fréquence de rééquilibrage
+            **strategy_params: Paramètres additionnels pour la stratégie
+        
+        Returns:
+            Statistiques par ticker et agrégées
+        """
+        index = self.prices.index
+        close = self.prices.to_numpy(dtype=float)
+        volatility = self.volatility.to_numpy(dtype=float)
+        
+        entry_idx = np.arange(0, len(index), rebalance_frequency_days)
+        exit_idx = index.searchsorted(index[entry_idx] + pd.Timedelta(days=holding_period_days), side='left')
+        has_exit = exit_idx < len(index)
+        entry_idx, exit_idx = entry_idx[has_exit], exit_idx[has_exit]
+        
+        entry_prices = close[entry_idx]
+        exit_prices = close[exit_idx]
+        
+        priced = _price_entries(strategy_class.__name__, entry_prices, volatility[entry_idx],
+                                holding_period_days, self.yield_curve, strategy_params)
+        if priced is None or len(entry_idx) == 0:
+            return {
+                'success': False,
+                'error': 'Aucun trade valide trouvé'
+            }
+        initial_cost = priced['initial_cost']
+        valid = priced['valid'] & np.isfinite(exit_prices)
+        with np.errstate(invalid='ignore'):
+            payoff = _expiry_payoff(exit_prices, priced['call_strikes'], priced['put_strikes'])
+        results = np.where(valid, payoff - initial_cost, np.nan)
+        roi = np.where(valid & (initial_cost != 0), results / np.where(initial_cost != 0, initial_cost, 1.0), np.nan)
+        
+        if not valid.any():
+            return {
+                'success': False,
+                'error': 'Aucun trade valide trouvé'
+            }
+        
+        per_ticker = _trade_statistics_by_column(results, rebalance_frequency_days)
+        per_ticker.insert(0, 'ticker', self.tickers)
+        per_ticker['avg_roi'] = np.nanmean(np.where(valid, roi, np.nan), axis=0) * 100
+        per_ticker = per_ticker[per_ticker['total_trades'] > 0].reset_index(drop=True)
+        
+        # Portefeuille équipondéré en prime: ROI moyen des tickers à chaque date d'entrée
+        traded_dates = valid.any(axis=1)
+        portfolio_roi = np.nanmean(roi[traded_dates], axis=1) * 100
+        portfolio_stats = _trade_statistics(portfolio_roi, rebalance_frequency_days)
+        
+        aggregate = {
+            'tickers_traded': int(len(per_ticker)),
+            'total_trades': int(valid.sum()),
+            'win_rate': float((results[valid] > 0).mean() * 100),
+            'total_profit': float(np.nansum(results)),
+            'avg_roi_per_trade': float(np.nanmean(roi) * 100),
+            'median_ticker_sharpe': float(per_ticker['sharpe_ratio'].median()),
+            'pct_tickers_profitable': float((per_ticker['total_profit'] > 0).mean() * 100),
+            'portfolio_sharpe_ratio': portfolio_stats['sharpe_ratio'],
+            'portfolio_max_drawdown_roi': portfolio_stats['max_drawdown'],
+            'portfolio_equity_curve_roi': np.cumsum(portfolio_roi).tolist()
+        }
+        
+        return {
+            'success': True,
+            'strategy': strategy_class.__name__,
+            'period': f"{self.start_date} à {self.end_date}",
+            'holding_period_days': holding_period_days,
+            'rebalance_frequency_days': rebalance_frequency_days,
+            'per_ticker': per_ticker,
+            'aggregate': aggregate,
+            'entry_dates': index[entry_idx][traded_dates].tolist()
+        }
@@ -0,0 +1,479 @@
+"""
+Upstream Access
+Accès aux sources de données distantes: session HTTP partagée (keep-alive),
+limitation de débit, délais bornés, relances des erreurs transitoires,
+requêtes couvertes et disjoncteur
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from curl_cffi import requests as curl_requests
+from curl_cffi.requests import exceptions as curl_exceptions
+from yfinance.exceptions import YFRateLimitError
+
+
+# Débit soutenu maximal vers la source (requêtes par seconde) et rafale tolérée
+DEFAULT_RATE_PER_SECOND = 4.0
+DEFAULT_BURST = 8
+
+# Délai maximal d'un appel, relances comprises (secondes)
+DEFAULT_TIMEOUT = 15.0
+
+# Nombre maximal de tentatives par appel
+MAX_ATTEMPTS = 3
+
+# Délai au-delà duquel une requête redondante est lancée (secondes, 0 = jamais)
+HEDGE_AFTER = 2.0
+
+# Attente de base entre deux tentatives (doublée à chaque relance, avec aléa)
+BACKOFF_SECONDS = 0.5
+
+# Échecs consécutifs ouvrant le disjoncteur, et durée d'ouverture (secondes)
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+# Threads d'exécution des appels (chacun conserve ses connexions ouvertes)
+POOL_SIZE = 16
+
+# Empreinte TLS de navigateur présentée à Yahoo (comme la session par défaut de yfinance)
+IMPERSONATE = 'chrome'
+
+# Statuts HTTP transitoires (relancés et comptés comme échecs)
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+# Exceptions transitoires (délais, connexions, limitation de débit de Yahoo);
+# toute autre exception est propagée sans relance ni échec du disjoncteur
+TRANSIENT_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    requests.Timeout,
+    requests.ConnectionError,
+    curl_exceptions.Timeout,
+    curl_exceptions.ConnectionError,
+    YFRateLimitError,
+)
+
+
+class CircuitOpenError(ConnectionError):
+    """Appel refusé sans contacter la source: le disjoncteur est ouvert"""
+
+
+def is_transient_error(error: BaseException, transient_errors: tuple = TRANSIENT_ERRORS) -> bool:
+    """
+    Indique si une erreur de la source justifie une relance
+    
+    Args:
+        error: Exception levée par l'appel
+        transient_errors: Types d'exception transitoires
+    
+    Returns:
+        True pour un délai, une erreur de connexion ou un statut HTTP
+        transitoire (429, 5xx); False pour une erreur déterministe
+    """
+    if isinstance(error, transient_errors):
+        return True
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status in RETRYABLE_STATUS
+
+
+def create_session() -> curl_requests.Session:
+    """
+    Session HTTP partagée par tous les appels à la source
+    
+    Les connexions sont conservées (keep-alive) par thread d'exécution du
+    client: les appels successifs évitent les poignées de main TCP et TLS.
+    
+    Returns:
+        Session curl_cffi
+    """
+    return curl_requests.Session(impersonate=IMPERSONATE)
+
+
+class TokenBucket:
+    """
+    Limiteur de débit à seau de jetons
+    
+    Le seau se remplit de rate jetons par seconde jusqu'à capacity; chaque
+    requête consomme un jeton, ce qui autorise de courtes rafales tout en
+    bornant le débit soutenu.
+    """
+    
+    def __init__(self, rate: float = DEFAULT_RATE_PER_SECOND, capacity: int = DEFAULT_BURST,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise un seau plein
+        
+        Args:
+            rate: Jetons ajoutés par seconde
+            capacity: Nombre maximal de jetons (taille de rafale)
+            clock: Horloge monotone (injectable pour les tests)
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Le débit et la capacité du limiteur doivent être strictement positifs")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def try_acquire(self) -> bool:
+        """
+        Consomme un jeton s'il y en a un disponible, sans attendre
+        
+        Returns:
+            True si le jeton a été consommé
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Consomme un jeton, en attendant qu'il soit disponible
+        
+        Args:
+            timeout: Attente maximale en secondes (None = sans limite)
+        
+        Returns:
+            True si le jeton a été consommé, False si le délai est dépassé
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_time = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+            time.sleep(wait_time)
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à trois états (fermé, ouvert, semi-ouvert)
+    
+    Après failure_threshold échecs consécutifs, les appels sont refusés
+    pendant reset_timeout secondes; ensuite, un seul appel d'essai est
+    autorisé: son succès referme le disjoncteur, son échec le rouvre.
+    """
+    
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise un disjoncteur fermé
+        
+        Args:
+            failure_threshold: Échecs consécutifs provoquant l'ouverture
+            reset_timeout: Durée d'ouverture avant l'appel d'essai (secondes)
+            clock: Horloge monotone (injectable pour les tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """État courant: 'closed', 'open' ou 'half_open'"""
+        with self._lock:
+            if self._state == 'open' and self._clock() - self._opened_at >= self.reset_timeout:
+                return 'half_open'
+            return self._state
+    
+    def retry_after(self) -> float:
+        """Secondes restantes avant l'appel d'essai (0 si le disjoncteur est fermé)"""
+        with self._lock:
+            if self._state != 'open':
+                return 0.0
+            return max(self._opened_at + self.reset_timeout - self._clock(), 0.0)
+    
+    def allow(self) -> bool:
+        """
+        Indique si un appel peut être tenté
+        
+        Returns:
+            True si le disjoncteur est fermé, ou pour l'unique appel d'essai
+        """
+        with self._lock:
+            if self._state == 'closed':
+                return True
+            if self._state == 'open' and self._clock() - self._opened_at >= self.reset_timeout:
+                self._state = 'half_open'
+                self._probing = False
+            if self._state == 'half_open' and not self._probing:
+                self._probing = True
+                return True
+            return False
+    
+    def record_success(self):
+        """Enregistre un appel réussi (referme le disjoncteur)"""
+        with self._lock:
+            self._state = 'closed'
+            self._failures = 0
+            self._probing = False
+    
+    def release(self):
+        """Abandonne un appel autorisé sans l'avoir tenté (libère l'appel d'essai)"""
+        with self._lock:
+            self._probing = False
+    
+    def record_failure(self):
+        """Enregistre un appel en échec (ouvre le disjoncteur au-delà du seuil)"""
+        with self._lock:
+            self._failures += 1
+            if self._state == 'half_open' or self._failures >= self.failure_threshold:
+                self._state = 'open'
+                self._opened_at = self._clock()
+                self._probing = False
+
+
+class UpstreamClient:
+    """
+    Point de passage unique des appels vers une source distante
+    
+    Chaque appel passe par le disjoncteur (refus immédiat si la source est
+    en panne), consomme un jeton du limiteur de débit, puis est exécuté
+    dans un pool de threads avec un délai global borné. Si la réponse
+    tarde au-delà de hedge_after, une requête redondante est lancée (si le
+    débit le permet) et la première réponse est retenue. Seules les erreurs
+    transitoires (délais, connexions, statuts 429 et 5xx) sont relancées,
+    avec attente exponentielle jusqu'à max_attempts tentatives, et comptent
+    pour le disjoncteur; les erreurs déterministes (ticker inconnu, données
+    invalides) sont propagées immédiatement.
+    """
+    
+    def __init__(self, rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+                 burst: int = DEFAULT_BURST,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_attempts: int = MAX_ATTEMPTS,
+                 hedge_after: float = HEDGE_AFTER,
+                 backoff: float = BACKOFF_SECONDS,
+                 failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT,
+                 pool_size: int = POOL_SIZE,
+                 transient_errors: tuple = TRANSIENT_ERRORS,
+                 session: Optional[Any] = None):
+        """
+        Initialise le client
+        
+        Args:
+            rate_per_second: Débit soutenu maximal (requêtes par seconde)
+            burst: Rafale maximale de requêtes
+            timeout: Délai maximal d'un appel, relances comprises (secondes)
+            max_attempts: Nombre maximal de tentatives
+            hedge_after: Délai avant la requête redondante (0 = désactivé)
+            backoff: Attente de base entre deux tentatives (secondes)
+            failure_threshold: Échecs consécutifs ouvrant le disjoncteur
+            reset_timeout: Durée d'ouverture du disjoncteur (secondes)
+            pool_size: Nombre de threads d'exécution des appels
+            transient_errors: Types d'exception relancés (voir is_transient_error)
+            session: Session HTTP partagée, transmise à yfinance (défaut:
+                create_session()); une requests.Session munie d'un
+                adaptateur de transport dirige les requêtes vers un serveur
+                de test
+        """
+        self.timeout = timeout
+        self.max_attempts = max(int(max_attempts), 1)
+        self.hedge_after = hedge_after
+        self.backoff = backoff
+        self.limiter = TokenBucket(rate_per_second, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.transient_errors = tuple(transient_errors)
+        self.session = session if session is not None else create_session()
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='upstream')
+        self._lock = threading.Lock()
+        self.counters = {'calls': 0, 'attempts': 0, 'retries': 0, 'hedges': 0,
+                         'hedge_wins': 0, 'failures': 0, 'rejected': 0}
+    
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+    
+    def call(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Exécute un appel vers la source avec la politique d'accès complète
+        
+        Args:
+            fn: Fonction effectuant l'appel réseau
+            *args: Arguments positionnels de fn
+            timeout: Délai maximal de l'appel (défaut: celui du client)
+            **kwargs: Arguments nommés de fn
+        
+        Returns:
+            Résultat de fn
+        
+        Raises:
+            CircuitOpenError: Si le disjoncteur est ouvert
+            TimeoutError: Si aucune tentative n'aboutit dans le délai
+            Exception: Erreur déterministe de fn, propagée sans relance
+        """
+        self._count('calls')
+        if not self.breaker.allow():
+            self._count('rejected')
+            raise CircuitOpenError(
+                f"Source de données indisponible, nouvel essai dans {self.breaker.retry_after():.1f}s"
+            )
+        
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        error: Optional[BaseException] = None
+        for attempt in range(self.max_attempts):
+            if attempt:
+                self._count('retries')
+                delay = self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                if time.monotonic() + delay >= deadline:
+                    break
+                time.sleep(delay)
+            if not self.limiter.acquire(timeout=max(deadline - time.monotonic(), 0.0)):
+                if error is None:
+                    # Aucune tentative: la source n'est pas en cause
+                    self.breaker.release()
+                    raise TimeoutError(f"Délai dépassé ({timeout:.1f}s) en attente du limiteur de débit")
+                break
+            try:
+                result = self._hedged(fn, args, kwargs, deadline, timeout)
+            except TimeoutError as timeout_error:
+                error = timeout_error
+                break
+            except Exception as call_error:
+                if not is_transient_error(call_error, self.transient_errors):
+                    # La source n'est pas en cause: ni relance ni échec
+                    self.breaker.release()
+                    raise
+                error = call_error
+                continue
+            self.breaker.record_success()
+            return result
+        
+        self._count('failures')
+        self.breaker.record_failure()
+        raise error
+    
+    def _hedged(self, fn: Callable[..., Any], args: tuple, kwargs: Dict,
+                deadline: float, timeout: float) -> Any:
+        """Une tentative: requête principale, puis requête redondante si elle tarde"""
+        self._count('attempts')
+        primary = self._executor.submit(fn, *args, **kwargs)
+        pending = {primary}
+        hedged = False
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Délai dépassé ({timeout:.1f}s) pour l'appel à la source")
+            window = remaining
+            if not hedged and self.hedge_after > 0:
+                window = min(remaining, self.hedge_after)
+            
+            done, pending = wait(pending, timeout=window, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self._count('hedge_wins')
+                    return future.result()
+            if done and not pending:
+                raise next(iter(done)).exception()
+            
+            # Réponse lente: requête redondante, si le débit le permet
+            if not done and not hedged and self.hedge_after > 0:
+                hedged = True
+                if self.limiter.try_acquire():
+                    self._count('hedges')
+                    self._count('attempts')
+                    pending.add(self._executor.submit(fn, *args, **kwargs))
+    
+    def stats(self) -> Dict:
+        """
+        Statistiques d'accès à la source
+        
+        Returns:
+            Dictionnaire des compteurs et de l'état du disjoncteur
+        """
+        with self._lock:
+            stats = dict(self.counters)
+        stats['breaker'] = self.breaker.state
+        return stats
+
+
+def create_upstream(**kwargs) -> UpstreamClient:
+    """
+    Construit un client configuré par l'environnement
+    
+    Variables lues: UPSTREAM_RATE_PER_SEC, UPSTREAM_BURST, UPSTREAM_TIMEOUT,
+    UPSTREAM_MAX_ATTEMPTS, UPSTREAM_HEDGE_AFTER, UPSTREAM_FAILURE_THRESHOLD
+    et UPSTREAM_RESET_TIMEOUT.
+    
+    Args:
+        **kwargs: Paramètres de UpstreamClient (prioritaires sur l'environnement)
+    
+    Returns:
+        Instance de UpstreamClient
+    """
+    settings = {
+        'rate_per_second': ('UPSTREAM_RATE_PER_SEC', float),
+        'burst': ('UPSTREAM_BURST', int),
+        'timeout': ('UPSTREAM_TIMEOUT', float),
+        'max_attempts': ('UPSTREAM_MAX_ATTEMPTS', int),
+        'hedge_after': ('UPSTREAM_HEDGE_AFTER', float),
+        'failure_threshold': ('UPSTREAM_FAILURE_THRESHOLD', int),
+        'reset_timeout': ('UPSTREAM_RESET_TIMEOUT', float),
+    }
+    for name, (variable, cast) in settings.items():
+        if name not in kwargs and os.environ.get(variable):
+            kwargs[name] = cast(os.environ[variable])
+    return UpstreamClient(**kwargs)
+
+
+_upstream: Optional[UpstreamClient] = None
+_upstream_lock = threading.Lock()
+
+
+def get_upstream() -> UpstreamClient:
+    """
+    Client partagé par le processus
+    
+    Returns:
+        Instance de UpstreamClient (configurée par l'environnement)
+    """
+    global _upstream
+    with _upstream_lock:
+        if _upstream is None:
+            _upstream = create_upstream()
+        return _upstream
+
+
+def set_upstream(client: Optional[UpstreamClient]):
+    """
+    Remplace le client partagé (None = reconstruction depuis l'environnement)
+    
+    Args:
+        client: Instance de UpstreamClient
+    """
+    global _upstream
+    with _upstream_lock:
+        _upstream = client
@@ -0,0 +1,515 @@
+"""
+Volatility Forecasting
+Prévisions de volatilité EWMA et GARCH(1,1) sur l'horizon de l'option,
+avec estimation GARCH vectorisée sur plusieurs tickers à la fois
+"""
+
+import threading
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from .realized_volatility import TRADING_DAYS
+
+
+# Modèles de prévision disponibles
+FORECAST_MODELS = ('ewma', 'garch')
+
+# Facteur de lissage EWMA (RiskMetrics)
+EWMA_LAMBDA = 0.94
+
+# Séances utilisées pour initialiser la variance EWMA
+EWMA_SEED_WINDOW = 30
+
+# Point de départ (alpha, beta) de l'estimation GARCH sans historique
+GARCH_INITIAL_PARAMS = (0.08, 0.90)
+
+# Persistance maximale alpha + beta (stationnarité)
+MAX_PERSISTENCE = 0.999
+
+# Amélioration minimale de la log-vraisemblance pour poursuivre l'estimation
+GARCH_TOLERANCE = 1e-6
+
+# Fractions du pas de Newton testées à chaque itération (recherche linéaire)
+LINE_SEARCH_STEPS = np.array([1.0, 0.5, 0.25, 0.1, 0.02])
+
+# Nombre minimal de rendements pour estimer un GARCH
+GARCH_MIN_OBSERVATIONS = 100
+
+# Séances entre deux réestimations du GARCH dans une série de prévisions
+GARCH_REFIT_SESSIONS = 21
+
+
+def _log_returns(prices: pd.DataFrame) -> np.ndarray:
+    """Rendements logarithmiques centrés (dates x tickers), NaN conservés"""
+    returns = np.diff(np.log(prices.to_numpy(dtype=float)), axis=0)
+    return returns - np.nanmean(returns, axis=0)
+
+
+def _expanding_demean(returns: np.ndarray) -> np.ndarray:
+    """Rendements centrés sur la moyenne des seuls rendements connus à chaque date"""
+    valid = ~np.isnan(returns)
+    counts = np.cumsum(valid, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.cumsum(np.where(valid, returns, 0.0), axis=0) / counts
+    return returns - means
+
+
+def _horizon_sessions(horizon_days: float) -> int:
+    """Convertit un horizon calendaire en nombre de séances"""
+    return max(1, int(round(horizon_days * TRADING_DAYS / 365.0)))
+
+
+def ewma_variance(returns: np.ndarray, decay: float = EWMA_LAMBDA) -> np.ndarray:
+    """
+    Variance EWMA journalière prévue pour la séance suivante
+    
+    La récursion v_t = decay * v_(t-1) + (1 - decay) * r_t^2 est évaluée
+    comme un filtre linéaire sur toutes les colonnes à la fois; la variance
+    est initialisée sur les premières séances.
+    
+    Args:
+        returns: Rendements (séances x tickers ou séances)
+        decay: Facteur de lissage lambda
+    
+    Returns:
+        Array des variances de même forme que returns
+    """
+    squared = np.nan_to_num(np.asarray(returns, dtype=float) ** 2)
+    seed = squared[:EWMA_SEED_WINDOW].mean(axis=0)
+    initial_state = np.expand_dims(decay * np.asarray(seed), 0)
+    variance, _ = lfilter([1 - decay], [1, -decay], squared, axis=0, zi=initial_state)
+    return variance
+
+
+def _garch_filter(returns: np.ndarray, alpha: np.ndarray, beta: np.ndarray,
+                  long_run_variance: np.ndarray):
+    """
+    Variances conditionnelles GARCH(1,1) avec ciblage de variance
+    
+    La boucle porte sur les séances; chaque pas traite toutes les colonnes
+    (tickers x candidats) à la fois. Les rendements manquants laissent la
+    variance inchangée.
+    
+    Args:
+        returns: Rendements (séances x colonnes)
+        alpha: Coefficient ARCH par colonne
+        beta: Coefficient GARCH par colonne
+        long_run_variance: Variance de long terme par colonne
+    
+    Returns:
+        Tuple (variances conditionnelles, log-vraisemblance, variance de la séance suivante)
+    """
+    omega = long_run_variance * (1 - alpha - beta)
+    variance = long_run_variance.copy()
+    variances = np.empty_like(returns)
+    log_likelihood = np.zeros(returns.shape[1])
+    
+    for t in range(returns.shape[0]):
+        r = returns[t]
+        observed = ~np.isnan(r)
+        variances[t] = variance
+        squared = np.where(observed, r * r, 0.0)
+        log_likelihood -= 0.5 * np.where(observed, np.log(variance) + squared / variance, 0.0)
+        variance = np.where(observed, omega + alpha * squared + beta * variance, variance)
+    
+    return variances, log_likelihood, variance
+
+
+def _garch_scores(returns: np.ndarray, alpha: np.ndarray, beta: np.ndarray,
+                  long_run_variance: np.ndarray):
+    """
+    Gradient et matrice BHHH de la log-vraisemblance GARCH en (alpha, beta)
+    
+    Les dérivées des variances conditionnelles suivent leur propre
+    récursion, évaluée dans la même boucle que les variances.
+    
+    Args:
+        returns: Rendements (séances x colonnes)
+        alpha: Coefficient ARCH par colonne
+        beta: Coefficient GARCH par colonne
+        long_run_variance: Variance de long terme par colonne
+    
+    Returns:
+        Tuple (log-vraisemblance, gradient (colonnes x 2), BHHH (colonnes x 2 x 2))
+    """
+    omega = long_run_variance * (1 - alpha - beta)
+    variance = long_run_variance.copy()
+    derivative = np.zeros((returns.shape[1], 2))
+    log_likelihood = np.zeros(returns.shape[1])
+    gradient = np.zeros((returns.shape[1], 2))
+    bhhh = np.zeros((returns.shape[1], 2, 2))
+    
+    for t in range(returns.shape[0]):
+        r = returns[t]
+        observed = ~np.isnan(r)
+        squared = np.where(observed, r * r, 0.0)
+        log_likelihood -= 0.5 * np.where(observed, np.log(variance) + squared / variance, 0.0)
+        
+        score = (np.where(observed, 0.5 * (squared / variance - 1) / variance, 0.0)[:, None] * derivative)
+        gradient += score
+        bhhh += score[:, :, None] * score[:, None, :]
+        
+        # dh/dalpha = r^2 - variance de long terme + beta * dh/dalpha (idem pour beta avec h)
+        next_derivative = np.stack((squared - long_run_variance, variance - long_run_variance), axis=1)
+        next_derivative += beta[:, None] * derivative
+        derivative = np.where(observed[:, None], next_derivative, derivative)
+        variance = np.where(observed, omega + alpha * squared + beta * variance, variance)
+    
+    return log_likelihood, gradient, bhhh
+
+
+def _project_params(alpha: np.ndarray, beta: np.ndarray):
+    """Ramène (alpha, beta) dans la zone de stationnarité"""
+    alpha = np.maximum(alpha, 0.0)
+    beta = np.maximum(beta, 0.0)
+    scale = np.minimum(1.0, MAX_PERSISTENCE / np.maximum(alpha + beta, 1e-12))
+    return alpha * scale, beta * scale
+
+
+def fit_garch(returns: Union[pd.DataFrame, np.ndarray],
+              warm_start: Optional[pd.DataFrame] = None,
+              max_iterations: int = 200) -> pd.DataFrame:
+    """
+    Estime un GARCH(1,1) par maximum de vraisemblance pour chaque colonne
+    
+    La variance de long terme est ciblée sur la variance empirique, il
+    reste (alpha, beta) à estimer par BHHH: chaque itération calcule
+    gradient et matrice BHHH de tous les tickers en une passe, puis évalue
+    plusieurs fractions du pas de Newton en une seconde passe. Les tickers
+    convergés ne sont plus réévalués; les paramètres de warm_start servent
+    de point de départ.
+    
+    Args:
+        returns: Rendements centrés (séances x tickers)
+        warm_start: Paramètres précédents (index tickers, colonnes alpha et beta)
+        max_iterations: Nombre maximal d'itérations
+    
+    Returns:
+        DataFrame des paramètres estimés par ticker
+    """
+    if isinstance(returns, pd.DataFrame):
+        tickers = list(returns.columns)
+        values = returns.to_numpy(dtype=float)
+    else:
+        values = np.asarray(returns, dtype=float)
+        values = values[:, None] if values.ndim == 1 else values
+        tickers = list(range(values.shape[1]))
+    
+    num_tickers = values.shape[1]
+    long_run_variance = np.nanvar(values, axis=0)
+    observations = (~np.isnan(values)).sum(axis=0)
+    
+    params = np.tile(np.array(GARCH_INITIAL_PARAMS, dtype=float), (num_tickers, 1))
+    if warm_start is not None:
+        known = np.array([ticker in warm_start.index for ticker in tickers])
+        if known.any():
+            cached = warm_start.loc[[ticker for ticker, k in zip(tickers, known) if k], ['alpha', 'beta']]
+            params[known] = cached.to_numpy(dtype=float)
+    
+    num_steps = len(LINE_SEARCH_STEPS)
+    converged = np.zeros(num_tickers, dtype=bool)
+    iterations = 0
+    while iterations < max_iterations and not converged.all():
+        iterations += 1
+        active = np.flatnonzero(~converged)
+        alpha, beta = params[active, 0], params[active, 1]
+        
+        log_likelihood, gradient, bhhh = _garch_scores(values[:, active], alpha, beta,
+                                                       long_run_variance[active])
+        bhhh += np.eye(2)[None] * 1e-8 * np.trace(bhhh, axis1=1, axis2=2)[:, None, None]
+        direction = np.linalg.solve(bhhh, gradient[:, :, None])[:, :, 0]
+        
+        # Recherche linéaire: toutes les fractions du pas dans une seule passe
+        trial_alpha, trial_beta = _project_params(
+            alpha[:, None] + LINE_SEARCH_STEPS[None, :] * direction[:, :1],
+            beta[:, None] + LINE_SEARCH_STEPS[None, :] * direction[:, 1:]
+        )
+        _, trial_likelihood, _ = _garch_filter(
+            np.repeat(values[:, active], num_steps, axis=1),
+            trial_alpha.ravel(), trial_beta.ravel(),
+            np.repeat(long_run_variance[active], num_steps)
+        )
+        trial_likelihood = np.nan_to_num(trial_likelihood, nan=-np.inf).reshape(len(active), num_steps)
+        
+        rows = np.arange(len(active))
+        best = np.argmax(trial_likelihood, axis=1)
+        gain = trial_likelihood[rows, best] - log_likelihood
+        improved = gain > 0
+        
+        params[active[improved], 0] = trial_alpha[rows, best][improved]
+        params[active[improved], 1] = trial_beta[rows, best][improved]
+        converged[active] = gain < GARCH_TOLERANCE * np.maximum(1.0, np.abs(log_likelihood))
+    
+    alpha, beta = params[:, 0], params[:, 1]
+    _, log_likelihood, next_variance = _garch_filter(values, alpha, beta, long_run_variance)
+    
+    return pd.DataFrame({
+        'omega': long_run_variance * (1 - alpha - beta),
+        'alpha': alpha,
+        'beta': beta,
+        'persistence': alpha + beta,
+        'long_run_variance': long_run_variance,
+        'next_variance': next_variance,
+        'log_likelihood': log_likelihood,
+        'observations': observations,
+        'iterations': iterations
+    }, index=pd.Index(tickers, name='ticker'))
+
+
+def garch_term_structure(next_variance: np.ndarray, long_run_variance: np.ndarray,
+                         persistence: np.ndarray,
+                         horizon_days: Union[float, Iterable[float]]) -> np.ndarray:
+    """
+    Volatilité annualisée moyenne prévue sur un ou plusieurs horizons
+    
+    La variance prévue à k séances converge vers la variance de long terme
+    au rythme persistence^k; la moyenne sur l'horizon a une forme fermée.
+    
+    Args:
+        next_variance: Variance prévue pour la séance suivante (par ticker ou par date)
+        long_run_variance: Variance de long terme
+        persistence: alpha + beta
+        horizon_days: Horizon(s) calendaire(s) en jours
+    
+    Returns:
+        Array des volatilités (dernier axe = horizons si plusieurs)
+    """
+    scalar = np.isscalar(horizon_days)
+    horizons = np.array([_horizon_sessions(h) for h in np.atleast_1d(horizon_days)], dtype=float)
+    
+    next_variance = np.asarray(next_variance, dtype=float)[..., None]
+    long_run_variance = np.asarray(long_run_variance, dtype=float)[..., None]
+    persistence = np.asarray(persistence, dtype=float)[..., None]
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        decay = np.where(persistence < 1,
+                         (1 - persistence**horizons) / ((1 - persistence) * horizons), 1.0)
+    average_variance = long_run_variance + (next_variance - long_run_variance) * decay
+    volatility = np.sqrt(np.maximum(average_variance, 0.0) * TRADING_DAYS)
+    return volatility[..., 0] if scalar else volatility
+
+
+def garch_forecast_path(returns: np.ndarray,
+                        refit_sessions: int = GARCH_REFIT_SESSIONS,
+                        min_observations: int = GARCH_MIN_OBSERVATIONS):
+    """
+    Prévisions GARCH(1,1) sans biais d'anticipation, réestimées sur fenêtre croissante
+    
+    Le GARCH est réestimé toutes les refit_sessions séances sur les seuls
+    rendements connus (moyenne et variance de long terme comprises); les
+    prévisions jusqu'à la réestimation suivante utilisent ces paramètres.
+    Toutes les fenêtres sont estimées en une passe vectorisée: chaque
+    colonne de la matrice passée à fit_garch est l'historique tronqué à une
+    date de réestimation.
+    
+    Args:
+        returns: Rendements logarithmiques non centrés d'un ticker
+        refit_sessions: Séances entre deux réestimations
+        min_observations: Rendements requis pour la première estimation
+    
+    Returns:
+        Tuple d'arrays de même longueur que returns (variance prévue pour la
+        séance suivante, variance de long terme, persistance), NaN avant la
+        première estimation
+    """
+    returns = np.asarray(returns, dtype=float)
+    num_returns = len(returns)
+    observed = np.cumsum(~np.isnan(returns))
+    if num_returns == 0 or observed[-1] < min_observations:
+        raise ValueError(f"Pas assez de données pour estimer un GARCH ({min_observations} rendements requis)")
+    
+    # Nombre de rendements de chaque fenêtre d'estimation, et fin de sa période d'utilisation
+    first_cutoff = int(np.searchsorted(observed, min_observations)) + 1
+    cutoffs = np.arange(first_cutoff, num_returns + 1, refit_sessions)
+    period_ends = np.append(cutoffs[1:] - 1, num_returns)
+    
+    sessions = np.arange(num_returns)[:, None]
+    training = np.where(sessions < cutoffs, returns[:, None], np.nan)
+    means = np.nanmean(training, axis=0)
+    fitted = fit_garch(training - means)
+    
+    alpha = fitted['alpha'].to_numpy()
+    beta = fitted['beta'].to_numpy()
+    long_run_variance = fitted['long_run_variance'].to_numpy()
+    filtered = np.where(sessions < period_ends, returns[:, None] - means, np.nan)
+    variances, _, next_variance = _garch_filter(filtered, alpha, beta, long_run_variance)
+    next_variances = np.vstack((variances[1:], next_variance[None, :]))
+    
+    # Fenêtre en vigueur à chaque séance: la dernière estimée avec les rendements connus
+    window = np.searchsorted(cutoffs - 1, np.arange(num_returns), side='right') - 1
+    known = window >= 0
+    window = np.maximum(window, 0)
+    
+    return (
+        np.where(known, next_variances[np.arange(num_returns), window], np.nan),
+        np.where(known, long_run_variance[window], np.nan),
+        np.where(known, (alpha + beta)[window], np.nan)
+    )
+
+
+def _data_signature(series: pd.Series) -> tuple:
+    """
+    Empreinte des dates et des valeurs d'une série de cours
+    
+    Comme pour le cache de volatilité réalisée, toute révision d'une barre
+    (y compris au milieu de l'historique) change l'empreinte.
+    """
+    return (
+        len(series),
+        hash(pd.DatetimeIndex(series.index).as_unit('ns').asi8.tobytes()),
+        hash(series.to_numpy(dtype=float).tobytes())
+    )
+
+
+class VolatilityForecaster:
+    """
+    Prévisions EWMA et GARCH pour un univers de tickers
+    
+    Les paramètres GARCH sont conservés par ticker: une nouvelle estimation
+    sur des données plus récentes repart des paramètres en cache, et une
+    estimation sur des données inchangées est évitée. Les séries de
+    prévisions historiques sont également conservées par ticker.
+    """
+    
+    def __init__(self, decay: float = EWMA_LAMBDA):
+        """
+        Initialise le moteur de prévision
+        
+        Args:
+            decay: Facteur de lissage EWMA
+        """
+        self.decay = decay
+        self.params = pd.DataFrame()
+        self._signatures: Dict[str, tuple] = {}
+        self._paths: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+    
+    def fit(self, prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        Estime (ou met à jour) les GARCH de tous les tickers d'un panel
+        
+        Args:
+            prices: DataFrame (dates x tickers) des cours de clôture
+        
+        Returns:
+            DataFrame des paramètres des tickers du panel
+        """
+        prices = prices.dropna(axis=1, how='all')
+        signatures = {ticker: _data_signature(prices[ticker].dropna()) for ticker in prices.columns}
+        
+        with self._lock:
+            stale = [ticker for ticker in prices.columns
+                     if self._signatures.get(ticker) != signatures[ticker]]
+            warm_start = self.params if not self.params.empty else None
+        
+        if stale:
+            returns = _log_returns(prices[stale])
+            enough = (~np.isnan(returns)).sum(axis=0) >= GARCH_MIN_OBSERVATIONS
+            if not enough.all():
+                missing = [ticker for ticker, ok in zip(stale, enough) if not ok]
+                raise ValueError(f"Pas assez de données pour estimer un GARCH: {', '.join(map(str, missing))}")
+            
+            fitted = fit_garch(pd.DataFrame(returns, columns=stale), warm_start)
+            with self._lock:
+                self.params = pd.concat([self.params.drop(index=stale, errors='ignore'), fitted])
+                self._signatures.update({ticker: signatures[ticker] for ticker in stale})
+        
+        with self._lock:
+            return self.params.loc[list(prices.columns)]
+    
+    def forecast(self, prices: pd.DataFrame,
+                 horizon_days: Union[float, Iterable[float]] = 30,
+                 model: str = 'garch') -> pd.DataFrame:
+        """
+        Structure par terme de la volatilité prévue pour chaque ticker
+        
+        Args:
+            prices: DataFrame (dates x tickers) des cours de clôture
+            horizon_days: Horizon(s) calendaire(s) en jours
+            model: 'ewma' ou 'garch'
+        
+        Returns:
+            DataFrame (tickers x horizons) des volatilités annualisées
+        """
+        horizons = list(np.atleast_1d(horizon_days))
+        if model == 'garch':
+            params = self.fit(prices)
+            volatility = garch_term_structure(params['next_variance'], params['long_run_variance'],
+                                              params['persistence'], horizons)
+            return pd.DataFrame(volatility, index=params.index, columns=horizons)
+        
+        if model == 'ewma':
+            prices = prices.dropna(axis=1, how='all')
+            variance = ewma_variance(_log_returns(prices), self.decay)[-1]
+            volatility = np.sqrt(variance * TRADING_DAYS)
+            return pd.DataFrame(np.repeat(volatility[:, None], len(horizons), axis=1),
+                                index=pd.Index(prices.columns, name='ticker'), columns=horizons)
+        
+        raise ValueError(f"Modèle de prévision inconnu: {model} (disponibles: {', '.join(FORECAST_MODELS)})")
+    
+    def forecast_series(self, ticker: str, data: pd.DataFrame,
+                        horizon_days: float = 30, model: str = 'garch') -> pd.Series:
+        """
+        Volatilité prévue sur l'horizon à chaque date d'un historique
+        
+        La prévision de chaque date n'utilise que les rendements connus à sa
+        clôture: rendements centrés sur leur moyenne à date et, pour le
+        GARCH, paramètres et variance de long terme réestimés sur fenêtre
+        croissante (voir garch_forecast_path). Les dates sans prévision
+        possible (amorce EWMA, historique trop court pour le GARCH) sont NaN.
+        
+        Args:
+            ticker: Symbole du ticker
+            data: DataFrame OHLC indexé par date
+            horizon_days: Horizon calendaire en jours
+            model: 'ewma' ou 'garch'
+        
+        Returns:
+            Série des volatilités annualisées (NaN à la première séance)
+        """
+        close = data['Close'].to_numpy(dtype=float)
+        returns = np.diff(np.log(close))
+        
+        if model == 'garch':
+            signature = _data_signature(data['Close'])
+            with self._lock:
+                cached = self._paths.get(ticker)
+            if cached is not None and cached[0] == signature:
+                path = cached[1]
+            else:
+                path = garch_forecast_path(returns)
+                with self._lock:
+                    self._paths[ticker] = (signature, path)
+            next_variances, long_run_variance, persistence = path
+            volatility = garch_term_structure(next_variances, long_run_variance,
+                                              persistence, horizon_days)
+        elif model == 'ewma':
+            demeaned = _expanding_demean(returns)
+            volatility = np.sqrt(ewma_variance(demeaned, self.decay) * TRADING_DAYS)
+            # L'amorce est la moyenne des premières séances: inconnue avant la fin de celles-ci
+            volatility[:EWMA_SEED_WINDOW - 1] = np.nan
+        else:
+            raise ValueError(f"Modèle de prévision inconnu: {model} (disponibles: {', '.join(FORECAST_MODELS)})")
+        
+        return pd.Series(np.concatenate(([np.nan], volatility)), index=data.index, name=ticker)
+
+
+_default_forecaster: Optional[VolatilityForecaster] = None
+_default_forecaster_lock = threading.Lock()
+
+
+def get_default_forecaster() -> VolatilityForecaster:
+    """
+    Moteur de prévision partagé par le processus (paramètres GARCH en cache)
+    
+    Returns:
+        Instance de VolatilityForecaster
+    """
+    global _default_forecaster
+    with _default_forecaster_lock:
+        if _default_forecaster is None:
+            _default_forecaster = VolatilityForecaster()
+        return _default_forecaster
@@ -0,0 +1,428 @@
+"""
+Cache Warm-up
+Préchargement des données de marché d'une watchlist au démarrage, sauvegarde
+des caches sur disque et rafraîchissement périodique en arrière-plan
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from .cache import get_cache
+from .concurrent_fetch import map_concurrently
+from .market_data import get_history_bulk, get_recent_history, get_ticker_info
+from .yield_curve import YieldCurve, get_yield_curve
+
+
+# Watchlist par défaut (surchargée par la variable WARMUP_TICKERS, séparateur virgule)
+DEFAULT_WATCHLIST = ['SPY', 'QQQ', 'AAPL', 'MSFT', 'NVDA', 'AMZN', 'GOOGL', 'META', 'TSLA']
+
+# Fichier de sauvegarde des caches (surchargé par la variable WARMUP_SNAPSHOT_PATH)
+DEFAULT_SNAPSHOT_PATH = os.path.join('data', 'cache_snapshot.json')
+
+# Caches mémoire sauvegardés sur disque (les métadonnées sont déjà persistantes)
+SNAPSHOT_CACHES = ('history', 'curve')
+
+# Périodicité des tâches de fond (secondes); l'historique est rafraîchi avant
+# l'expiration de son entrée de cache (300s), spot et volatilité en dérivent
+REFRESH_INTERVALS = {
+    'history': 240,
+    'curve': 3600,
+    'info': 6 * 3600,
+    'snapshot': 600,
+}
+
+# Nombre de tickers par lot de rafraîchissement de l'historique
+REFRESH_BATCH_SIZE = 25
+
+
+def _encode_history(key: Hashable, value: Tuple[datetime, pd.DataFrame]) -> Dict:
+    """Entrée du cache 'history' (ticker -> (début téléchargé, OHLCV)) en JSON"""
+    fetch_start, frame = value
+    return {
+        'key': key,
+        'fetch_start': fetch_start.isoformat(),
+        'index': [timestamp.isoformat() for timestamp in frame.index],
+        'index_name': frame.index.name,
+        'index_dtype': str(frame.index.dtype),
+        'columns': frame.to_dict(orient='list')
+    }
+
+
+def _decode_history(entry: Dict) -> Tuple[Hashable, Tuple[datetime, pd.DataFrame]]:
+    """Inverse de _encode_history"""
+    index = pd.DatetimeIndex(pd.to_datetime(entry['index'], format='ISO8601'),
+                             name=entry['index_name']).astype(entry['index_dtype'])
+    frame = pd.DataFrame(entry['columns'], index=index)
+    return entry['key'], (datetime.fromisoformat(entry['fetch_start']), frame)
+
+
+def _encode_curve(key: Hashable, value: YieldCurve) -> Dict:
+    """Entrée du cache 'curve' (date -> courbe des taux) en JSON"""
+    return {'key': key.isoformat(), 'curve': value.to_dict()}
+
+
+def _decode_curve(entry: Dict) -> Tuple[Hashable, YieldCurve]:
+    """Inverse de _encode_curve"""
+    return date.fromisoformat(entry['key']), YieldCurve.from_dict(entry['curve'])
+
+
+# Conversion JSON des entrées de chaque cache sauvegardé: (encodage, décodage)
+SNAPSHOT_CODECS: Dict[str, tuple] = {
+    'history': (_encode_history, _decode_history),
+    'curve': (_encode_curve, _decode_curve),
+}
+
+
+def save_cache_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> int:
+    """
+    Sauvegarde les entrées non expirées des caches mémoire
+    
+    Le fichier est un document JSON (aucun code n'est exécuté au chargement):
+    chaque entrée est convertie par le codec de son cache (SNAPSHOT_CODECS).
+    
+    Args:
+        path: Fichier de sauvegarde (écriture atomique)
+    
+    Returns:
+        Nombre d'entrées sauvegardées
+    """
+    caches = {}
+    for data_type in SNAPSHOT_CACHES:
+        encode, _ = SNAPSHOT_CODECS[data_type]
+        caches[data_type] = [{**encode(key, value), 'remaining': remaining}
+                             for key, value, remaining in get_cache(data_type).items()]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'saved_at': time.time(), 'caches': caches}, f)
+    os.replace(tmp_path, path)
+    return sum(len(entries) for entries in caches.values())
+
+
+def load_cache_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> int:
+    """
+    Restaure les entrées sauvegardées encore valides
+    
+    La durée de vie restante de chaque entrée est diminuée du temps écoulé
+    depuis la sauvegarde; les entrées expirées entre-temps ou illisibles
+    sont ignorées.
+    
+    Args:
+        path: Fichier de sauvegarde
+    
+    Returns:
+        Nombre d'entrées restaurées (0 si le fichier est absent ou illisible)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        elapsed = max(time.time() - float(snapshot['saved_at']), 0.0)
+        caches = dict(snapshot['caches'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0
+    
+    restored = 0
+    for data_type, entries in caches.items():
+        if data_type not in SNAPSHOT_CODECS:
+            continue
+        _, decode = SNAPSHOT_CODECS[data_type]
+        cache = get_cache(data_type)
+        for entry in entries:
+            try:
+                remaining = float(entry['remaining']) - elapsed
+                if remaining <= 0:
+                    continue
+                key, value = decode(entry)
+            except (KeyError, TypeError, ValueError):
+                continue
+            cache.set(key, value, remaining)
+            restored += 1
+    return restored
+
+
+class WarmupScheduler:
+    """
+    Préchargement et rafraîchissement en arrière-plan d'une watchlist
+    
+    Au démarrage, les caches sauvegardés sont restaurés puis la watchlist
+    est préchargée (historiques groupés, courbe des taux, fiches). Un thread
+    de fond exécute ensuite chaque tâche à sa périodicité; les lots de
+    tickers et les tâches sont décalés dans le temps pour lisser les appels
+    à la source. Les requêtes des utilisateurs trouvent ainsi les données
+    en cache au lieu d'attendre la source.
+    """
+    
+    def __init__(self, tickers: Optional[List[str]] = None,
+                 intervals: Optional[Dict[str, float]] = None,
+                 snapshot_path: Optional[str] = None,
+                 batch_size: int = REFRESH_BATCH_SIZE):
+        """
+        Initialise le planificateur (sans le démarrer)
+        
+        Args:
+            tickers: Watchlist (défaut: $WARMUP_TICKERS ou DEFAULT_WATCHLIST)
+            intervals: Périodicités par tâche (défaut: REFRESH_INTERVALS)
+            snapshot_path: Fichier de sauvegarde des caches
+                (défaut: $WARMUP_SNAPSHOT_PATH ou data/cache_snapshot.json)
+            batch_size: Nombre de tickers par lot de rafraîchissement
+        """
+        if tickers is None:
+            configured = os.environ.get('WARMUP_TICKERS', '')
+            tickers = [t for t in configured.split(',') if t.strip()] or DEFAULT_WATCHLIST
+        self.tickers = list(dict.fromkeys(t.strip().upper() for t in tickers))
+        self.intervals = {**REFRESH_INTERVALS, **(intervals or {})}
+        self.snapshot_path = snapshot_path or os.environ.get('WARMUP_SNAPSHOT_PATH', DEFAULT_SNAPSHOT_PATH)
+        self.batches = [self.tickers[i:i + batch_size] for i in range(0, len(self.tickers), batch_size)]
+        
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.jobs: Dict[str, Dict] = {}
+        self.last_warmup: Optional[Dict] = None
+    
+    def _schedule(self) -> Dict[str, Dict]:
+        """Tâches périodiques avec leur première exécution décalée"""
+        tasks: Dict[str, tuple] = {}
+        for i, batch in enumerate(self.batches):
+            tasks[f'history:{i}'] = ('history', lambda batch=batch: self.refresh_history(batch))
+        tasks['curve'] = ('curve', self.refresh_curve)
+        tasks['info'] = ('info', self.refresh_info)
+        tasks['snapshot'] = ('snapshot', self.snapshot)
+        
+        now = time.monotonic()
+        jobs = {}
+        for position, (name, (kind, fn)) in enumerate(tasks.items()):
+            interval = self.intervals[kind]
+            # Décalage régulier sur la période: les tâches ne partent pas ensemble
+            offset = interval * (position + 1) / (len(tasks) + 1)
+            jobs[name] = {'fn': fn, 'interval': interval, 'next_run': now + offset,
+                          'runs': 0, 'errors': 0, 'last_error': None, 'last_duration': None}
+        return jobs
+    
+    def refresh_history(self, tickers: List[str]):
+        """Recharge l'historique récent (spot et volatilité) d'un lot de tickers"""
+        get_history_bulk(tickers, refresh=True)
+    
+    def warm_history(self) -> Dict[str, str]:
+        """
+        Précharge l'historique récent de toute la watchlist
+        
+        Les tickers sont d'abord chargés par téléchargements groupés; chacun
+        est ensuite vérifié individuellement (depuis le cache, ou rechargé
+        seul si le téléchargement groupé a échoué), de sorte qu'un ticker en
+        erreur n'empêche pas le préchargement des autres.
+        
+        Returns:
+            Dictionnaire ticker -> message d'erreur (vide si tout est chargé)
+        """
+        try:
+            get_history_bulk(self.tickers)
+        except Exception:
+            # Les tickers sont rechargés un par un pour isoler les erreurs
+            pass
+        
+        def check(ticker: str) -> Optional[str]:
+            try:
+                if get_recent_history(ticker).empty:
+                    return "Aucune donnée disponible"
+            except Exception as e:
+                return str(e)
+            return None
+        
+        results = map_concurrently(check, self.tickers, default="Délai dépassé")
+        return {ticker: error for ticker, error in zip(self.tickers, results) if error is not None}
+    
+    def refresh_curve(self):
+        """Recharge la courbe des taux"""
+        get_yield_curve(refresh=True)
+    
+    def refresh_info(self):
+        """Consulte les fiches (les fiches périmées sont rafraîchies en arrière-plan)"""
+        map_concurrently(get_ticker_info, self.tickers, default=None)
+    
+    def snapshot(self) -> int:
+        """Sauvegarde les caches sur disque"""
+        return save_cache_snapshot(self.snapshot_path)
+    
+    def warm(self) -> Dict:
+        """
+        Restaure les caches sauvegardés puis précharge toute la watchlist
+        
+        Returns:
+            Dictionnaire avec le nombre d'entrées restaurées, le nombre de
+            tickers chargés, la durée du préchargement et les erreurs
+            éventuelles (par ticker pour l'historique)
+        """
+        started = time.monotonic()
+        restored = load_cache_snapshot(self.snapshot_path)
+        errors: Dict[str, object] = {}
+        history_errors = self.warm_history()
+        if history_errors:
+            errors['history'] = history_errors
+        steps: Dict[str, Callable[[], object]] = {
+            'curve': get_yield_curve,
+            'info': self.refresh_info,
+        }
+        for name, step in steps.items():
+            try:
+                step()
+            except Exception as e:
+                errors[name] = str(e)
+        
+        return {
+            'success': not errors,
+            'tickers': len(self.tickers),
+            'loaded_tickers': len(self.tickers) - len(history_errors),
+            'restored_entries': restored,
+            'duration': time.monotonic() - started,
+            'errors': errors
+        }
+    
+    def start(self, warm: bool = True) -> 'WarmupScheduler':
+        """
+        Démarre le thread de fond (préchargement puis rafraîchissements)
+        
+        Args:
+            warm: Précharger la watchlist avant les rafraîchissements périodiques
+        
+        Returns:
+            L'instance elle-même
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(warm,),
+                                            name='cache-warmup', daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self, snapshot: bool = True, timeout: float = 10.0):
+        """
+        Arrête le thread de fond
+        
+        Args:
+            snapshot: Sauvegarder les caches avant de rendre la main
+            timeout: Attente maximale de la fin de la tâche en cours (secondes)
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if snapshot:
+            self.snapshot()
+    
+    def _run(self, warm: bool):
+        """Boucle du thread de fond"""
+        if warm:
+            self.last_warmup = self.warm()
+        with self._lock:
+            self.jobs = self._schedule()
+        
+        while not self._stop.is_set():
+            with self._lock:
+                name, job = min(self.jobs.items(), key=lambda item: item[1]['next_run'])
+            delay = job['next_run'] - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+                continue
+            
+            started = time.monotonic()
+            error = None
+            try:
+                job['fn']()
+            except Exception as e:
+                error = str(e)
+            
+            with self._lock:
+                job['runs'] += 1
+                if error is not None:
+                    job['errors'] += 1
+                    job['last_error'] = error
+                job['last_duration'] = time.monotonic() - started
+                # Périodicité fixe depuis le départ prévu (pas de dérive cumulée)
+                job['next_run'] = max(job['next_run'] + job['interval'], time.monotonic())
+    
+    def status(self) -> Dict:
+        """
+        État du préchargement et des tâches de fond
+        
+        Returns:
+            Dictionnaire avec l'état du thread, le résultat du préchargement
+            et, par tâche, le nombre d'exécutions, d'erreurs et l'échéance
+        """
+        now = time.monotonic()
+        with self._lock:
+            jobs = {
+                name: {
+                    'interval': job['interval'],
+                    'runs': job['runs'],
+                    'errors': job['errors'],
+                    'last_error': job['last_error'],
+                    'last_duration': job['last_duration'],
+                    'next_run_in': max(job['next_run'] - now, 0.0)
+                }
+                for name, job in self.jobs.items()
+            }
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'tickers': self.tickers,
+            'warmup': self.last_warmup,
+            'jobs': jobs
+        }
+
+
+_scheduler: Optional[WarmupScheduler] = None
+_scheduler_lock = threading.Lock()
+
+# Processus dans lequel le planificateur partagé a été démarré (un fork repart de zéro)
+_started_pid: Optional[int] = None
+
+
+def get_warmup_scheduler() -> WarmupScheduler:
+    """
+    Planificateur partagé par le processus (non démarré)
+    
+    Returns:
+        Instance de WarmupScheduler (configurée par l'environnement)
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = WarmupScheduler()
+        return _scheduler
+
+
+def warmup_enabled() -> bool:
+    """Préchargement autorisé par la configuration (variable WARMUP_ENABLED, défaut 1)"""
+    return os.environ.get('WARMUP_ENABLED', '1') == '1'
+
+
+def start_warmup() -> WarmupScheduler:
+    """
+    Démarre le préchargement et les rafraîchissements du planificateur partagé
+    
+    Une seule fois par processus: les appels suivants ne font rien, et un
+    processus issu d'un fork (workers d'un serveur WSGI) démarre le sien.
+    L'arrêt, avec sauvegarde des caches, est enregistré à la sortie.
+    
+    Returns:
+        Instance de WarmupScheduler démarrée
+    """
+    global _started_pid
+    scheduler = get_warmup_scheduler()
+    with _scheduler_lock:
+        if _started_pid == os.getpid():
+            return scheduler
+        _started_pid = os.getpid()
+    atexit.register(scheduler.stop)
+    return scheduler.start()
@@ -0,0 +1,207 @@
+"""
+Yield Curve
+Courbe des taux sans risque construite à partir de plusieurs maturités du
+Trésor américain, interpolée en log-facteurs d'actualisation
+"""
+
+from datetime import date
+from typing import Dict, Optional, Union
+
+import numpy as np
+from scipy.interpolate import PchipInterpolator
+
+from .cache import get_cache
+from .concurrent_fetch import fetch_concurrently
+from .providers import get_provider
+
+
+# Indices Yahoo Finance des rendements du Trésor -> maturité en années
+TREASURY_TENORS = {
+    '^IRX': 0.25,    # T-Bill 13 semaines
+    '^FVX': 5.0,     # Note 5 ans
+    '^TNX': 10.0,    # Note 10 ans
+    '^TYX': 30.0,    # Bond 30 ans
+}
+
+# Taux utilisé quand aucune maturité n'a pu être téléchargée
+DEFAULT_RISK_FREE_RATE = 0.05
+
+# Maturité (années) du taux court utilisé par défaut
+SHORT_RATE_MATURITY = 0.25
+
+# Durée de vie (secondes) d'une courbe incomplète (une maturité manquait)
+PARTIAL_CURVE_TTL = 3600
+
+
+class YieldCurve:
+    """
+    Courbe de taux zéro-coupon en composition continue
+    
+    Les log-facteurs d'actualisation -r(T)*T sont interpolés par une
+    cubique monotone (PCHIP), sans oscillation entre les maturités cotées.
+    En deçà de la première et au-delà de la dernière maturité, le taux est
+    constant.
+    """
+    
+    def __init__(self, maturities, yields, as_of: Optional[date] = None,
+                 compounding: int = 2):
+        """
+        Construit la courbe à partir de rendements cotés
+        
+        Args:
+            maturities: Maturités en années (strictement positives)
+            yields: Rendements en décimal (0.045 = 4.5%)
+            as_of: Date de cotation des rendements
+            compounding: Périodes de composition par an des rendements cotés
+                (2 = équivalent obligataire semestriel, 0 = déjà continus)
+        """
+        maturities = np.asarray(maturities, dtype=float)
+        yields = np.asarray(yields, dtype=float)
+        if maturities.ndim != 1 or maturities.shape != yields.shape or len(maturities) == 0:
+            raise ValueError("Maturités et rendements doivent être deux listes non vides de même taille")
+        if np.any(maturities <= 0) or not np.all(np.isfinite(yields)):
+            raise ValueError("Les maturités doivent être positives et les rendements finis")
+        
+        order = np.argsort(maturities)
+        self.maturities = maturities[order]
+        self.yields = yields[order]
+        self.as_of = as_of
+        self.compounding = compounding
+        if compounding:
+            self.zero_rates = compounding * np.log1p(self.yields / compounding)
+        else:
+            self.zero_rates = self.yields.copy()
+        
+        if len(self.maturities) > 1:
+            self._log_discount = PchipInterpolator(self.maturities,
+                                                   -self.zero_rates * self.maturities,
+                                                   extrapolate=False)
+        else:
+            self._log_discount = None
+    
+    @classmethod
+    def flat(cls, rate: float, as_of: Optional[date] = None) -> 'YieldCurve':
+        """
+        Courbe plate à un taux continu constant
+        
+        Args:
+            rate: Taux sans risque annualisé (en décimal)
+            as_of: Date de référence
+        
+        Returns:
+            Instance de YieldCurve
+        """
+        return cls([SHORT_RATE_MATURITY], [rate], as_of, compounding=0)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'YieldCurve':
+        """
+        Reconstruit une courbe depuis sa représentation sérialisable
+        
+        Args:
+            data: Dictionnaire produit par to_dict
+        
+        Returns:
+            Instance de YieldCurve
+        """
+        as_of = date.fromisoformat(data['as_of']) if data.get('as_of') else None
+        return cls(data['maturities'], data['yields'], as_of, data.get('compounding', 2))
+    
+    def rate(self, maturity: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Taux zéro-coupon continu pour une ou plusieurs maturités
+        
+        Args:
+            maturity: Maturité(s) en années (scalaire ou array de forme quelconque)
+        
+        Returns:
+            Taux annualisé(s) en décimal, de même forme que maturity
+        """
+        T = np.asarray(maturity, dtype=float)
+        if self._log_discount is None:
+            rates = np.full(T.shape, self.zero_rates[0])
+        else:
+            T_clipped = np.clip(T, self.maturities[0], self.maturities[-1])
+            rates = -self._log_discount(T_clipped) / T_clipped
+        return float(rates) if rates.ndim == 0 else rates
+    
+    def discount_factor(self, maturity: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Facteur d'actualisation exp(-r(T) * T)
+        
+        Args:
+            maturity: Maturité(s) en années
+        
+        Returns:
+            Facteur(s) d'actualisation, de même forme que maturity
+        """
+        T = np.maximum(np.asarray(maturity, dtype=float), 0.0)
+        factors = np.exp(-self.rate(T) * T)
+        return float(factors) if np.ndim(factors) == 0 else factors
+    
+    def to_dict(self) -> Dict:
+        """
+        Représentation sérialisable de la courbe
+        
+        Returns:
+            Dictionnaire avec date, maturités, rendements cotés (et leur
+            composition) et taux zéro
+        """
+        return {
+            'as_of': self.as_of.isoformat() if self.as_of else None,
+            'maturities': self.maturities.tolist(),
+            'yields': self.yields.tolist(),
+            'compounding': self.compounding,
+            'zero_rates': self.zero_rates.tolist()
+        }
+
+
+def _last_yield(symbol: str) -> Optional[float]:
+    """Dernier rendement coté d'un indice du Trésor, en décimal (None si indisponible)"""
+    data = get_provider().history(symbol, period='5d')
+    if data.empty:
+        return None
+    close = data['Close'].dropna()
+    if close.empty:
+        return None
+    # Les indices sont cotés en pourcentage
+    return float(close.iloc[-1]) / 100
+
+
+def _fetch_yield_curve(as_of: date) -> Optional[YieldCurve]:
+    """Télécharge toutes les maturités en parallèle (None si aucune n'est disponible)"""
+    results = fetch_concurrently(
+        {symbol: (lambda symbol=symbol: _last_yield(symbol)) for symbol in TREASURY_TENORS},
+        defaults={symbol: None for symbol in TREASURY_TENORS}
+    )
+    quotes = {TREASURY_TENORS[symbol]: value for symbol, value in results.items()
+              if value is not None and np.isfinite(value)}
+    if not quotes:
+        return None
+    return YieldCurve(list(quotes), list(quotes.values()), as_of)
+
+
+def get_yield_curve(refresh: bool = False) -> YieldCurve:
+    """
+    Courbe des taux du jour, téléchargée une fois par jour et par processus
+    
+    Une courbe incomplète n'est conservée qu'une heure; si aucune maturité
+    n'est disponible, une courbe plate au taux par défaut est retournée
+    (non mise en cache: nouvel essai au prochain appel).
+    
+    Args:
+        refresh: Retélécharge la courbe même si elle est en cache
+    
+    Returns:
+        Instance de YieldCurve
+    """
+    today = date.today()
+    cache = get_cache('curve')
+    curve = None if refresh else cache.get(today)
+    if curve is None:
+        curve = cache.flight.do(today, lambda: _fetch_yield_curve(today))
+        if curve is not None:
+            partial = len(curve.maturities) < len(TREASURY_TENORS)
+            cache.set(today, curve, PARTIAL_CURVE_TTL if partial else None)
+    
+    return curve if curve is not None else YieldCurve.flat(DEFAULT_RISK_FREE_RATE, today)
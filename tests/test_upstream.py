@@ -0,0 +1,112 @@
+"""
+Upstream Access Tests
+Client d'accès amont testé contre un serveur HTTP local (aucun accès réseau)
+"""
+
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from curl_cffi import requests as curl_requests
+
+from src.utils.upstream import CircuitOpenError, UpstreamClient
+
+
+class FakeUpstream(BaseHTTPRequestHandler):
+    """Serveur factice: chaque chemin rejoue une liste de statuts (le dernier se répète)"""
+    
+    scripts = {}
+    hits = {}
+    delay = 0.0
+    
+    def do_GET(self):
+        with self.server.lock:
+            count = self.hits.get(self.path, 0)
+            self.hits[self.path] = count + 1
+        statuses = self.scripts.get(self.path, [200])
+        if self.path == '/slow' and count == 0:
+            time.sleep(self.delay)
+        status = statuses[min(count, len(statuses) - 1)]
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+class UpstreamClientTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeUpstream)
+        cls.server.lock = threading.Lock()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        FakeUpstream.scripts = {}
+        FakeUpstream.hits = {}
+        self.client = UpstreamClient(rate_per_second=100, burst=10, timeout=5, backoff=0.01,
+                                     hedge_after=0, failure_threshold=2, reset_timeout=60,
+                                     session=requests.Session())
+    
+    def fetch(self, path: str) -> int:
+        """Requête sur la session du client; les statuts d'erreur lèvent HTTPError"""
+        response = self.client.session.get(self.base_url + path, timeout=2)
+        response.raise_for_status()
+        return response.status_code
+    
+    def test_transient_status_is_retried(self):
+        FakeUpstream.scripts['/flaky'] = [503, 429, 200]
+        self.assertEqual(self.client.call(self.fetch, '/flaky'), 200)
+        self.assertEqual(FakeUpstream.hits['/flaky'], 3)
+        self.assertEqual(self.client.stats()['retries'], 2)
+        self.assertEqual(self.client.breaker.state, 'closed')
+    
+    def test_deterministic_error_is_not_retried(self):
+        FakeUpstream.scripts['/missing'] = [404]
+        for _ in range(3):
+            with self.assertRaises(requests.HTTPError):
+                self.client.call(self.fetch, '/missing')
+        self.assertEqual(FakeUpstream.hits['/missing'], 3)
+        self.assertEqual(self.client.stats()['failures'], 0)
+        self.assertEqual(self.client.breaker.state, 'closed')
+    
+    def test_breaker_opens_and_fails_fast(self):
+        FakeUpstream.scripts['/down'] = [500]
+        for _ in range(2):
+            with self.assertRaises(requests.HTTPError):
+                self.client.call(self.fetch, '/down')
+        hits = FakeUpstream.hits['/down']
+        self.assertEqual(hits, 2 * self.client.max_attempts)
+        
+        with self.assertRaises(CircuitOpenError):
+            self.client.call(self.fetch, '/down')
+        self.assertEqual(FakeUpstream.hits['/down'], hits)
+        self.assertEqual(self.client.breaker.state, 'open')
+    
+    def test_slow_request_is_hedged(self):
+        FakeUpstream.delay = 1.0
+        self.client.hedge_after = 0.1
+        started = time.monotonic()
+        self.assertEqual(self.client.call(self.fetch, '/slow'), 200)
+        self.assertLess(time.monotonic() - started, FakeUpstream.delay)
+        self.assertEqual(self.client.stats()['hedge_wins'], 1)
+    
+    def test_default_session_is_pooled(self):
+        self.assertIsInstance(UpstreamClient().session, curl_requests.Session)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@ import json
 import os
 import numpy as np
 from io import BytesIO
-from datetime import datetime
+from datetime import datetime, timedelta
 from src.strategies.long_straddle import LongStraddle
 from src.strategies.long_strangle import LongStrangle
 from src.strategies.iron_condor import IronCondor
@@ -16,6 +16,10 @@ from src.models.black_scholes import Call, Put
 from src.utils.market_data import get_ticker_info, validate_ticker, get_historical_volatility
 from src.utils.monte_carlo import MonteCarloAnalysis
 from src.utils.backtesting import Backtester
+from src.utils.concurrent_fetch import map_concurrently
+from src.utils.cache import cache_stats
+from src.utils.warmup import get_warmup_scheduler, start_warmup, warmup_enabled
+from src.utils.yield_curve import get_yield_curve
 
 # Configuration
 OUTPUT_DIR = 'output'
@@ -29,6 +33,13 @@ app = Flask(__name__,
 analysis_history = []
 
 
+@app.before_request
+def ensure_warmup():
+    """Démarre le préchargement dans tout processus qui sert des requêtes (gunicorn, etc.)"""
+    if warmup_enabled():
+        start_warmup()
+
+
 @app.route('/')
 def index():
     """Page d'accueil"""
@@ -129,7 +140,7 @@ def compare_strategies():
     try:
         # Récupérer le prix spot
         from src.utils.market_data import get_market_data
-        S, sigma, r = get_market_data(ticker)
+        S, sigma, _ = get_market_data(ticker)
         
         results = []
         
@@ -137,10 +148,12 @@ def compare_strategies():
         days_options = [7, 14, 30, 60, 90]
         strike_offsets = [-0.05, 0, 0.05]  # -5%, ATM, +5%
         
-        for days in days_options:
+        # Spot et volatilité communs; taux lu sur la courbe à la maturité de chaque configuration
+        rates = get_yield_curve().rate(np.array(days_options) / 365.0)
+        for days, r in zip(days_options, rates):
             for offset in strike_offsets:
                 strike = S * (1 + offset)
-                straddle = LongStraddle.from_ticker(ticker, K=strike, days_to_expiry=days)
+                straddle = LongStraddle(S, strike, days / 365.0, float(r), sigma)
                 summary = straddle.summary()
                 
                 results.append({
@@ -332,9 +345,9 @@ def implied_volatility():
         # Calculer la volatilité sur différentes périodes
         periods = [30, 60, 90, 180, 252]
         vol_data = []
+        volatilities = map_concurrently(lambda period: get_historical_volatility(ticker, period), periods)
         
-        for period in periods:
-            vol = get_historical_volatility(ticker, period)
+        for period, vol in zip(periods, volatilities):
             vol_data.append({
                 'period': period,
                 'period_label': f'{period}d',
@@ -580,10 +593,11 @@ def backtest_strategy():
         ticker = data.get('ticker')
         strategy_type = data.get('strategy', 'straddle')
         holding_days = int(data.get('holding_days', 30))
+        years = int(data.get('years', 1))
         
-        # Période de backtest (dernière année)
+        # Période de backtest (dernières années, 1 an par défaut)
         end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now().replace(year=datetime.now().year - 1)).strftime('%Y-%m-%d')
+        start_date = (datetime.now() - timedelta(days=365 * years)).strftime('%Y-%m-%d')
         
         backtester = Backtester(ticker, start_date, end_date)
         
@@ -603,6 +617,16 @@ def backtest_strategy():
         return jsonify({'success': False, 'error': str(e)})
 
 
+@app.route('/api/warmup_status', methods=['GET'])
+def warmup_status():
+    """État du préchargement de la watchlist et des caches de données de marché"""
+    return jsonify({
+        'success': True,
+        'warmup': get_warmup_scheduler().status(),
+        'caches': cache_stats()
+    })
+
+
 @app.route('/api/glossary', methods=['GET'])
 def get_glossary():
     """Retourne le glossaire complet"""
@@ -624,4 +648,10 @@ if __name__ == '__main__':
     print("  📚 Nouvelles fonctionnalités: Monte Carlo, Backtesting, Multi-stratégies")
     print("\n  Appuyez sur Ctrl+C pour arrêter le serveur\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5003)
+    # Préchargement dès le démarrage, sauf dans le processus superviseur du
+    # rechargement automatique (il ne sert aucune requête)
+    use_reloader = True
+    if warmup_enabled() and (not use_reloader or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+        start_warmup()
+    
+    app.run(debug=True, host='0.0.0.0', port=5003, use_reloader=use_reloader)